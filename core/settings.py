@@ -250,4 +250,42 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "http://localhost:3006",
     "http://127.0.0.1:3006",
-]
\ No newline at end of file
+]
+
+# Cache de resultados do /api/solve/
+# BACKEND: 'lru' (memória do processo) ou 'django' (usa CACHES[ALIAS])
+SOLVER_CACHE = {
+    'BACKEND': 'lru',
+    'MAX_ENTRIES': 256,
+    'TTL': 3600,
+    'ALIAS': 'default',
+}
+
+# Jobs assíncronos do /api/jobs/
+# TIME_LIMIT: limite padrão (e máximo) de cada job, em segundos
+SOLVER_JOBS = {
+    'WORKERS': 2,
+    'MAX_PENDING': 32,
+    'MAX_JOBS': 256,
+    'TIME_LIMIT': 60,
+}
+
+# Lotes do /api/batch/ (WORKERS: None = um processo por núcleo)
+SOLVER_BATCH = {
+    'WORKERS': None,
+    'MAX_PROBLEMS': 1000,
+    'CHUNKS_PER_WORKER': 4,
+}
+
+# Branch & Bound paralelo: processos por resolução (1 = serial); o JSON pode
+# trocar com 'bnb_workers'. O resultado só depende desse número. O pool é
+# criado uma vez e reusado; os primeiros 64 nós de cada árvore são resolvidos
+# no próprio processo, então árvores pequenas nunca passam por ele
+SOLVER_BNB = {
+    'WORKERS': 1,
+}
+
+# Métricas do /api/solve/ (GET /api/metrics/); PROFILE libera o ?profile=1 (cProfile)
+SOLVER_METRICS = {
+    'PROFILE': True,
+}
@@ -1,9 +1,17 @@
 import React, { useState } from 'react';
 import '../../styles/BnB.css';
 
+const STATUS_LABELS = {
+    integer: 'Inteiro (Folha)',
+    pruned: 'Podado',
+    branched: 'Ramificado',
+    unbounded: 'Ilimitado',
+    depth_limit: 'Limite de Profundidade',
+    unexplored: 'Não Explorado',
+};
+
 const NodeDetails = ({ selectedNode, solution, graphUrl, onReplayGraph }) => {
-    const [activeTab, setActiveTab] = useState('tableau');
-    const intTableau = solution?.integer_solution?.iterations?.[solution.integer_solution.iterations.length - 1];
+    const [activeTab, setActiveTab] = useState('graph');
 
     return (
         <div className="node-details-panel">
@@ -16,20 +24,23 @@ const NodeDetails = ({ selectedNode, solution, graphUrl, onReplayGraph }) => {
                     ) : (
                         <div style={{ display: 'flex', flexDirection: 'column', gap: '10px' }}>
                             <div style={{ fontSize: '1.2rem', fontWeight: 'bold', color: 'var(--text-primary)' }}>
-                                Z = {selectedNode.solution.Z}
-                            </div>
-                            <div style={{ background: 'var(--bg-primary)', padding: '10px', borderRadius: 'var(--radius-sm)', border: '1px solid var(--border-color)' }}>
-                                {Object.entries(selectedNode.solution)
-                                    .filter(([k]) => k.startsWith('x'))
-                                    .map(([k, v]) => (
-                                        <div key={k} style={{ display: 'flex', justifyContent: 'space-between' }}>
-                                            <span style={{ color: 'var(--text-secondary)' }}>{k}:</span>
-                                            <strong style={{ color: 'var(--text-primary)' }}>{typeof v === 'number' ? v.toFixed(4) : v}</strong>
-                                        </div>
-                                    ))}
+                                Z = {selectedNode.solution?.Z ?? '—'}
                             </div>
+                            {/* Nós não explorados (ou sem detalhes) chegam com solution = null */}
+                            {selectedNode.solution && !selectedNode.solution.error && (
+                                <div style={{ background: 'var(--bg-primary)', padding: '10px', borderRadius: 'var(--radius-sm)', border: '1px solid var(--border-color)' }}>
+                                    {Object.entries(selectedNode.solution)
+                                        .filter(([k]) => k.startsWith('x'))
+                                        .map(([k, v]) => (
+                                            <div key={k} style={{ display: 'flex', justifyContent: 'space-between' }}>
+                                                <span style={{ color: 'var(--text-secondary)' }}>{k}:</span>
+                                                <strong style={{ color: 'var(--text-primary)' }}>{typeof v === 'number' ? v.toFixed(4) : v}</strong>
+                                            </div>
+                                        ))}
+                                </div>
+                            )}
                             <div style={{ fontSize: '0.8rem', color: 'var(--text-tertiary)', fontStyle: 'italic' }}>
-                                Status: {selectedNode.status === 'integer' ? 'Inteiro (Folha)' : selectedNode.status === 'pruned' ? 'Podado' : 'Ramificado'}
+                                Status: {STATUS_LABELS[selectedNode.status] || selectedNode.status}
                             </div>
                         </div>
                     )}
@@ -42,12 +53,6 @@ const NodeDetails = ({ selectedNode, solution, graphUrl, onReplayGraph }) => {
 
             <div className="tabs-container">
                 <div className="tabs-header">
-                    <button
-                        className={`tab-button ${activeTab === 'tableau' ? 'active' : ''}`}
-                        onClick={() => setActiveTab('tableau')}
-                    >
-                        Quadro Final
-                    </button>
                     <button
                         className={`tab-button ${activeTab === 'graph' ? 'active' : ''}`}
                         onClick={() => setActiveTab('graph')}
@@ -63,29 +68,6 @@ const NodeDetails = ({ selectedNode, solution, graphUrl, onReplayGraph }) => {
                 </div>
 
                 <div className="tab-content">
-                    {activeTab === 'tableau' && (
-                        intTableau ? (
-                            <div style={{ background: 'var(--bg-secondary)', border: '1px solid var(--border-color)', borderRadius: 'var(--radius-md)', overflow: 'hidden' }}>
-                                <div style={{ background: 'var(--bg-tertiary)', padding: '8px', fontWeight: 'bold', fontSize: '0.85rem', borderBottom: '1px solid var(--border-color)', color: 'var(--text-primary)' }}>
-                                    Quadro Final (Ótimo Inteiro):
-                                </div>
-                                <div style={{ overflowX: 'auto' }}>
-                                    <table className="tableau-table" style={{ fontSize: '0.7rem' }}>
-                                        <thead><tr><th>Base</th>{intTableau.headers.map((h, i) => <th key={i}>{h}</th>)}</tr></thead>
-                                        <tbody>
-                                            {intTableau.rows.map((r, i) => (
-                                                <tr key={i}>
-                                                    <td style={{ fontWeight: 'bold', color: 'var(--text-primary)' }}>{r.label}</td>
-                                                    {r.values.map((v, j) => <td key={j} style={{ color: 'var(--text-primary)' }}>{v}</td>)}
-                                                </tr>
-                                            ))}
-                                        </tbody>
-                                    </table>
-                                </div>
-                            </div>
-                        ) : <p style={{ color: 'var(--text-secondary)', textAlign: 'center', padding: '20px' }}>Nenhum quadro disponível.</p>
-                    )}
-
                     {activeTab === 'graph' && (
                         graphUrl ? (
                             <div style={{ height: '100%', display: 'flex', flexDirection: 'column' }}>
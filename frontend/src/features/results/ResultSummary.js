@@ -5,7 +5,10 @@ import '../../styles/Results.css';
 const ResultSummary = ({ solution, isDualMode }) => {
     if (!solution) return null;
 
-    const ignoredKeys = ['graph_base64', 'iterations', 'error', 'integer_solution', 'dual_solution', 'status_complement', 'tableau', 'basis', 'tree_data', 'Z', 'status'];
+    const ignoredKeys = ['graph_base64', 'graph_format', 'certificate', 'sensitivity', 'parametric_rhs', 'presolve', 'iterations', 'error', 'integer_solution', 'dual_solution', 'status_complement', 'tableau', 'basis', 'tree_data', 'Z', 'status', 'dual_simplex', 'interior_point', 'heuristics', 'gap', 'cuts'];
+
+    // No modo dual o destaque são os preços sombra (y); sem eles, as variáveis primais
+    const values = isDualMode && solution.dual_solution ? solution.dual_solution : solution;
 
     const isFeasible = !solution.status_complement && !solution.error;
     const statusColor = isFeasible ? 'var(--success)' : 'var(--warning)';
@@ -51,10 +54,10 @@ const ResultSummary = ({ solution, isDualMode }) => {
 
                 <div style={{ padding: '0 24px 24px 24px' }}>
                     <div style={{ fontSize: '0.85rem', color: 'var(--text-tertiary)', marginBottom: '12px', fontWeight: '600', textTransform: 'uppercase' }}>
-                        Valores das Variáveis
+                        {isDualMode && solution.dual_solution ? 'Variáveis Duais (Preços Sombra)' : 'Valores das Variáveis'}
                     </div>
                     <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fill, minmax(120px, 1fr))', gap: '12px' }}>
-                        {Object.entries(solution)
+                        {Object.entries(values)
                             .filter(([k]) => !ignoredKeys.includes(k))
                             .map(([k, v]) => (
                                 <div key={k} style={{
@@ -14,7 +14,7 @@ const TableauViewer = ({ iterations }) => {
                             <span>{step.phase} - Passo {step.iteration}</span>
                             {step.pivot_info && <span style={{ fontSize: '0.8em', color: 'var(--text-secondary)' }}> Pivô: [{step.pivot_info.row}, {step.pivot_info.col}]</span>}
                         </div>
-                        <div style={{ overflowX: 'auto' }}>
+                        {step.headers && <div style={{ overflowX: 'auto' }}>
                             <table className="tableau-table">
                                 <thead>
                                     <tr><th>Base</th>{step.headers.map((h, i) => <th key={i}>{h}</th>)}</tr>
@@ -30,7 +30,7 @@ const TableauViewer = ({ iterations }) => {
                                     ))}
                                 </tbody>
                             </table>
-                        </div>
+                        </div>}
                     </div>
                 ))}
             </div>
@@ -38,7 +38,7 @@ const SolverPage = () => {
             setSelectedNode(solution.tree_data);
         }
         if (solution && solution.graph_base64) {
-            const blob = base64ToBlob(solution.graph_base64);
+            const blob = base64ToBlob(solution.graph_base64, solution.graph_format);
             const url = URL.createObjectURL(blob);
             setGraphUrl(url);
             return () => URL.revokeObjectURL(url);
@@ -51,7 +51,7 @@ const SolverPage = () => {
         if (solution && solution.graph_base64) {
             setGraphUrl(null);
             setTimeout(() => {
-                const blob = base64ToBlob(solution.graph_base64);
+                const blob = base64ToBlob(solution.graph_base64, solution.graph_format);
                 setGraphUrl(URL.createObjectURL(blob));
             }, 10);
         }
@@ -81,7 +81,8 @@ const SolverPage = () => {
                 sign: c.sign,
                 rhs: parseFloat(c.rhs) || 0
             })),
-            method: backendMethod
+            method: backendMethod,
+            trace: 'full'
         };
 
         const result = await solveProblem(problemData);
@@ -1,9 +1,11 @@
-export const base64ToBlob = (base64Data) => {
+const GRAPH_MIME = { gif: 'image/gif', png: 'image/png', svg: 'image/svg+xml' };
+
+export const base64ToBlob = (base64Data, format = 'gif') => {
     const byteCharacters = atob(base64Data);
     const byteNumbers = new Array(byteCharacters.length);
     for (let i = 0; i < byteCharacters.length; i++) {
         byteNumbers[i] = byteCharacters.charCodeAt(i);
     }
     const byteArray = new Uint8Array(byteNumbers);
-    return new Blob([byteArray], { type: 'image/gif' });
+    return new Blob([byteArray], { type: GRAPH_MIME[format] || 'image/gif' });
 };
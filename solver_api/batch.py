@@ -0,0 +1,160 @@
+import copy
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from django.conf import settings
+from .payload import build_solver, solve_options
+from .batched import BatchedSimplex
+
+# Com 'vectorized': true, problemas densos, sem limites e de mesma estrutura
+# (n, sinais, objetivo) são resolvidos juntos pelo BatchedSimplex
+VECTORIZED_METHODS = ('auto', 'simplex', 'two_phase', 'big_m', 'revised_simplex', 'dual')
+VECTORIZED_BLOCK = 4096
+
+
+# --- EXPANSÃO DO LOTE ---
+# Duas formas de entrada:
+#   {"problems": [problema, ...]}
+#   {"base": problema, "variants": [{"rhs": [...]}, {"objective_delta": [...]}, ...]}
+# Cada variante pode trocar ('rhs', 'objective_function') ou somar
+# ('rhs_delta', 'objective_delta') o vetor b ou c do problema base.
+def expand_batch(data):
+    if 'problems' in data:
+        return list(data['problems']), False
+    base = data['base']
+    problems = []
+    for variant in data['variants']:
+        problem = copy.deepcopy(base)
+        constraints = problem['constraints']
+        if 'rhs' in variant or 'rhs_delta' in variant:
+            rhs = variant['rhs'] if 'rhs' in variant else [float(c['rhs']) + float(d) for c, d in zip(constraints, variant['rhs_delta'])]
+            if len(rhs) != len(constraints): raise ValueError("'rhs' deve ter um valor por restrição")
+            for c, v in zip(constraints, rhs): c['rhs'] = v
+        if 'objective_function' in variant or 'objective_delta' in variant:
+            obj = variant['objective_function'] if 'objective_function' in variant else \
+                [float(c) + float(d) for c, d in zip(problem['objective_function'], variant['objective_delta'])]
+            if len(obj) != len(problem['objective_function']): raise ValueError("'objective_function' deve ter um valor por variável")
+            problem['objective_function'] = obj
+        problems.append(problem)
+    return problems, True
+
+
+def _solve_chunk(indices, problems, options, graph_format, warm):
+    # Variantes de um mesmo modelo (só b ou c mudam) partem da base ótima da
+    # anterior: mudou c -> a base segue viável (fase 2); mudou b -> segue
+    # dual-viável (simplex dual)
+    results, warm_start = [], None
+    for index, problem in zip(indices, problems):
+        try:
+            solver = build_solver(problem)
+        except (KeyError, TypeError, ValueError) as e:
+            results.append({'index': index, 'status': "Erro", 'solution': {'error': f'JSON inválido: {e}'}})
+            continue
+        # Falha do solver num problema vira erro só dele: o bloco e o lote seguem
+        try:
+            if warm: solver.warm_start = warm_start
+            status_msg, solution = solver.solve(graph_format=graph_format, **options)
+            if warm: warm_start = solver.warm_start or warm_start
+        except Exception as e:
+            status_msg, solution = "Erro", {'error': f'Ocorreu um erro interno: {e}'}
+        results.append({'index': index, 'status': status_msg, 'solution': solution})
+    return results
+
+
+def _structure(problem):
+    # Chave de agrupamento do modo vetorizado; None = vai pelo LPSolver
+    cons = problem.get('constraints') or []
+    if not cons or 'matrix' in problem or problem.get('bounds') is not None: return None
+    if any('coefficients' not in c for c in cons): return None
+    n = len(problem['objective_function'])
+    if any(len(c['coefficients']) != n for c in cons): return None
+    return n, tuple(c['sign'] for c in cons), problem.get('objective')
+
+
+def _solve_vectorized(problems, indices, options):
+    groups, rest = {}, []
+    for i in indices:
+        key = _structure(problems[i])
+        if key is None: rest.append(i)
+        else: groups.setdefault(key, []).append(i)
+    results = []
+    for (n, senses, objective), members in groups.items():
+        for s in range(0, len(members), VECTORIZED_BLOCK):
+            block = members[s:s + VECTORIZED_BLOCK]
+            try:
+                A = np.array([[c['coefficients'] for c in problems[i]['constraints']] for i in block], dtype=float)
+                b = np.array([[c['rhs'] for c in problems[i]['constraints']] for i in block], dtype=float)
+                c = np.array([problems[i]['objective_function'] for i in block], dtype=float)
+                solved = BatchedSimplex(A, b, c, senses, objective, options['tolerances']).solve()
+            except Exception:
+                rest += block  # entrada estranha ou falha do bloco: o caminho normal dá o erro de cada problema
+                continue
+            results += [{'index': i, 'status': st, 'solution': sol} for i, (st, sol) in zip(block, solved)]
+    return results, sorted(rest)
+
+
+def _chunks(n, parts):
+    # Blocos contíguos: variantes vizinhas costumam ter bases parecidas
+    size = max(1, -(-n // parts))
+    return [list(range(i, min(i + size, n))) for i in range(0, n, size)]
+
+
+_executor = None
+_workers = 1
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    # Configurado por settings.SOLVER_BATCH; padrão: um processo por núcleo
+    global _executor, _workers
+    with _executor_lock:
+        if _executor is None:
+            _workers = getattr(settings, 'SOLVER_BATCH', {}).get('WORKERS') or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=_workers)
+        return _executor
+
+
+def prepare_batch(data):
+    # Valida e expande o lote antes de qualquer resolução (erros viram 400)
+    limit = getattr(settings, 'SOLVER_BATCH', {}).get('MAX_PROBLEMS', 1000)
+    problems, warm = expand_batch(data)
+    if len(problems) > limit: raise ValueError(f"Lote com mais de {limit} problemas")
+    options = solve_options(data)
+    # O lote já é dividido entre processos: o B&B de cada problema fica serial
+    options['bnb_workers'] = 1
+    graph_format = data.get('graph_format', 'none')
+    vectorized = bool(data.get('vectorized', False))
+    if vectorized and (options['method'] not in VECTORIZED_METHODS or options['integer_mode'] or options['sensitivity']
+                       or options['parametric_rhs'] is not None or options['trace'] != 'none' or graph_format != 'none'):
+        raise ValueError("'vectorized' só vale para LPs contínuos, sem sensibilidade, trace ou gráfico "
+                         f"(método: {', '.join(VECTORIZED_METHODS)})")
+    # O reaproveitamento de base é feito pelo simplex revisado
+    warm = warm and not vectorized and options['method'] in ('auto', 'revised_simplex') and not options['integer_mode']
+    if warm: options['method'] = 'revised_simplex'
+    return problems, options, graph_format, warm, vectorized
+
+
+# --- RESOLUÇÃO DO LOTE ---
+# Gera os resultados na ordem em que ficam prontos; quem precisa da ordem
+# original ordena por 'index'
+def run_batch(problems, options, graph_format='none', warm=False, vectorized=False):
+    indices = list(range(len(problems)))
+    if vectorized:
+        done, indices = _solve_vectorized(problems, indices, options)
+        yield from done
+    executor = _get_executor()
+    chunks = [[indices[i] for i in chunk]
+              for chunk in _chunks(len(indices), _workers * getattr(settings, 'SOLVER_BATCH', {}).get('CHUNKS_PER_WORKER', 4))]
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _solve_chunk(chunk, [problems[i] for i in chunk], options, graph_format, warm)
+        return
+    futures = {executor.submit(_solve_chunk, chunk, [problems[i] for i in chunk], options, graph_format, warm): chunk
+               for chunk in chunks}
+    for future in as_completed(futures):
+        try:
+            yield from future.result()
+        except Exception as e:
+            # Processo perdido (ex.: pool quebrado): só os problemas do bloco viram erro
+            yield from ({'index': i, 'status': "Erro", 'solution': {'error': f'Ocorreu um erro interno: {e}'}}
+                        for i in futures[future])
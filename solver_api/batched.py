@@ -0,0 +1,210 @@
+import numpy as np
+from .main_solver import fraction_str
+from .pivoting import simplex_tolerances
+
+SENSES = ('<=', '>=', '=')
+RUNNING, OPTIMAL, INFEASIBLE, UNBOUNDED, ITERATION_LIMIT = range(5)
+
+
+# --- fraction_str VETORIZADO ---
+# Mesmo resultado de Fraction(v).limit_denominator(10000) (frações
+# contínuas com o mesmo critério de parada), mas para o array inteiro:
+# no lote, formatar a saída custaria mais que os próprios pivôs
+def fraction_strs(values, max_denominator=10000):
+    v = np.asarray(values, dtype=float).ravel()
+    out = np.empty(len(v), dtype=object)
+    # Não finitos e valores grandes (onde a fração contínua em ponto flutuante
+    # perde precisão) vão pelo caminho exato, um a um
+    with np.errstate(invalid='ignore'):
+        ok = np.abs(v) < 1e4
+        rounded = np.round(v)
+        whole = np.isfinite(v) & (np.abs(v - rounded) < 1e-9)
+    for k in np.where(~ok & ~whole)[0]: out[k] = fraction_str(v[k])
+    for k in np.where(whole)[0]: out[k] = "0" if abs(v[k]) < 1e-9 else str(int(rounded[k]))
+    ok &= ~whole
+    idx = np.where(ok)[0]
+    if len(idx) == 0: return out.tolist()
+    x = np.abs(v[idx])
+    p0, q0, p1, q1 = np.zeros_like(x), np.ones_like(x), np.ones_like(x), np.zeros_like(x)
+    r, active, exact = x.copy(), np.ones(len(x), dtype=bool), np.zeros(len(x), dtype=bool)
+    while active.any():
+        a = np.floor(r)
+        q2 = q0 + a * q1
+        step = active & (q2 <= max_denominator)
+        p0, q0, p1, q1 = (np.where(step, p1, p0), np.where(step, q1, q0),
+                          np.where(step, p0 + a * p1, p1), np.where(step, q2, q1))
+        frac = r - a
+        exact |= step & (frac <= 0)
+        active = step & (frac > 0)
+        r = np.where(active, 1.0 / np.where(active, frac, 1.0), r)
+    k = np.floor((max_denominator - q0) / np.maximum(q1, 1.0))
+    n1, d1 = p0 + k * p1, q0 + k * q1
+    use2 = exact | (np.abs(p1 / q1 - x) <= np.abs(n1 / d1 - x))
+    num, den = np.where(use2, p1, n1).astype(np.int64), np.where(use2, q1, d1).astype(np.int64)
+    num = np.where(v[idx] < 0, -num, num)
+    for k, a, b in zip(idx, num.tolist(), den.tolist()):
+        out[k] = str(a) if b == 1 else f"{a}/{b}"
+    return out.tolist()
+
+
+# --- SIMPLEX EM LOTE (TABLEAUS EMPILHADOS EM UM ARRAY 3-D) ---
+# N problemas com a mesma estrutura (m restrições, n variáveis, mesmos
+# sinais, x >= 0); A, b e c podem variar por problema. Colunas do tableau:
+#   estruturais (n) | lógica de cada linha (m; zerada nas '=') | artificial de cada linha (m)
+# Linhas com b < 0 são multiplicadas por -1 problema a problema. Na base
+# inicial fica a folga da linha quando o coeficiente dela é +1, senão a
+# artificial; artificiais nunca entram. Fase 1 e fase 2 como no
+# _solve_two_phase, mas cada passo (preço, razão, pivô) é uma operação
+# vetorizada sobre os problemas que ainda não terminaram.
+class BatchedSimplex:
+    def __init__(self, A, b, c, senses, objective='max', tolerances=None, max_iter=None, stall_limit=50):
+        b = np.asarray(b, dtype=float)
+        if b.ndim == 1: b = b[None, :]
+        N, m = b.shape
+        A = np.asarray(A, dtype=float)
+        n = A.shape[-1]
+        if len(senses) != m: raise ValueError("Um sinal por restrição")
+        if any(s not in SENSES for s in senses): raise ValueError(f"Sinal inválido. Use: {', '.join(SENSES)}.")
+        self.N, self.m, self.n = N, m, n
+        self.A = np.broadcast_to(A, (N, m, n))
+        self.b = b
+        self.objective = objective
+        self.senses = list(senses)
+        # O tableau sempre maximiza: min vira max de -c
+        self.c = np.broadcast_to(np.asarray(c, dtype=float), (N, n)) * (-1.0 if objective == 'min' else 1.0)
+        self.tol = simplex_tolerances(tolerances)
+        self.max_iter = max_iter if max_iter is not None else 50 * (n + 3 * m) + 100
+        self.stall_limit = stall_limit
+        self.status = np.full(N, RUNNING)
+        self.iterations = np.zeros(N, dtype=np.int64)
+
+    def _build(self):
+        N, m, n = self.N, self.m, self.n
+        K = n + 2 * m
+        rows = np.arange(m)
+        logical = np.array([1.0 if s == '<=' else -1.0 if s == '>=' else 0.0 for s in self.senses])
+        self.flip = np.where(self.b < 0, -1.0, 1.0)
+        T = np.zeros((N, m + 1, K + 1))
+        T[:, 1:, :n] = self.A * self.flip[:, :, None]
+        T[:, 1 + rows, n + rows] = logical * self.flip
+        T[:, 1 + rows, n + m + rows] = 1.0
+        T[:, 1:, -1] = self.b * self.flip
+        self.art = np.zeros(K, dtype=bool); self.art[n + m:] = True
+        self.basis = np.where(T[:, 1 + rows, n + rows] == 1.0, n + rows, n + m + rows)
+        self.allowed = ~self.art & np.concatenate([np.ones(n, dtype=bool), logical != 0.0, np.zeros(m, dtype=bool)])
+        self.T = T
+
+    # --- PIVÔ VETORIZADO: problema idx[k] pivota na linha r[k], coluna q[k] ---
+    def _pivot(self, idx, r, q):
+        whole = len(idx) == self.N
+        T = self.T if whole else self.T[idx]
+        ar = np.arange(len(idx))
+        prow = T[ar, r + 1, :] / T[ar, r + 1, q][:, None]
+        col = T[ar, :, q]
+        T -= col[:, :, None] * prow[:, None, :]
+        T[ar, r + 1, :] = prow
+        rhs = T[:, 1:, -1]
+        rhs[(rhs < 0) & (rhs > -self.tol['feasibility'])] = 0.0
+        if not whole: self.T[idx] = T
+        self.basis[idx, r] = q
+
+    def _run(self):
+        tol, ptol = self.tol['optimality'], self.tol['pivot']
+        stall = np.zeros(self.N, dtype=np.int64)
+        while True:
+            idx = np.where(self.status == RUNNING)[0]
+            if len(idx) == 0: return
+            # Só a linha 0, a coluna que entra e o RHS são lidos (nada de copiar os tableaus)
+            d = np.where(self.allowed, self.T[idx, 0, :-1], 0.0)
+            neg = d < -tol
+            done = ~neg.any(axis=1)
+            self.status[idx[done]] = OPTIMAL
+            over = ~done & (self.iterations[idx] >= self.max_iter)
+            self.status[idx[over]] = ITERATION_LIMIT
+            go = ~done & ~over
+            if not go.any(): return
+            idx, d, neg = idx[go], d[go], neg[go]
+            # Dantzig; depois de stall_limit pivôs degenerados seguidos, Bland
+            bland = stall[idx] >= self.stall_limit
+            q = np.where(bland, np.argmax(neg, axis=1), np.argmin(d, axis=1))
+            col = self.T[idx[:, None], np.arange(1, self.m + 1)[None, :], q[:, None]]
+            ok = col > ptol
+            unbounded = ~ok.any(axis=1)
+            self.status[idx[unbounded]] = UNBOUNDED
+            ratio = np.where(ok, np.maximum(self.T[idx, 1:, -1], 0.0) / np.where(ok, col, 1.0), np.inf)
+            best = ratio.min(axis=1)
+            ties = ratio <= best[:, None] + ptol
+            # Empate: maior pivô (estável) ou, em Bland, a básica de menor índice
+            r = np.where(bland, np.argmin(np.where(ties, self.basis[idx], np.iinfo(np.int64).max), axis=1),
+                         np.argmax(np.where(ties, col, -np.inf), axis=1))
+            go = ~unbounded
+            if go.any():
+                self._pivot(idx[go], r[go], q[go])
+                self.iterations[idx[go]] += 1
+                degenerate = best[go] <= self.tol['feasibility']
+                stall[idx[go]] = np.where(degenerate, stall[idx[go]] + 1, 0)
+
+    def _drive_out_artificials(self):
+        # Artificiais que ficaram na base em zero saem por um pivô em qualquer
+        # coluna permitida; linha sem nenhuma é redundante e a artificial fica
+        for i in range(self.m):
+            idx = np.where((self.status == RUNNING) & self.art[self.basis[:, i]])[0]
+            if len(idx) == 0: continue
+            row = np.where(self.allowed, np.abs(self.T[idx, i + 1, :-1]), 0.0)
+            has = row.max(axis=1) > 1e-9
+            if has.any():
+                self._pivot(idx[has], np.full(has.sum(), i), np.argmax(row[has], axis=1))
+
+    def _set_objective(self, cost):
+        # Linha 0 = -custo, zerada nas colunas básicas
+        T = self.T
+        T[:, 0, :] = 0.0
+        T[:, 0, :cost.shape[1]] = -cost
+        coef = np.take_along_axis(T[:, 0, :-1], self.basis, axis=1)
+        T[:, 0, :] -= np.einsum('nm,nmk->nk', coef, T[:, 1:, :])
+
+    def solve(self):
+        self._build()
+        N, n, m = self.N, self.n, self.m
+        K = n + 2 * m
+        # --- FASE 1: max -Σ artificiais ---
+        if self.art[self.basis].any():
+            self._set_objective(np.broadcast_to(-self.art.astype(float), (N, K)))
+            self._run()
+            scale = np.maximum(1.0, np.abs(self.T[:, 1:, -1]).max(axis=1))
+            infeasible = (self.status == OPTIMAL) & (self.T[:, 0, -1] < -self.tol['feasibility'] * scale)
+            self.status[infeasible] = INFEASIBLE
+            self.status[self.status == OPTIMAL] = RUNNING
+            self._drive_out_artificials()
+        # --- FASE 2: objetivo original ---
+        self._set_objective(np.concatenate([self.c, np.zeros((N, 2 * m))], axis=1))
+        self._run()
+        return self.solutions()
+
+    def primal(self):
+        x = np.zeros((self.N, self.n + 2 * self.m))
+        np.put_along_axis(x, self.basis, self.T[:, 1:, -1], axis=1)
+        return x[:, :self.n]
+
+    def solutions(self):
+        # Mesmo formato (e mensagens) do LPSolver, um (status, solução) por problema
+        sign = -1.0 if self.objective == 'min' else 1.0
+        x = self.primal()
+        z = sign * self.T[:, 0, -1]
+        # Dual da linha original = custo reduzido da artificial × flip
+        y = sign * self.flip * self.T[:, 0, self.n + self.m:self.n + 2 * self.m]
+        n, m = self.n, self.m
+        text = np.array(fraction_strs(np.concatenate([x, z[:, None], y], axis=1)), dtype=object).reshape(self.N, n + 1 + m)
+        xs, ys = [f'x{j+1}' for j in range(n)], [f'y{i+1}' for i in range(m)]
+        out = []
+        for k in range(self.N):
+            st = self.status[k]
+            if st == INFEASIBLE: out.append(("Problema Inviável", {"error": "Inviável"})); continue
+            if st == UNBOUNDED: out.append(("Ilimitada", {"error": "Ilimitada"})); continue
+            if st != OPTIMAL: out.append(("Ciclo", {"error": "Limite de iterações atingido"})); continue
+            row = text[k]
+            sol = dict(zip(xs, row[:n]))
+            sol['Z'] = row[n]
+            sol['dual_solution'] = dict(zip(ys, row[n + 1:]))
+            out.append(("Ótimo encontrado.", sol))
+        return out
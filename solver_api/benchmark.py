@@ -0,0 +1,320 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from .main_solver import BOUNDED_METHODS, LPSolver
+from .payload import build_solver, solve_options
+
+ALL_METHODS = ('auto', 'graphical', 'simplex', 'two_phase', 'big_m', 'revised_simplex', 'interior_point',
+               'exact', 'exact_hybrid', 'dual', 'branch_and_bound')
+# Métodos caros em aritmética exata ficam de fora dos modelos grandes
+FAST_METHODS = ('auto', 'two_phase', 'big_m', 'revised_simplex', 'interior_point', 'dual')
+# B&B paralelo (bnb_workers = --bnb-workers), medido ao lado do serial
+PARALLEL_METHOD = 'parallel_bnb'
+PARALLEL_WORKERS = 4
+# Contagens e memória são determinísticas e sempre comparadas. Tempos entram
+# como razão sobre a resolução de referência da mesma execução (melhor de
+# `repeat`), e só com timing=True: mesmo como razão, oscilam com a carga da
+# máquina. solve_ratio é o tempo sem a renderização, medida à parte
+METRICS = ('pivots', 'nodes', 'peak_kb')
+TIME_METRICS = ('solve_ratio', 'render_ratio')
+# Regressão: piora relativa acima do limite E absoluta acima do piso (ruído de medição)
+DEFAULT_THRESHOLDS = {'solve_ratio': 0.25, 'pivots': 0.10, 'nodes': 0.10, 'peak_kb': 0.25, 'render_ratio': 0.50}
+ABSOLUTE_FLOOR = {'solve_ratio': 0.5, 'pivots': 2, 'nodes': 2, 'peak_kb': 64, 'render_ratio': 2.0}
+# Partida a frio de um worker: importar a API (sem gráfico) e o primeiro gráfico.
+# Tempos sobre reference_ms; RSS sobre o do interpretador com numpy já importado
+STARTUP_METRICS = ('rss_ratio', 'graph_rss_ratio')
+STARTUP_TIME_METRICS = ('import_ratio', 'first_graph_ratio')
+STARTUP_THRESHOLDS = {'import_ratio': 0.25, 'rss_ratio': 0.15, 'first_graph_ratio': 0.50, 'graph_rss_ratio': 0.15}
+STARTUP_FLOOR = {'import_ratio': 20.0, 'rss_ratio': 0.1, 'first_graph_ratio': 20.0, 'graph_rss_ratio': 0.1}
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+
+
+# --- CORPUS: FAMÍLIAS ALEATÓRIAS COM SEMENTE FIXA ---
+# Cada instância é um payload do /api/solve/, então o corpus também serve
+# para replay pela API
+def _dense(A, senses, b, c, objective='max', **extra):
+    return {'objective_function': [float(v) for v in c], 'objective': objective,
+            'constraints': [{'coefficients': [float(v) for v in row], 'sign': s, 'rhs': float(r)}
+                            for row, s, r in zip(A, senses, b)], **extra}
+
+
+def _family_planar(rng):
+    for _ in range(3):
+        A = rng.integers(1, 9, (4, 2)); b = rng.integers(10, 40, 4)
+        yield _dense(A, ['<='] * 4, b, rng.integers(1, 10, 2)), ALL_METHODS
+
+
+def _family_dense_le(rng):
+    for m, n in ((5, 5), (15, 10), (30, 40)):
+        A = rng.integers(0, 10, (m, n)); b = A.sum(1) // 2 + 1
+        yield _dense(A, ['<='] * m, b, rng.integers(1, 20, n)), ALL_METHODS if n <= 10 else FAST_METHODS + ('simplex',)
+
+
+def _family_mixed(rng):
+    # Viável por construção: b sai de um ponto x0 >= 0
+    for m, n in ((6, 5), (20, 15)):
+        A = rng.integers(-2, 9, (m, n)); x0 = rng.integers(0, 5, n); act = A @ x0
+        senses = list(rng.choice(['<=', '>=', '='], m, p=[.5, .3, .2]))
+        b = [a + 3 if s == '<=' else a - 3 if s == '>=' else a for a, s in zip(act, senses)]
+        A = np.vstack([A, np.ones(n)]); senses.append('<='); b.append(int(x0.sum()) + 20)
+        yield _dense(A, senses, b, rng.integers(-5, 15, n), 'min' if m % 2 else 'max'), ALL_METHODS if n <= 5 else FAST_METHODS
+
+
+def _family_sparse(rng):
+    m, n = 60, 80
+    rows = []
+    for _ in range(m):
+        idx = sorted(rng.choice(n, 8, replace=False).tolist())
+        rows.append({'indices': idx, 'values': rng.integers(1, 10, 8).astype(float).tolist(), 'sign': '<=',
+                     'rhs': float(rng.integers(20, 60))})
+    yield {'objective_function': rng.integers(1, 20, n).astype(float).tolist(), 'objective': 'max',
+           'constraints': rows}, ('auto', 'revised_simplex', 'interior_point')
+
+
+def _family_knapsack(rng):
+    for m, n in ((1, 12), (3, 15)):
+        A = rng.integers(5, 30, (m, n)); b = A.sum(1) // 3
+        yield _dense(A, ['<='] * m, b, rng.integers(5, 40, n), integer_mode=True, max_depth=None), \
+            ('branch_and_bound', 'revised_simplex')
+
+
+def _family_knapsack_large(rng):
+    # Árvore de algumas centenas de nós: mede o ganho do B&B paralelo
+    m, n = 6, 50
+    A = rng.integers(5, 30, (m, n)); b = A.sum(1) // 3
+    yield _dense(A, ['<='] * m, b, rng.integers(5, 40, n), integer_mode=True, max_depth=None), \
+        ('branch_and_bound', PARALLEL_METHOD)
+
+
+def _family_large_dense(rng):
+    m, n = 120, 150
+    A = rng.uniform(0, 10, (m, n)).round(2); b = (A.sum(1) * 0.3).round(2)
+    yield _dense(A, ['<='] * m, b, rng.uniform(1, 20, n).round(2)), ('auto', 'revised_simplex', 'interior_point')
+
+
+FAMILIES = {
+    'planar': _family_planar,
+    'dense_le': _family_dense_le,
+    'mixed': _family_mixed,
+    'sparse': _family_sparse,
+    'knapsack': _family_knapsack,
+    'knapsack_large': _family_knapsack_large,
+    'large_dense': _family_large_dense,
+}
+
+
+def build_corpus(families=None, seed=0):
+    corpus = []
+    for name in families or FAMILIES:
+        if name not in FAMILIES: raise ValueError(f"Família '{name}' desconhecida. Use: {', '.join(FAMILIES)}.")
+        rng = np.random.default_rng(seed)
+        for k, (payload, methods) in enumerate(FAMILIES[name](rng)):
+            corpus.append({'instance': f'{name}-{k}', 'family': name, 'payload': payload, 'methods': methods})
+    return corpus
+
+
+def load_replay(path):
+    # JSONL de payloads do /api/solve/; linhas que não são problemas são ignoradas
+    corpus = []
+    with open(path, encoding='utf-8') as fh:
+        for k, line in enumerate(fh):
+            try: payload = json.loads(line)
+            except ValueError: continue
+            if not isinstance(payload, dict) or 'objective_function' not in payload or 'constraints' not in payload: continue
+            corpus.append({'instance': f'replay-{k}', 'family': 'replay', 'payload': payload, 'methods': ALL_METHODS})
+    return corpus
+
+
+# --- MEDIÇÃO ---
+def applicable(payload, method):
+    # Pares que só dariam "Método inválido" não são medidos
+    solver = build_solver(payload)
+    senses = solver._problem_arrays()[1]
+    if method == 'graphical': return solver.num_vars == 2
+    lb = solver._bound_arrays()[0]
+    if solver.bounds is not None and method not in BOUNDED_METHODS and method != PARALLEL_METHOD and (lb < 0).any(): return False
+    if method == 'simplex': return all(s == '<=' for s in senses) and not (lb > 0).any()
+    return True
+
+
+def _reference_problem():
+    # LP denso fixo resolvido pelo simplex revisado: a "unidade" de tempo da máquina
+    rng = np.random.default_rng(12345)
+    A = rng.integers(1, 10, (40, 60)).astype(float); b = A.sum(1) / 3
+    return LPSolver(rng.integers(1, 20, 60).astype(float), [(row, '<=', r) for row, r in zip(A, b)])
+
+
+def reference_ms(repeat=5):
+    times = []
+    for _ in range(max(repeat, 5)):
+        solver = _reference_problem()
+        start = time.perf_counter()
+        solver.solve(method='revised_simplex', graph_format='none')
+        times.append(time.perf_counter() - start)
+    return round(min(times) * 1000, 3)
+
+
+def _warm_up(graph_format):
+    # O primeiro gráfico do processo paga o import do matplotlib/Pillow: fica fora das medições
+    if graph_format != 'none':
+        LPSolver([3, 5], [([1, 0], '<=', 4), ([0, 2], '<=', 12), ([3, 2], '<=', 18)]).solve(method='graphical', graph_format=graph_format)
+
+
+def _solve_once(payload, method, graph_format, bnb_workers=PARALLEL_WORKERS):
+    solver = build_solver(payload)
+    options = solve_options(payload)
+    options['method'] = method
+    if method == PARALLEL_METHOD: options.update(method='branch_and_bound', bnb_workers=bnb_workers)
+    start = time.perf_counter()
+    status, solution = solver.solve(graph_format=graph_format, **options)
+    return time.perf_counter() - start, status, solution, solver.counters
+
+
+def measure(payload, method, graph_format='png', repeat=3, bnb_workers=PARALLEL_WORKERS):
+    # Tempo: mediana de `repeat` execuções depois de uma de aquecimento (caches
+    # e imports tardios); memória: uma execução à parte com tracemalloc
+    _solve_once(payload, method, graph_format, bnb_workers)
+    times, solves, renders = [], [], []
+    for _ in range(repeat):
+        elapsed, status, solution, counters = _solve_once(payload, method, graph_format, bnb_workers)
+        times.append(elapsed)
+        renders.append(counters['render_seconds']); solves.append(elapsed - counters['render_seconds'])
+    tracemalloc.start()
+    try:
+        _solve_once(payload, method, graph_format, bnb_workers)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'status': status, 'ok': 'error' not in solution, 'Z': solution.get('Z'),
+        'wall_ms': round(statistics.median(times) * 1000, 3), 'wall_ms_min': round(min(times) * 1000, 3),
+        'pivots': counters['pivots'], 'nodes': counters['nodes'],
+        'peak_kb': round(peak / 1024, 1), 'render_ms': round(counters['render_seconds'] * 1000, 3),
+        'solve_ms_min': round(min(solves) * 1000, 3), 'render_ms_min': round(min(renders) * 1000, 3),
+    }
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'cpu_count': os.cpu_count()}
+
+
+# Roda num processo novo: o que já foi importado aqui não conta. RSS = pico
+# do processo em KB (VmHWM; o ru_maxrss do Linux herda o pico do pai no fork)
+_STARTUP_SCRIPT = '''
+import json, os, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+def rss():
+    try:
+        with open('/proc/self/status') as fh:
+            return next(int(l.split()[1]) for l in fh if l.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1)
+start = time.perf_counter()
+import numpy
+base_rss = rss()
+import django; django.setup()
+import solver_api.views
+out = {'import_ms': (time.perf_counter() - start) * 1000, 'base_rss_kb': base_rss, 'rss_kb': rss(),
+       'plotting_loaded': 'matplotlib' in sys.modules}
+from solver_api.main_solver import LPSolver
+solver = LPSolver([3, 5], [([1, 0], '<=', 4), ([0, 2], '<=', 12), ([3, 2], '<=', 18)])
+start = time.perf_counter()
+solver.solve(method='graphical', graph_format='png')
+out.update(first_graph_ms=(time.perf_counter() - start) * 1000, graph_rss_kb=rss())
+print(json.dumps(out))
+'''
+
+
+def startup(reference, repeat=3):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT, root], cwd=root, capture_output=True, text=True,
+                              check=True)
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    keys = ('import_ms', 'base_rss_kb', 'rss_kb', 'first_graph_ms', 'graph_rss_kb')
+    out = {k: round(statistics.median(r[k] for r in runs), 1) for k in keys}
+    out.update(import_ratio=round(out['import_ms'] / reference, 2),
+               first_graph_ratio=round(out['first_graph_ms'] / reference, 2),
+               rss_ratio=round(out['rss_kb'] / out['base_rss_kb'], 3),
+               graph_rss_ratio=round(out['graph_rss_kb'] / out['base_rss_kb'], 3))
+    out['plotting_loaded'] = any(r['plotting_loaded'] for r in runs)
+    return out
+
+
+def speedups(results):
+    # Tempo do B&B serial / tempo do paralelo, por instância medida nos dois
+    serial = {r['instance']: r['wall_ms'] for r in results if r['method'] == 'branch_and_bound'}
+    return {r['instance']: round(serial[r['instance']] / r['wall_ms'], 2) for r in results
+            if r['method'] == PARALLEL_METHOD and r['instance'] in serial and r['wall_ms'] > 0}
+
+
+def run_benchmark(corpus, methods=None, graph_format='png', repeat=3, progress=None, bnb_workers=PARALLEL_WORKERS):
+    _warm_up(graph_format)
+    reference = reference_ms(repeat)
+    results = []
+    for case in corpus:
+        for method in case['methods']:
+            if methods and method not in methods: continue
+            if not applicable(case['payload'], method): continue
+            row = {'instance': case['instance'], 'family': case['family'], 'method': method,
+                   **measure(case['payload'], method, graph_format, repeat, bnb_workers)}
+            row.update(solve_ratio=round(row['solve_ms_min'] / reference, 3),
+                       render_ratio=round(row['render_ms_min'] / reference, 3))
+            results.append(row)
+            if progress is not None: progress(row)
+    return {'version': 2, 'environment': environment(), 'reference_ms': reference, 'startup': startup(reference, repeat),
+            'settings': {'graph_format': graph_format, 'repeat': repeat, 'bnb_workers': bnb_workers},
+            'parallel_speedup': speedups(results), 'results': results}
+
+
+# --- COMPARAÇÃO COM A LINHA DE BASE ---
+def load_report(path):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=1, ensure_ascii=False)
+        fh.write('\n')
+
+
+def compare(report, baseline, thresholds=None, timing=False):
+    # Lista de regressões: métrica pior que a linha de base além do limite,
+    # ou resultado diferente (status/Z) para o mesmo par instância × método
+    limits = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    metrics = METRICS + TIME_METRICS if timing else METRICS
+    startup_metrics = STARTUP_METRICS + STARTUP_TIME_METRICS if timing else STARTUP_METRICS
+    base = {(r['instance'], r['method']): r for r in baseline.get('results', [])}
+    regressions = []
+    ref, cur = baseline.get('startup') or {}, report.get('startup') or {}
+    for metric in startup_metrics:
+        old, new = ref.get(metric), cur.get(metric)
+        if old is None or new is None: continue
+        if new - old > STARTUP_FLOOR[metric] and new > old * (1 + STARTUP_THRESHOLDS[metric]):
+            regressions.append({'case': 'startup', 'metric': metric, 'baseline': old, 'current': new,
+                                'change': round(new / old - 1, 3) if old else None})
+    for row in report['results']:
+        ref = base.get((row['instance'], row['method']))
+        if ref is None: continue
+        key = f"{row['instance']}/{row['method']}"
+        if ref['status'] != row['status'] or ref.get('Z') != row.get('Z'):
+            regressions.append({'case': key, 'metric': 'result', 'baseline': f"{ref['status']} Z={ref.get('Z')}",
+                                'current': f"{row['status']} Z={row.get('Z')}"})
+            continue
+        for metric in metrics:
+            old, new = ref.get(metric), row.get(metric)
+            if old is None or new is None: continue
+            if new - old > ABSOLUTE_FLOOR[metric] and new > old * (1 + limits[metric]):
+                regressions.append({'case': key, 'metric': metric, 'baseline': old, 'current': new,
+                                    'change': round(new / old - 1, 3) if old else None})
+    return regressions
@@ -0,0 +1,427 @@
+import heapq
+import math
+import os
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from .revised_simplex import RevisedSimplex
+from .monitor import SolveInterrupted, SolveMonitor
+from .cuts import CuttingPlanes
+from .heuristics import PrimalHeuristics
+from .interior_point import InteriorPoint, prefers_interior_point
+
+BNB_STRATEGIES = ('best_bound', 'depth_first', 'hybrid')
+NODE_ERRORS = {'infeasible': 'Inviável', 'unbounded': 'Ilimitada', 'iteration_limit': 'Limite de iterações atingido'}
+# Modo paralelo: os primeiros nós são resolvidos no próprio processo; árvores
+# menores que isso não compensam o envio dos nós ao pool
+PARALLEL_MIN_NODES = 64
+
+
+# --- NÓ DA ÁRVORE: GUARDA APENAS AS MUDANÇAS DE LIMITE EM RELAÇÃO À RAIZ ---
+class BnBNode:
+    __slots__ = ('id', 'depth', 'changes', 'bound', 'warm_basis', 'warm_x', 'branch_info')
+
+    def __init__(self, node_id, depth, changes, bound, warm_basis=None, warm_x=None, branch_info=''):
+        self.id = node_id
+        self.depth = depth
+        self.changes = changes          # tupla de (índice, '<=' | '>=', valor)
+        self.bound = bound              # limite herdado do pai (forma de maximização)
+        self.warm_basis = warm_basis
+        self.warm_x = warm_x
+        self.branch_info = branch_info
+
+
+def _tighten(lb, ub, changes):
+    lb, ub = lb.copy(), ub.copy()
+    for j, sense, v in changes:
+        if sense == '<=': ub[j] = min(ub[j], v)
+        else: lb[j] = max(lb[j], v)
+    return lb, ub
+
+
+# --- MODO PARALELO: POOL COMPARTILHADO E O QUE RODA NOS PROCESSOS ---
+# Um pool por número de processos, criado na primeira resolução e reusado
+# pelas seguintes (como o do batch). O problema da raiz vai serializado uma
+# vez por resolução e cada processo o desserializa só na primeira tarefa dela;
+# a tarefa leva as mudanças de limite do nó, a base do pai e o corte
+_node_pools = {}
+_node_pools_lock = threading.Lock()
+_worker_problem = (None, None)  # (token da resolução, problema)
+
+
+def _get_node_pool(workers):
+    # Pool herdado por fork (jobs, batch) não tem as threads de controle: recria
+    with _node_pools_lock:
+        pid, pool = _node_pools.get(workers, (None, None))
+        if pool is None or pid != os.getpid():
+            pool = ProcessPoolExecutor(max_workers=workers)
+            _node_pools[workers] = (os.getpid(), pool)
+        return pool
+
+
+def _discard_node_pool(workers):
+    with _node_pools_lock:
+        _, pool = _node_pools.pop(workers, (None, None))
+    if pool is not None: pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _node_problem(token, blob):
+    global _worker_problem
+    if _worker_problem[0] != token: _worker_problem = (token, pickle.loads(blob))
+    return _worker_problem[1]
+
+
+# Resultado de um nó com a mesma interface do motor que o B&B lê
+class NodeResult:
+    __slots__ = ('status', 'primal', 'x', 'basis', 'z', 'iterations')
+
+    def __init__(self, status, engine):
+        self.status = status
+        self.primal = engine.primal if status == 'optimal' else None
+        self.x = engine.x
+        self.basis = engine.basis
+        self.z = getattr(engine, 'z', None)
+        self.iterations = engine.iterations
+
+
+def _solve_node_task(token, blob, changes, warm_basis, warm_x, cutoff, time_limit):
+    A, b, c, senses, lb, ub = _node_problem(token, blob)
+    lb, ub = _tighten(lb, ub, changes)
+    engine = RevisedSimplex(A, b, c, senses, lb, ub, monitor=SolveMonitor(time_limit=time_limit) if time_limit else None)
+    engine.cutoff = cutoff
+    try:
+        status = engine.solve(basis=warm_basis, x=warm_x)
+    except SolveInterrupted:
+        status = 'time_limit'
+    return NodeResult(status, engine)
+
+
+# --- BRANCH AND BOUND COM FILA EXPLÍCITA DE NÓS ---
+class BranchAndBound:
+    def __init__(self, solver, strategy='best_bound', max_depth=10, max_nodes=None, cuts=False, heuristics=True,
+                 time_limit=None, mip_gap=None, workers=1):
+        if strategy not in BNB_STRATEGIES:
+            raise ValueError(f"Estratégia '{strategy}' desconhecida. Use: {', '.join(BNB_STRATEGIES)}.")
+        self.solver = solver
+        self.strategy = strategy
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.cuts = cuts
+        self.cut_stats = None
+        self.mip_gap = float(mip_gap) if mip_gap else 0.0
+        # Processos do modo paralelo (1 = serial); a árvore depende só desse número
+        if workers is None: workers = 1
+        if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+            raise ValueError("bnb_workers deve ser um inteiro >= 1.")
+        self.workers = workers
+        # Sem monitor externo (jobs), o limite de tempo ganha um monitor próprio
+        self.monitor = solver.monitor or (SolveMonitor(time_limit=float(time_limit)) if time_limit else None)
+        self.stopped = None  # motivo da parada antecipada, se houver
+        # Representação única do problema, compartilhada por todos os nós
+        self.A, self.senses, self.b = solver._problem_arrays()
+        self.lb, self.ub = solver._bound_arrays()
+        self.c = -solver.objective_function  # o motor minimiza
+        self.n = solver.num_vars
+        self.incumbent_z = -np.inf
+        self.incumbent = None
+        self.incumbent_x = None
+        self.incumbent_source = None
+        self.heuristics = PrimalHeuristics(self) if heuristics else None
+        self._closed_bound = -np.inf  # maior limite entre nós fechados sem prova (gap, profundidade)
+        self.nodes_solved = 0
+        self.lp_iterations = 0
+        self._root_warm = (None, None)
+        self._counter = 0
+        self._heap = []
+
+    # --- FILA ---
+    def _key(self, node):
+        self._counter += 1
+        if self.strategy == 'depth_first' or (self.strategy == 'hybrid' and self.incumbent is None):
+            return (-node.depth, self._counter)
+        return (-node.bound, self._counter)
+
+    def _push(self, node):
+        heapq.heappush(self._heap, (self._key(node), node))
+
+    def _switch_to_best_bound(self):
+        # Híbrido: mergulho em profundidade até a primeira solução inteira
+        self._heap = [((-node.bound, i), node) for i, (_, node) in enumerate(self._heap)]
+        heapq.heapify(self._heap)
+
+    # --- LP DO NÓ: MESMA MATRIZ, APENAS LIMITES APERTADOS ---
+    def _node_lp(self, changes):
+        lb, ub = _tighten(self.lb, self.ub, changes)
+        return RevisedSimplex(self.A, self.b, self.c, self.senses, lb, ub, monitor=self.monitor)
+
+    def _solve_node(self, node):
+        with self.solver._phase('build'): engine = self._node_lp(node.changes)
+        with self.solver._phase('pivots'): status = engine.solve(basis=node.warm_basis, x=node.warm_x)
+        self.nodes_solved += 1
+        self.lp_iterations += engine.iterations
+        return status, engine
+
+    def _format(self, values, z):
+        return self.solver._format_solution(values, self._sign() * z)
+
+    def _z_str(self, z):
+        # Z (forma de maximização) no sentido original, com a constante do presolve
+        return self.solver._to_fraction_str(self.solver._shift_z(self._sign() * z))
+
+    def _sign(self):
+        return -1 if self.solver.objective == 'min' else 1
+
+    def best_bound(self):
+        # Maior limite entre os nós abertos e os fechados sem prova (forma de maximização)
+        bounds = [node.bound for _, node in self._heap]
+        return max(bounds + [self._closed_bound, self.incumbent_z])
+
+    def gap(self):
+        # Gap relativo provado: |limite - incumbente| / |incumbente|
+        if self.incumbent is None: return None
+        diff = max(self.best_bound() - self.incumbent_z, 0.0)
+        return diff / max(abs(self.incumbent_z), 1e-10) if diff > 1e-9 else 0.0
+
+    def _offer_incumbent(self, x, source):
+        # Solução inteira vinda de um nó ou de uma heurística
+        z = float(-self.c @ x)
+        if z <= self.incumbent_z + 1e-6: return False
+        first = self.incumbent is None
+        self.incumbent_z = z
+        self.incumbent = self._format(x, z)
+        self.incumbent_x = x
+        self.incumbent_source = source
+        if first and self.strategy == 'hybrid': self._switch_to_best_bound()
+        return True
+
+    def _report(self):
+        sign = self._sign()
+        shift = self.solver._shift_z
+        bound = lambda: None if np.isinf(self.best_bound()) else float(shift(sign * self.best_bound()))
+        self.monitor.tick(nodes=self.nodes_solved, open_nodes=len(self._heap), best_bound=bound,
+                          incumbent=None if self.incumbent is None else float(shift(sign * self.incumbent_z)))
+
+    def _root_cuts(self):
+        # Cortes GMI na raiz: o LP apertado (com as linhas de corte) é o que
+        # todos os nós herdam, e a raiz parte da base ótima final dos cortes
+        planes = CuttingPlanes(self.A, self.senses, self.b, self.c, self.lb, self.ub, monitor=self.monitor)
+        try:
+            engine = planes.run()
+        except SolveInterrupted as e:
+            if e.reason != 'time_limit': raise
+            engine = None
+        if engine is not None:
+            self.A, self.senses, self.b = planes.problem()
+            self._root_warm = (engine.basis.copy(), engine.x.copy())
+        self.cut_stats = {k: self._z_str(v) if k.startswith('bound') else v for k, v in planes.stats.items()}
+
+    def _root_interior_point(self):
+        # LP grande na raiz: pontos interiores + crossover dão a base de partida
+        ipm = InteriorPoint(self.A, self.b, self.c, self.senses, self.lb, self.ub, monitor=self.monitor)
+        try:
+            if ipm.solve() == 'optimal': self._root_warm = ipm.crossover_basis()
+        except SolveInterrupted as e:
+            if e.reason != 'time_limit': raise
+
+    def _cutoff(self):
+        # Com mip_gap, nós que melhorariam menos que o gap também são podados
+        if self.incumbent is None: return -np.inf
+        return self.incumbent_z + max(1e-6, self.mip_gap * abs(self.incumbent_z))
+
+    def _prune(self, z):
+        if z > self._cutoff(): return False
+        if z > self.incumbent_z + 1e-6:
+            self._closed_bound = max(self._closed_bound, z)
+            self.stopped = self.stopped or 'gap atingido'
+        return True
+
+    def _gap_closed(self):
+        gap = self.gap()
+        return self.mip_gap > 0 and gap is not None and gap <= self.mip_gap
+
+    def _run_heuristics(self, node, engine, x):
+        h = self.heuristics
+        if h is None: return
+        h.rounding(x)
+        # Mergulhos periódicos: o trabalho das heurísticas não passa o da própria árvore
+        if node.depth == 1 or (self.nodes_solved % h.dive_every == 0 and h.stats['lp_solves'] <= self.nodes_solved):
+            h.dive(node.changes, engine)
+        if node.depth == 1 and self.incumbent is None: h.pump(x)
+
+    def _record(self, node, status, z=None, solution=None, details=True):
+        # Registro plano de um nó, emitido assim que o nó é finalizado
+        rec = {'id': node.id, 'parent': node.id.rsplit('.', 1)[0] if '.' in node.id else None,
+               'depth': node.depth, 'branch_info': node.branch_info, 'status': status,
+               'Z': None if z is None else self._z_str(z)}
+        if solution is not None and 'error' in solution: rec['error'] = solution['error']
+        elif details and solution is not None: rec['solution'] = solution
+        return rec
+
+    def iter_nodes(self, details=True):
+        # Gera os nós na ordem em que são resolvidos; com details=False os
+        # registros levam só Z e status, sem os valores das variáveis
+        if self.cuts: self._root_cuts()
+        elif not self.solver.is_sparse and prefers_interior_point(len(self.b), self.n): self._root_interior_point()
+        self._push(BnBNode("P0", 1, (), np.inf, *self._root_warm))
+        if self.workers > 1:
+            yield from self._iter_serial(details, until=PARALLEL_MIN_NODES)
+            if self._heap and self.stopped != 'limite de tempo': yield from self._iter_parallel(details)
+        else: yield from self._iter_serial(details)
+        for _, node in sorted(self._heap, key=lambda item: item[0]): yield self._record(node, 'unexplored')
+
+    def _should_stop(self):
+        if self.max_nodes is not None and self.nodes_solved >= self.max_nodes:
+            self.stopped = 'limite de nós'
+        elif self._gap_closed():
+            self.stopped = 'gap atingido'
+        elif self.monitor is not None and self.monitor.deadline is not None and time.monotonic() > self.monitor.deadline:
+            self.stopped = 'limite de tempo'
+        else:
+            return False
+        return True
+
+    def _iter_serial(self, details, until=None):
+        while self._heap:
+            if until is not None and self.nodes_solved >= until: break
+            if self._should_stop(): break
+            _, node = heapq.heappop(self._heap)
+
+            # Poda pelo limite do pai, antes mesmo de resolver o LP
+            if self._prune(node.bound):
+                yield self._record(node, 'pruned', node.bound)
+                continue
+
+            try:
+                if self.monitor is not None: self._report()
+                status, engine = self._solve_node(node)
+            except SolveInterrupted as e:
+                if e.reason != 'time_limit': raise
+                # Estourou o tempo: devolve a melhor solução inteira até aqui
+                yield self._record(node, 'unexplored')
+                self.stopped = 'limite de tempo'
+                break
+            yield from self._expand(node, status, engine, details)
+
+    # --- MODO PARALELO: RODADAS SÍNCRONAS SOBRE UM POOL DE PROCESSOS ---
+    # A cada rodada saem da fila até 2 nós por processo; os LPs são resolvidos
+    # nos processos (com a incumbente da rodada como corte) e os resultados
+    # voltam na ordem em que os nós saíram da fila. Incumbentes, ramificação
+    # e heurísticas ficam no processo principal, então para um mesmo número
+    # de processos a árvore e a resposta são sempre as mesmas.
+    def _iter_parallel(self, details):
+        pool = _get_node_pool(self.workers)
+        token = uuid.uuid4().hex
+        blob = pickle.dumps((self.A, self.b, self.c, self.senses, self.lb, self.ub), pickle.HIGHEST_PROTOCOL)
+        futures = []
+        try:
+            while self._heap:
+                if self._should_stop(): break
+                batch = []
+                size = 2 * self.workers
+                if self.max_nodes is not None: size = min(size, self.max_nodes - self.nodes_solved)
+                while self._heap and len(batch) < size:
+                    _, node = heapq.heappop(self._heap)
+                    if self._prune(node.bound): yield self._record(node, 'pruned', node.bound)
+                    else: batch.append(node)
+                if not batch: continue
+                try:
+                    if self.monitor is not None: self._report()
+                except SolveInterrupted as e:
+                    if e.reason != 'time_limit': raise
+                    for node in batch: self._push(node)
+                    self.stopped = 'limite de tempo'
+                    break
+                # Corte (forma de minimização do motor) = incumbente da rodada
+                cutoff = None if self.incumbent is None else -self._cutoff()
+                deadline = None if self.monitor is None else self.monitor.deadline
+                futures = [pool.submit(_solve_node_task, token, blob, node.changes, node.warm_basis, node.warm_x,
+                                       cutoff, None if deadline is None else max(deadline - time.monotonic(), 1e-3))
+                           for node in batch]
+                for k, (node, future) in enumerate(zip(batch, futures)):
+                    result = future.result()
+                    if result.status == 'time_limit':
+                        yield self._record(node, 'unexplored')
+                        for rest in batch[k + 1:]: self._push(rest)
+                        self.stopped = 'limite de tempo'
+                        return
+                    self.nodes_solved += 1
+                    self.lp_iterations += result.iterations
+                    if result.status == 'cutoff':
+                        # O simplex dual passou do corte: o LP nem precisou terminar
+                        self._prune(-result.z)
+                        yield self._record(node, 'pruned', -result.z)
+                        continue
+                    yield from self._expand(node, result.status, result, details)
+        except BrokenProcessPool:
+            _discard_node_pool(self.workers)
+            raise
+        finally:
+            # Parada antecipada (tempo, cancelamento, gerador fechado): o pool
+            # continua para as próximas resoluções, mas nada desta fica rodando
+            for future in futures: future.cancel()
+            wait(futures)
+
+    def _expand(self, node, status, engine, details):
+        # Nó com o LP resolvido: poda, incumbente, limite de profundidade ou ramificação
+        if status != 'optimal':
+            yield self._record(node, 'infeasible' if status == 'infeasible' else 'unbounded',
+                               solution={'error': NODE_ERRORS.get(status, status)})
+            return
+
+        x = engine.primal
+        z = -engine.z
+        with self.solver._phase('formatting'): solution = self._format(x, z)
+        if self._prune(z):
+            yield self._record(node, 'pruned', z, solution, details)
+            return
+
+        # Variável mais fracionada
+        frac = np.abs(x - np.round(x))
+        branch_idx = int(np.argmax(frac))
+        if frac[branch_idx] <= 1e-4:
+            self._offer_incumbent(np.round(x), 'node')
+            yield self._record(node, 'integer', z, solution, details)
+            return
+
+        if self.max_depth is not None and node.depth >= self.max_depth:
+            # Fracionário no limite de profundidade: a árvore fica incompleta
+            self.stopped = self.stopped or 'limite de profundidade'
+            self._closed_bound = max(self._closed_bound, z)
+            yield self._record(node, 'depth_limit', z, solution, details)
+            return
+
+        # Heurísticas primais: uma incumbente melhor pode podar este nó
+        with self.solver._phase('heuristics'): self._run_heuristics(node, engine, x)
+        if self._prune(z):
+            yield self._record(node, 'pruned', z, solution, details)
+            return
+        yield self._record(node, 'branched', z, solution, details)
+
+        val = x[branch_idx]
+        fl, cl = math.floor(val), math.ceil(val)
+        # Ramificar só aperta um limite: a base do pai continua
+        # dual-viável e o filho é reotimizado pelo simplex dual
+        warm_basis = engine.basis.copy()
+        warm_x = engine.x.copy()
+        self._push(BnBNode(f"{node.id}.1", node.depth + 1, node.changes + ((branch_idx, '<=', float(fl)),), z,
+                           warm_basis, warm_x, f"x{branch_idx+1} <= {fl}"))
+        self._push(BnBNode(f"{node.id}.2", node.depth + 1, node.changes + ((branch_idx, '>=', float(cl)),), z,
+                           warm_basis, warm_x, f"x{branch_idx+1} >= {cl}"))
+
+    def run(self, details=True):
+        # Árvore aninhada (formato usado pelo front-end), montada a partir dos registros planos
+        nested = {}
+        for rec in self.iter_nodes(details):
+            solution = rec.get('solution')
+            if 'error' in rec: solution = {'error': rec['error']}
+            elif solution is None and rec['Z'] is not None: solution = {'Z': rec['Z']}
+            nested[rec['id']] = {'id': rec['id'], 'solution': solution, 'children': [],
+                                 'status': rec['status'], 'branch_info': rec['branch_info']}
+            if rec['parent'] is not None: nested[rec['parent']]['children'].append(nested[rec['id']])
+        for node in nested.values():
+            node['children'].sort(key=lambda child: child['id'])
+        return nested.get('P0'), self.incumbent
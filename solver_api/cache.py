@@ -0,0 +1,154 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from django.conf import settings
+
+
+# --- CHAVE CANÔNICA DO PROBLEMA ---
+def problem_key(solver, **options):
+    # O mesmo modelo enviado denso, por linhas esparsas ou em COO gera a mesma
+    # chave: o hash é feito sobre a matriz CSR normalizada
+    A, senses, rhs = solver._problem_arrays()
+    c = solver.objective_function * (-1 if solver.is_minimization else 1)
+    h = hashlib.sha256()
+    h.update(json.dumps({'objective': solver.objective, 'shape': A.shape, 'senses': senses,
+                         'bounds': solver.bounds, 'options': options}, sort_keys=True, default=str).encode())
+    for arr in (c, A.indptr, A.indices, A.data, rhs):
+        h.update(np.ascontiguousarray(arr, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+# --- BACKENDS ---
+class LRUBackend:
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None: return None
+            expires, value = item
+            if self.ttl and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl or 0), copy.deepcopy(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries: self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DjangoCacheBackend:
+    # Usa o framework de cache do Django (locmem, arquivo, banco...)
+    def __init__(self, alias='default', ttl=3600, prefix='solver'):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.cache.get(f'{self.prefix}:{key}')
+
+    def set(self, key, value):
+        self.cache.set(f'{self.prefix}:{key}', value, self.ttl)
+
+    def clear(self):
+        self.cache.clear()
+
+
+# --- CACHE DE RESULTADOS (TEXTO E GRÁFICOS SEPARADOS) ---
+class ResultCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.counters = {'result': {'hits': 0, 'misses': 0}, 'graph': {'hits': 0, 'misses': 0}}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, key):
+        value = self.backend.get(f'{kind}:{key}')
+        with self._lock: self.counters[kind]['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def get_result(self, key):
+        return self._get('result', key)
+
+    def set_result(self, key, value):
+        self.backend.set(f'result:{key}', value)
+
+    def get_graph(self, key, fmt):
+        return self._get('graph', f'{key}:{fmt}')
+
+    def set_graph(self, key, fmt, blob):
+        self.backend.set(f'graph:{key}:{fmt}', blob)
+
+    def stats(self):
+        with self._lock: counters = copy.deepcopy(self.counters)
+        counters['backend'] = type(self.backend).__name__
+        return counters
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_result_cache():
+    # Configurado por settings.SOLVER_CACHE; padrão: LRU em memória
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            conf = getattr(settings, 'SOLVER_CACHE', {})
+            ttl = conf.get('TTL', 3600)
+            if conf.get('BACKEND', 'lru') == 'django':
+                backend = DjangoCacheBackend(conf.get('ALIAS', 'default'), ttl)
+            else:
+                backend = LRUBackend(conf.get('MAX_ENTRIES', 256), ttl)
+            _cache = ResultCache(backend)
+        return _cache
+
+
+def _complete(status_msg):
+    # B&B interrompido (tempo, nós, gap, profundidade) não entra no cache:
+    # com limite de tempo, a mesma chave pode dar outra árvore na próxima vez
+    return not status_msg.startswith("Árvore Parcial")
+
+
+def cached_solve(solver, graph_format='gif', **options):
+    # O resultado textual e o gráfico ficam em entradas separadas: clientes
+    # com graph_format='none' nunca pagam pela renderização
+    cache = get_result_cache()
+    key = problem_key(solver, **options)
+    entry = cache.get_result(key)
+    graph = None
+    if entry is None:
+        status_msg, solution = solver.solve(graph_format=graph_format, **options)
+        if not _complete(status_msg): return status_msg, solution
+        graph = solution.pop('graph_base64', None); solution.pop('graph_format', None)
+        # Os pontos do gráfico vão junto: outro formato é só redesenhado, sem resolver
+        entry = {'status': status_msg, 'solution': solution, 'graph_args': solver.graph_args}
+        cache.set_result(key, entry)
+        if graph: cache.set_graph(key, graph_format, graph)
+    elif graph_format != 'none' and entry.get('graph_args') is not None:
+        graph = cache.get_graph(key, graph_format)
+        if graph is None:
+            graph = solver.render_graph(entry['graph_args'], graph_format)
+            if graph: cache.set_graph(key, graph_format, graph)
+
+    status_msg, solution = entry['status'], entry['solution']
+    if graph:
+        solution['graph_base64'] = graph
+        solution['graph_format'] = graph_format
+    return status_msg, solution
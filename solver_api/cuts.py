@@ -0,0 +1,125 @@
+import numpy as np
+from .revised_simplex import RevisedSimplex
+
+
+# --- PLANOS DE CORTE NA RAIZ (GOMORY MISTO-INTEIRO) ---
+# Cada linha da base ótima com uma variável inteira fracionária gera um corte
+# GMI: com as não básicas escritas como distância ao limite (t_j >= 0),
+#   Σ_{int, f_j<=f0} f_j/f0·t_j + Σ_{int, f_j>f0} (1-f_j)/(1-f0)·t_j
+#   + Σ_{cont, a_j>0} a_j/f0·t_j + Σ_{cont, a_j<0} -a_j/(1-f0)·t_j >= 1
+# As variáveis lógicas são tratadas como contínuas e depois eliminadas
+# (s = b - A·x), então o corte fica só nas variáveis estruturais. Os cortes
+# entram como linhas '>=' e o LP é reotimizado pelo simplex dual; cortes com
+# folga são descartados a cada rodada.
+class CuttingPlanes:
+    def __init__(self, A, senses, b, c, lb, ub, max_rounds=5, max_cuts=20, monitor=None):
+        self.base_A, self.base_senses, self.base_b = A, list(senses), np.asarray(b, dtype=float)
+        self.c, self.lb, self.ub = c, lb, ub
+        self.n = A.shape[1]
+        self.max_rounds = max_rounds
+        self.max_cuts = max_cuts
+        self.monitor = monitor
+        self.cuts = []  # (índices, valores, rhs) de linhas '>='
+        # Limite inteiro nos dois lados: a variável deslocada continua inteira
+        integral = lambda v: ~np.isfinite(v) | (np.abs(np.where(np.isfinite(v), v, 0) - np.round(np.where(np.isfinite(v), v, 0))) < 1e-9)
+        self.int_bounds = integral(lb) & integral(ub)
+        self.stats = {'rounds': 0, 'generated': 0, 'purged': 0}
+
+    def problem(self):
+        A = self.base_A.vstack_rows([(idx, val) for idx, val, _ in self.cuts])
+        senses = self.base_senses + ['>='] * len(self.cuts)
+        b = np.concatenate([self.base_b, [rhs for _, _, rhs in self.cuts]])
+        return A, senses, b
+
+    def _engine(self):
+        A, senses, b = self.problem()
+        return RevisedSimplex(A, b, self.c, senses, self.lb, self.ub, monitor=self.monitor)
+
+    def _gomory_cut(self, engine, r, f0):
+        n, m, tol = engine.n, engine.m, 1e-9
+        e = np.zeros(m); e[r] = 1.0
+        rho = engine.lu.btran(e)
+        row = np.concatenate([engine.A.tdot(rho), rho])
+        nb = ~engine.is_basic & (np.abs(row) > tol) & (engine.ub > engine.lb)
+        at_lb = nb & np.isclose(engine.x, engine.lb)
+        at_ub = nb & ~at_lb & np.isclose(engine.x, engine.ub)
+        if (nb & ~at_lb & ~at_ub).any(): return None  # não básica livre fora dos limites
+        a = np.where(at_ub, -row, row)
+        is_int = np.zeros(n + m, dtype=bool); is_int[:n] = self.int_bounds
+        f = a - np.floor(a)
+        g = np.where(is_int, np.where(f <= f0, f / f0, (1 - f) / (1 - f0)),
+                     np.where(a > 0, a / f0, -a / (1 - f0)))
+        g[~(at_lb | at_ub)] = 0.0
+        # t_j = x_j - l_j (no inferior) ou u_j - x_j (no superior)
+        sigma = np.where(at_ub, -1.0, 1.0)
+        coef = g * sigma
+        bound = np.where(at_ub, engine.ub, engine.lb)
+        rhs = 1.0 + float(coef[g != 0] @ bound[g != 0])
+        # Elimina as lógicas: s_i = b_i - a_i·x
+        gamma = coef[n:]
+        pi = coef[:n] - engine.A.tdot(gamma)
+        rhs -= float(gamma @ engine.b)
+        scale = np.abs(pi).max()
+        if scale < tol: return None
+        pi /= scale; rhs /= scale
+        pi[np.abs(pi) < 1e-12] = 0.0
+        nz = np.nonzero(pi)[0]
+        if np.abs(pi[nz]).min() < 1e-8: return None  # faixa dinâmica grande demais
+        efficacy = (rhs - pi @ engine.x[:n]) / np.linalg.norm(pi)
+        if efficacy < 1e-4: return None
+        return nz, pi[nz], rhs, efficacy
+
+    def _purge(self, engine):
+        # Tira os cortes com folga (lógica básica e longe de zero)
+        m0 = len(self.base_senses)
+        slack = [k for k in range(len(self.cuts))
+                 if engine.is_basic[engine.n + m0 + k] and engine.x[engine.n + m0 + k] < -1e-6]
+        if not slack: return engine.basis, engine.x
+        drop = set(slack)
+        keep = [k for k in range(len(self.cuts)) if k not in drop]
+        self.cuts = [self.cuts[k] for k in keep]
+        self.stats['purged'] += len(drop)
+        # Reindexa base e x: as lógicas dos cortes restantes mudam de posição
+        old = engine.n + m0
+        new_index = {old + k: old + i for i, k in enumerate(keep)}
+        basis = [j if j < old else new_index[j] for j in engine.basis if j < old or j in new_index]
+        x = np.concatenate([engine.x[:old], engine.x[[old + k for k in keep]]])
+        return np.array(basis), x
+
+    def run(self):
+        # Devolve o motor final (base ótima do LP com cortes) ou None se o LP não for ótimo
+        engine = self._engine()
+        if engine.solve() != 'optimal': return None
+        self.stats['bound_before'] = -engine.z
+        z_prev = engine.z
+        for _ in range(self.max_rounds):
+            xs = engine.x[engine.basis]
+            frac = np.abs(xs - np.round(xs))
+            rows = [r for r in np.argsort(-frac) if engine.basis[r] < self.n and self.int_bounds[engine.basis[r]]
+                    and frac[r] > 1e-3]
+            new = []
+            for r in rows:
+                xv = xs[r]; f0 = xv - np.floor(xv)
+                if not 1e-3 < f0 < 1 - 1e-3: continue
+                cut = self._gomory_cut(engine, r, f0)
+                if cut is not None: new.append(cut)
+                if len(new) >= self.max_cuts: break
+            if not new: break
+            self.stats['rounds'] += 1
+            self.stats['generated'] += len(new)
+            m_old = engine.m
+            self.cuts += [(idx, val, rhs) for idx, val, rhs, _ in new]
+            # Lógicas dos cortes novos entram na base; a base segue dual-viável
+            basis = np.concatenate([engine.basis, np.arange(engine.n + m_old, engine.n + m_old + len(new))])
+            x = np.concatenate([engine.x, np.zeros(len(new))])
+            engine = self._engine()
+            if engine.solve(basis=basis, x=x) != 'optimal': return None
+            basis, x = self._purge(engine)
+            if len(basis) != engine.m:
+                engine = self._engine()
+                if engine.solve(basis=basis, x=x) != 'optimal': return None
+            if engine.z - z_prev < 1e-6 * (1 + abs(z_prev)): break
+            z_prev = engine.z
+        self.stats['bound_after'] = -engine.z
+        self.stats['active'] = len(self.cuts)
+        return engine
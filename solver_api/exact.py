@@ -0,0 +1,163 @@
+import math
+from fractions import Fraction
+import numpy as np
+
+
+def to_exact(value):
+    # Usa a representação decimal do número (0.1 -> 1/10), não o binário do float
+    if isinstance(value, Fraction): return value
+    if isinstance(value, str): return Fraction(value)
+    return Fraction(str(float(value)))
+
+
+def exact_str(value):
+    value = Fraction(value)
+    if value.denominator == 1: return str(value.numerator)
+    return f"{value.numerator}/{value.denominator}"
+
+
+# --- SIMPLEX EXATO COM PIVOTEAMENTO LIVRE DE FRAÇÕES (BAREISS) ---
+# O tableau é mantido em inteiros: T = d·B⁻¹·T0, onde d é o último pivô
+# (determinante da base). Cada pivô faz T[i] = (p·T[i] - T[i,k]·T[r]) / d com
+# divisão exata, então os números crescem no máximo como os menores de A.
+class ExactSimplex:
+    def __init__(self, constraints, c, max_iter=5000, monitor=None):
+        # constraints: lista de (coeficientes, sinal, rhs); c: custos (maximização)
+        self.m = len(constraints)
+        self.n = len(c)
+        self.max_iter = max_iter
+        self.monitor = monitor
+        self.iterations = 0
+        rows, senses, self.row_scale = [], [], []
+        for coeffs, sign, rhs in constraints:
+            vals = [to_exact(v) for v in coeffs] + [to_exact(rhs)]
+            scale = math.lcm(*(v.denominator for v in vals))
+            if vals[-1] < 0:
+                scale = -scale
+                sign = {'<=': '>=', '>=': '<=', '=': '='}[sign]
+            rows.append([int(v * scale) for v in vals])
+            senses.append(sign)
+            self.row_scale.append(scale)
+        cs = [to_exact(v) for v in c]
+        self.c_scale = math.lcm(*(v.denominator for v in cs)) if cs else 1
+
+        # Colunas: estruturais | folga/excesso (uma por linha '<=' ou '>=') | artificiais
+        own = [i for i, s in enumerate(senses) if s in ('<=', '>=')]
+        arts = [i for i, s in enumerate(senses) if s in ('>=', '=')]
+        self.own_col = {i: self.n + k for k, i in enumerate(own)}
+        self.art_col = {i: self.n + len(own) + k for k, i in enumerate(arts)}
+        self.art_start = self.n + len(own)
+        ncols = self.art_start + len(arts)
+        T = np.zeros((self.m + 2, ncols + 1), dtype=object)
+        T[:] = 0
+        self.basis = [0] * self.m
+        for i, (row, sign) in enumerate(zip(rows, senses)):
+            T[i+2, :self.n] = row[:-1]; T[i+2, -1] = row[-1]
+            if sign == '<=':
+                T[i+2, self.own_col[i]] = 1; self.basis[i] = self.own_col[i]
+            else:
+                if sign == '>=': T[i+2, self.own_col[i]] = -1
+                T[i+2, self.art_col[i]] = 1; self.basis[i] = self.art_col[i]
+        # Linha 0: objetivo (fase 2); linha 1: soma das artificiais (fase 1)
+        T[0, :self.n] = [-int(v * self.c_scale) for v in cs]
+        for i in arts: T[1] -= T[i+2]
+        for i in arts: T[1, self.art_col[i]] = 0
+        # Coluna unitária original de cada linha (lê os duais na linha 0)
+        self.unit_col = [self.own_col[i] if senses[i] == '<=' else self.art_col[i] for i in range(self.m)]
+        self.T = T
+        self.d = 1
+
+    def _pivot(self, r, k):
+        T = self.T
+        p = T[r, k]
+        new = (p * T - np.outer(T[:, k], T[r])) // self.d
+        new[r] = T[r]
+        # Pivô negativo (saída de artificial, base instalada) inverte os sinais
+        # do tableau escalado: T e d trocam de sinal juntos, sem mudar T/d
+        if p < 0: new, p = -new, -p
+        self.T = new
+        self.d = p
+        self.basis[r - 2] = k
+        self.iterations += 1
+
+    def _run(self, obj_row, allowed):
+        # Regra de Bland: garante término mesmo com degeneração
+        while True:
+            if self.iterations >= self.max_iter: return 'iteration_limit'
+            if self.monitor is not None: self.monitor.tick(iteration=self.iterations)
+            row = self.T[obj_row, :-1]
+            k = next((j for j in range(len(row)) if allowed[j] and row[j] < 0), None)
+            if k is None: return 'optimal'
+            best = None
+            for i in range(2, self.m + 2):
+                a = self.T[i, k]
+                if a > 0:
+                    ratio = Fraction(self.T[i, -1], a)
+                    if best is None or ratio < best[0] or (ratio == best[0] and self.basis[i-2] < self.basis[best[1]-2]):
+                        best = (ratio, i)
+            if best is None: return 'unbounded'
+            self._pivot(best[1], k)
+
+    def _drive_out_artificials(self):
+        # Artificiais básicas em zero saem da base quando possível
+        for r in range(2, self.m + 2):
+            if self.basis[r-2] >= self.art_start:
+                k = next((j for j in range(self.art_start) if self.T[r, j] != 0), None)
+                if k is not None: self._pivot(r, k)
+
+    def _phase2(self):
+        allowed = [j < self.art_start for j in range(self.T.shape[1] - 1)]
+        return self._run(0, allowed)
+
+    def solve(self):
+        if self.art_start < self.T.shape[1] - 1:
+            status = self._run(1, [True] * (self.T.shape[1] - 1))
+            if status != 'optimal': return status
+            if Fraction(self.T[1, -1], self.d) < 0: return 'infeasible'
+            self._drive_out_artificials()
+        return self._phase2()
+
+    def solve_from_basis(self, columns):
+        # Instala uma base dada (ex.: a do simplex em ponto flutuante) com
+        # pivôs exatos; se ela for viável, segue direto para a fase 2
+        self.repair_pivots = 0
+        free_rows = set(range(2, self.m + 2))
+        for k in columns:
+            r = next((i for i in sorted(free_rows) if self.T[i, k] != 0), None)
+            if r is None: return None
+            self._pivot(r, k)
+            free_rows.discard(r)
+        for r in range(2, self.m + 2):
+            if self.T[r, -1] < 0: return None
+            if self.basis[r-2] >= self.art_start and self.T[r, -1] != 0: return None
+        installed = self.iterations
+        status = self._phase2()
+        self.repair_pivots = self.iterations - installed
+        return status
+
+    def float_basis_columns(self, basis, n):
+        # Converte a base do RevisedSimplex (estruturais | lógicas) para as
+        # colunas deste tableau; a lógica de uma linha '=' é a sua artificial
+        cols = []
+        for j in basis:
+            if j < n: cols.append(int(j))
+            else:
+                i = int(j) - n
+                cols.append(self.own_col[i] if i in self.own_col else self.art_col[i])
+        return cols
+
+    # --- RESULTADOS EXATOS ---
+    @property
+    def primal(self):
+        x = [Fraction(0)] * self.n
+        for r, j in enumerate(self.basis):
+            if j < self.n: x[j] = Fraction(self.T[r+2, -1], self.d)
+        return x
+
+    @property
+    def objective_value(self):
+        return Fraction(self.T[0, -1], self.d * self.c_scale)
+
+    @property
+    def duals(self):
+        return [Fraction(self.T[0, self.unit_col[i]], self.d * self.c_scale) * self.row_scale[i] for i in range(self.m)]
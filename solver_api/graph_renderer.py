@@ -0,0 +1,109 @@
+import io
+import base64
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image as PILImage
+from .main_solver import GRAPH_FORMATS
+
+
+# --- RENDERIZADOR DO MÉTODO GRÁFICO ---
+# A figura e as camadas estáticas (restrições, região viável, pontos) são
+# desenhadas uma única vez; a cada quadro só a reta de Z é redesenhada sobre
+# o fundo salvo, e os pixels saem direto do buffer RGBA do canvas.
+class GraphRenderer:
+    def __init__(self, objective_function, constraints, feasible_points, best_point, int_point=None,
+                 num_frames=12, hold_frames=5, frame_ms=100, dpi=80):
+        self.objective_function = objective_function
+        self.constraints = constraints
+        self.feasible_points = feasible_points
+        self.best_point = best_point
+        self.int_point = int_point
+        self.num_frames = num_frames
+        self.hold_frames = hold_frames
+        self.frame_ms = frame_ms
+        self.dpi = dpi
+
+    def _build_figure(self):
+        fps = self.feasible_points; best_point = self.best_point
+        all_points = list(fps) + ([tuple(best_point)] if best_point is not None else [])
+        if not all_points: return None
+        max_x = max(p[0] for p in all_points) * 1.2
+        max_y = max(p[1] for p in all_points) * 1.2
+        limit = max(max_x, max_y, 10)
+        self.x_vals = np.linspace(0, limit, 200)
+        self.limit = limit
+
+        fig = Figure(figsize=(5, 5), dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_xlim(-0.5, limit); ax.set_ylim(-0.5, limit); ax.set_xlabel("x1"); ax.set_ylabel("x2")
+        for coeffs, sign, rhs in self.constraints:
+            c1, c2 = coeffs
+            if c2 != 0:
+                y_vals = np.clip((rhs - c1 * self.x_vals) / c2, -limit, limit*2)
+                ax.plot(self.x_vals, y_vals, label=f'{c1}x1 + {c2}x2 {sign} {rhs}')
+            elif c1 != 0: ax.axvline(x=rhs/c1, color='orange', linestyle='--')
+
+        if len(fps) >= 3:
+            pts = np.array(fps); cent = pts.mean(axis=0)
+            order = np.argsort(np.arctan2(pts[:, 1] - cent[1], pts[:, 0] - cent[0]))
+            ax.add_patch(Polygon(pts[order], color='skyblue', alpha=0.4))
+        if len(fps) > 0:
+            fp = np.array(fps); ax.plot(fp[:, 0], fp[:, 1], 'ro', markersize=5)
+        if best_point is not None: ax.plot(best_point[0], best_point[1], 'go', markersize=8, zorder=5, label='Ótimo')
+        if self.int_point is not None: ax.plot(self.int_point[0], self.int_point[1], 'o', color='darkorange', markersize=8, zorder=6, label='Inteiro')
+
+        ax.grid(True, linestyle='--', alpha=0.5)
+        ax.legend(loc='best', fontsize='x-small', framealpha=0.6)
+        fig.tight_layout()
+
+        # Reta da função objetivo: único artista que muda entre quadros
+        c1_obj, c2_obj = self.objective_function
+        if c2_obj != 0: (self.z_line,) = ax.plot(self.x_vals, np.zeros_like(self.x_vals), 'k--', linewidth=1.5)
+        else: self.z_line = ax.axvline(x=0, color='k', linestyle='--', linewidth=1.5)
+        self.z_line.set_animated(True)
+        self.fig, self.canvas, self.ax = fig, canvas, ax
+        return fig
+
+    def _set_z(self, z):
+        c1_obj, c2_obj = self.objective_function
+        if c2_obj != 0:
+            self.z_line.set_ydata(np.clip((z - c1_obj * self.x_vals) / c2_obj, -self.limit, self.limit*2))
+        elif c1_obj != 0:
+            self.z_line.set_xdata([z / c1_obj, z / c1_obj])
+
+    def _z_opt(self):
+        return float(np.dot(self.objective_function, self.best_point)) if self.best_point is not None else 0.0
+
+    def _frames(self):
+        self.canvas.draw()
+        background = self.canvas.copy_from_bbox(self.fig.bbox)
+        z_opt = self._z_opt()
+        for i in range(self.num_frames + 1):
+            self.canvas.restore_region(background)
+            self._set_z(z_opt * i / self.num_frames)
+            self.ax.draw_artist(self.z_line)
+            rgba = np.asarray(self.canvas.buffer_rgba())
+            yield PILImage.fromarray(rgba[..., :3].copy())
+
+    def render(self, fmt='gif'):
+        if fmt == 'none': return None
+        if fmt not in GRAPH_FORMATS: raise ValueError(f"Formato de gráfico '{fmt}' desconhecido.")
+        if self._build_figure() is None: return None
+        buf = io.BytesIO()
+        if fmt == 'gif':
+            frames = list(self._frames())
+            # Os quadros finais repetidos viram um quadro só, exibido por mais tempo
+            durations = [self.frame_ms] * self.num_frames + [self.frame_ms * self.hold_frames]
+            frames[0].save(buf, format='GIF', save_all=True, append_images=frames[1:], duration=durations)
+        else:
+            self.z_line.set_animated(False)
+            self._set_z(self._z_opt())
+            if fmt == 'png':
+                self.canvas.draw()
+                PILImage.fromarray(np.asarray(self.canvas.buffer_rgba())[..., :3].copy()).save(buf, format='PNG')
+            else:
+                self.fig.savefig(buf, format='svg')
+        return base64.b64encode(buf.getvalue()).decode('utf-8')
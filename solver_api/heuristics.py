@@ -0,0 +1,106 @@
+import numpy as np
+from .revised_simplex import RevisedSimplex
+from .sparse import SparseMatrix
+from .monitor import SolveInterrupted
+
+
+# --- HEURÍSTICAS PRIMAIS PARA O BRANCH AND BOUND ---
+# Procuram soluções inteiras cedo, para que a poda por limite comece antes
+# de a árvore chegar a uma folha inteira:
+#   arredondamento -> arredonda a solução do LP de cada nó e testa viabilidade
+#   mergulho       -> aperta o limite da variável menos fracionária e
+#                     reotimiza pelo simplex dual, até ficar inteiro ou inviável
+#   feasibility pump -> alterna entre arredondar x* e achar o ponto do LP mais
+#                     próximo (norma L1) do arredondado; só na raiz
+class PrimalHeuristics:
+    def __init__(self, bnb, dive_every=10, max_dive=None, pump_iters=10, tol=1e-6):
+        self.bnb = bnb
+        self.dive_every = dive_every
+        # Cada passo do mergulho fixa uma variável; o LP tem no máximo m básicas fracionárias
+        self.max_dive = max_dive if max_dive is not None else max(50, bnb.A.shape[0] + 10)
+        self.pump_iters = pump_iters
+        self.tol = tol
+        self.stats = {'rounding': 0, 'diving': 0, 'pump': 0, 'lp_solves': 0}
+
+    # --- VIABILIDADE DE UM PONTO INTEIRO NO PROBLEMA DA RAIZ ---
+    def _feasible(self, x):
+        bnb, tol = self.bnb, self.tol
+        if (x < bnb.lb - tol).any() or (x > bnb.ub + tol).any(): return False
+        act = bnb.A.dot(x)
+        senses = np.asarray(bnb.senses)
+        scale = tol * np.maximum(1.0, np.abs(bnb.b))
+        return not (((senses == '<=') & (act > bnb.b + scale)).any() or
+                    ((senses == '>=') & (act < bnb.b - scale)).any() or
+                    ((senses == '=') & (np.abs(act - bnb.b) > scale)).any())
+
+    def _offer(self, x, source):
+        if self._feasible(x) and self.bnb._offer_incumbent(x, source): self.stats[source] += 1
+
+    def rounding(self, x):
+        self._offer(np.round(x), 'rounding')
+
+    # --- MERGULHO FRACIONÁRIO ---
+    def dive(self, changes, engine):
+        bnb = self.bnb
+        try:
+            for _ in range(self.max_dive):
+                x = engine.primal
+                if -engine.z <= bnb.incumbent_z + 1e-6: return
+                frac = np.abs(x - np.round(x))
+                cand = np.where(frac > 1e-4)[0]
+                if len(cand) == 0:
+                    self._offer(np.round(x), 'diving')
+                    return
+                j = cand[np.argmin(frac[cand])]
+                v = x[j]
+                change = (int(j), '<=', float(np.floor(v))) if v - np.floor(v) < 0.5 else (int(j), '>=', float(np.ceil(v)))
+                changes = changes + (change,)
+                nxt = bnb._node_lp(changes)
+                self.stats['lp_solves'] += 1
+                if nxt.solve(basis=engine.basis.copy(), x=engine.x.copy()) != 'optimal': return
+                engine = nxt
+        except SolveInterrupted as e:
+            if e.reason != 'time_limit': raise
+
+    # --- FEASIBILITY PUMP (VERSÃO SIMPLES, NORMA L1) ---
+    def _distance_lp(self, target):
+        # Δ(x) = Σ_{x~=l} (x_j - l_j) + Σ_{x~=u} (u_j - x_j) + Σ_{resto} d_j, com
+        # x_j - d_j <= x~_j e x_j + d_j >= x~_j só para quem ficou entre os limites
+        bnb = self.bnb
+        n, A = bnb.n, bnb.A
+        at_lb, at_ub = target <= bnb.lb, target >= bnb.ub
+        inner = np.where(~at_lb & ~at_ub)[0]
+        k = len(inner)
+        cost = np.concatenate([np.where(at_lb, 1.0, np.where(at_ub, -1.0, 0.0)), np.ones(k)])
+        rows = [(A.indices[A.indptr[i]:A.indptr[i+1]], A.data[A.indptr[i]:A.indptr[i+1]]) for i in range(A.shape[0])]
+        rows += [([j, n + t], [1.0, -1.0]) for t, j in enumerate(inner)] + [([j, n + t], [1.0, 1.0]) for t, j in enumerate(inner)]
+        P = SparseMatrix.from_rows(rows, n + k)
+        senses = list(bnb.senses) + ['<='] * k + ['>='] * k
+        rhs = np.concatenate([bnb.b, target[inner], target[inner]])
+        lb = np.concatenate([bnb.lb, np.zeros(k)]); ub = np.concatenate([bnb.ub, np.full(k, np.inf)])
+        return RevisedSimplex(P, rhs, cost, senses, lb, ub, monitor=bnb.monitor)
+
+    def pump(self, x):
+        bnb = self.bnb
+        n = bnb.n
+        target = np.clip(np.round(x), bnb.lb, bnb.ub)
+        rng = np.random.default_rng(0)
+        try:
+            for _ in range(self.pump_iters):
+                engine = self._distance_lp(target)
+                self.stats['lp_solves'] += 1
+                if engine.solve() != 'optimal': return
+                xs = engine.primal[:n]
+                if np.abs(xs - np.round(xs)).max() <= 1e-6:
+                    self._offer(np.round(xs), 'pump')
+                    return
+                new = np.clip(np.round(xs), bnb.lb, bnb.ub)
+                if np.array_equal(new, target):
+                    # Ciclo: troca o arredondamento das variáveis mais distantes
+                    k = max(1, n // 10) + int(rng.integers(0, max(1, n // 10) + 1))
+                    far = np.argsort(-np.abs(xs - new))[:k]
+                    new[far] = np.where(xs[far] > new[far], new[far] + 1, new[far] - 1)
+                    new = np.clip(new, bnb.lb, bnb.ub)
+                target = new
+        except SolveInterrupted as e:
+            if e.reason != 'time_limit': raise
@@ -0,0 +1,188 @@
+import numpy as np
+from .revised_simplex import RevisedSimplex
+
+# A partir deste tamanho (linhas × variáveis, modelo denso) o modo 'auto' usa pontos interiores
+INTERIOR_POINT_MIN_SIZE = 20000
+
+
+def prefers_interior_point(m, n):
+    # Equações normais m×m: em modelos bem mais altos que largos o simplex ganha
+    return m * n >= INTERIOR_POINT_MIN_SIZE and m <= 2 * n
+
+
+# --- PONTOS INTERIORES (PRIMAL-DUAL, PREDITOR-CORRETOR DE MEHROTRA) ---
+# Mesma forma do RevisedSimplex (A·x + s = b, limites em x e nas lógicas s),
+# levada à forma padrão min cᵀp, Āp = b̄, p >= 0:
+#   limite inferior finito -> v = l + p      superior só -> v = u - p
+#   livre -> v = p⁺ - p⁻                      fixa (l = u) -> sai do problema
+#   dois limites finitos -> linha extra p + w = u - l
+# Cada iteração resolve as equações normais Ā·D·Āᵀ por Cholesky (denso).
+class InteriorPoint:
+    def __init__(self, A, b, c, senses, lb=None, ub=None, tol=1e-8, max_iter=100, monitor=None):
+        self.engine = RevisedSimplex(A, b, c, senses, lb, ub)  # só para os limites e lógicas
+        self.A, self.senses = self.engine.A, list(senses)
+        self.b, self.c = self.engine.b, self.engine.c
+        self.m, self.n = self.A.shape
+        self.tol = tol
+        self.max_iter = max_iter
+        self.monitor = monitor
+        self.iterations = 0
+        self.status = None
+        self._standard_form()
+
+    def _standard_form(self):
+        e, n, m = self.engine, self.n, self.m
+        lb, ub = e.lb, e.ub
+        self.v0 = np.where(np.isfinite(lb), lb, np.where(np.isfinite(ub), ub, 0.0))
+        self.v0[lb == ub] = lb[lb == ub]
+        orig, sign, ub_rows = [], [], []
+        for k in range(n + m):
+            if lb[k] == ub[k]: continue
+            if np.isfinite(lb[k]):
+                if np.isfinite(ub[k]): ub_rows.append((len(orig), ub[k] - lb[k]))
+                orig.append(k); sign.append(1.0)
+            elif np.isfinite(ub[k]):
+                orig.append(k); sign.append(-1.0)
+            else:
+                orig += [k, k]; sign += [1.0, -1.0]
+        self.orig, self.sign = np.array(orig, dtype=np.int64), np.array(sign)
+        N = len(orig)
+        full = np.hstack([self.A.todense(), np.eye(m)])  # [A | I]
+        As = np.zeros((m + len(ub_rows), N))
+        As[:m] = full[:, self.orig] * self.sign
+        bs = np.concatenate([self.b - full @ self.v0, np.zeros(len(ub_rows))])
+        for r, (k, width) in enumerate(ub_rows):
+            As[m + r, k] = 1.0
+            bs[m + r] = width
+        # Folgas w das linhas de limite superior
+        if ub_rows:
+            W = np.zeros((m + len(ub_rows), len(ub_rows))); W[m:, :] = np.eye(len(ub_rows))
+            As = np.hstack([As, W])
+        self.As, self.bs = As, bs
+        self.cs = np.concatenate([e.cost[self.orig] * self.sign, np.zeros(len(ub_rows))])
+        self.N = N
+
+    def _solve_normal(self, L, d, r_p, r_d, r_c, x, z):
+        # Δy de (Ā D Āᵀ)Δy = r_p + Ā(D·r_d - r_c/z); depois Δx e Δz
+        As = self.As
+        rhs = r_p + As @ (d * r_d - r_c / z)
+        dy = np.linalg.solve(L.T, np.linalg.solve(L, rhs))
+        dz = r_d - As.T @ dy
+        dx = (r_c - x * dz) / z
+        return dx, dy, dz
+
+    def _factor(self, d):
+        M = (self.As * d) @ self.As.T
+        reg = 1e-12 * max(1.0, np.abs(np.diag(M)).max())
+        for _ in range(8):
+            try: return np.linalg.cholesky(M + reg * np.eye(len(M)))
+            except np.linalg.LinAlgError: reg *= 100
+        raise np.linalg.LinAlgError("Equações normais singulares")
+
+    @staticmethod
+    def _step(v, dv):
+        neg = dv < 0
+        if not neg.any(): return 1.0
+        with np.errstate(over='ignore', divide='ignore'):
+            return min(1.0, float((-v[neg] / dv[neg]).min()))
+
+    def _starting_point(self):
+        # Heurística de Mehrotra: mínimos quadrados e deslocamento para o interior
+        As, bs, cs = self.As, self.bs, self.cs
+        AAt = As @ As.T + 1e-10 * np.eye(len(As))
+        x = As.T @ np.linalg.solve(AAt, bs)
+        y = np.linalg.solve(AAt, As @ cs)
+        z = cs - As.T @ y
+        x += max(-1.5 * x.min(), 0.0) if len(x) else 0.0
+        z += max(-1.5 * z.min(), 0.0) if len(z) else 0.0
+        if len(x) and x @ z > 0:
+            x += 0.5 * (x @ z) / z.sum()
+            z += 0.5 * (x @ z) / x.sum()
+        return np.maximum(x, 1e-4), y, np.maximum(z, 1e-4)
+
+    def solve(self):
+        As, bs, cs, tol = self.As, self.bs, self.cs, self.tol
+        if self.N == 0 or len(As) == 0:
+            self.x, self.y, self.zs = np.zeros(self.N + len(As) - self.m), np.zeros(len(As)), cs.copy()
+            self.status = 'optimal' if np.abs(bs).max(initial=0.0) <= 1e-9 else 'infeasible'
+            return self._finish()
+        x, y, z = self._starting_point()
+        nb, nc = 1.0 + np.linalg.norm(bs), 1.0 + np.linalg.norm(cs)
+        status = 'iteration_limit'
+        for k in range(self.max_iter):
+            self.iterations = k
+            if self.monitor is not None: self.monitor.tick(iteration=k)
+            r_p = bs - As @ x
+            r_d = cs - As.T @ y - z
+            mu = (x @ z) / len(x)
+            pobj, dobj = cs @ x, bs @ y
+            err = max(np.linalg.norm(r_p) / nb, np.linalg.norm(r_d) / nc, abs(pobj - dobj) / (1.0 + abs(pobj)))
+            # Perto do ótimo as equações normais ficam mal condicionadas e r_p
+            # para de cair: com a complementaridade já zerada, aceita com folga
+            if err < tol or (err < np.sqrt(tol) * 1e-2 and mu < tol * 1e-2 * (1.0 + abs(pobj))):
+                status = 'optimal'
+                break
+            if not np.isfinite(mu) or max(np.abs(x).max(), np.abs(y).max(initial=0.0)) > 1e14:
+                status = 'diverged'  # inviável ou ilimitado: o simplex decide
+                break
+            d = x / z
+            try: L = self._factor(d)
+            except np.linalg.LinAlgError:
+                status = 'numerical'
+                break
+            # Preditor (afim)
+            dx, dy, dz = self._solve_normal(L, d, r_p, r_d, -x * z, x, z)
+            ap, ad = self._step(x, dx), self._step(z, dz)
+            mu_aff = ((x + ap * dx) @ (z + ad * dz)) / len(x)
+            sigma = (mu_aff / mu) ** 3 if mu > 0 else 0.0
+            # Corretor com centralização
+            dx, dy, dz = self._solve_normal(L, d, r_p, r_d, -x * z - dx * dz + sigma * mu, x, z)
+            ap, ad = 0.99 * self._step(x, dx), 0.99 * self._step(z, dz)
+            x += ap * dx; y += ad * dy; z += ad * dz
+        self.x, self.y, self.zs = x, y, z
+        self.status = status
+        return self._finish()
+
+    def _finish(self):
+        n, m = self.n, self.m
+        # Volta para o espaço (x, s) do RevisedSimplex
+        v = self.v0.copy()
+        np.add.at(v, self.orig, self.sign * self.x[:self.N])
+        self.v = v
+        self.duals = self.y[:m].copy() if len(self.y) else np.zeros(m)
+        self.z = float(self.c @ v[:n])
+        return self.status
+
+    @property
+    def primal(self):
+        return self.v[:self.n].copy()
+
+    # --- CROSSOVER: IDENTIFICA UMA BASE E LIMPA COM O SIMPLEX ---
+    def crossover_basis(self):
+        # Variáveis longe dos limites e com custo reduzido ~0 são candidatas a
+        # básicas; escolhe m colunas independentes de [A | I] por eliminação
+        # gaussiana e completa com lógicas das linhas que sobraram
+        e, n, m = self.engine, self.n, self.m
+        v, lb, ub = self.v, e.lb, e.ub
+        d = e.cost - np.concatenate([self.A.tdot(self.duals), self.duals])
+        with np.errstate(invalid='ignore'):
+            dist = np.minimum(v - lb, ub - v)
+            dist = np.where(np.isnan(dist), np.inf, np.maximum(dist, 0.0))
+            score = np.where(np.isinf(dist), 1.0, dist / (dist + np.abs(d) + 1e-300))
+        score[lb == ub] = -1.0
+        order = [k for k in np.argsort(-score, kind='stable') if score[k] > 0.5]
+        basis, free_rows = [], np.ones(m, dtype=bool)
+        if order:
+            full = np.hstack([self.A.todense(), np.eye(m)])
+            M = full[:, order].copy()
+            for col, k in enumerate(order):
+                if len(basis) == m: break
+                vcol = np.where(free_rows, M[:, col], 0.0)
+                r = int(np.argmax(np.abs(vcol)))
+                if abs(vcol[r]) <= 1e-9 * max(1.0, np.abs(M[:, col]).max()): continue
+                basis.append(int(k)); free_rows[r] = False
+                # Elimina a linha r das colunas seguintes
+                factor = M[:, col] / vcol[r]; factor[r] = 0.0
+                M[:, col + 1:] -= np.outer(factor, M[r, col + 1:])
+        basis += [n + i for i in np.where(free_rows)[0]]
+        return np.array(basis, dtype=np.int64), v.copy()
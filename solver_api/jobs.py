@@ -0,0 +1,133 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from .monitor import SolveMonitor, SolveInterrupted
+from .payload import build_solver, solve_options
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled', 'timeout')
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+# --- EXECUÇÃO NO PROCESSO DE TRABALHO ---
+# O progresso e os pedidos de cancelamento passam por dicionários de um
+# multiprocessing.Manager, compartilhados entre o servidor e os processos.
+def _run_job(job_id, data, time_limit, progress, cancelled):
+    progress[job_id] = {'started': True}
+    solver = build_solver(data)
+    solver.monitor = SolveMonitor(time_limit=time_limit,
+                                  is_cancelled=lambda: cancelled.get(job_id, False),
+                                  report=lambda p: progress.__setitem__(job_id, dict(p, started=True)))
+    try:
+        options = solve_options(data)
+        # O job já roda num processo do pool: o B&B fica serial, sem pool aninhado
+        # (que escaparia do cancelamento e do limite de tempo do job)
+        options['bnb_workers'] = 1
+        status_msg, solution = solver.solve(graph_format=data.get('graph_format', 'gif'), **options)
+    except SolveInterrupted as e:
+        return ('cancelled' if e.reason == 'cancelled' else 'timeout'), None
+    solver.monitor.flush()
+    return 'done', {'status': status_msg, 'solution': solution}
+
+
+class Job:
+    def __init__(self, job_id, future):
+        self.id = job_id
+        self.future = future
+        self.created = time.time()
+        self.finished = None
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+
+
+# --- GERENCIADOR DE JOBS ---
+class JobManager:
+    def __init__(self, workers=2, max_pending=32, max_jobs=256, time_limit=60):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.time_limit = time_limit
+        self._executor = None
+        self._manager = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _start(self):
+        # Processos só são criados quando o primeiro job chega
+        if self._executor is None:
+            self._manager = multiprocessing.Manager()
+            self.progress = self._manager.dict()
+            self.cancelled = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def _evict(self):
+        # Mantém no máximo max_jobs registros, descartando os finalizados mais antigos
+        done = [k for k, job in self._jobs.items() if job.finished is not None]
+        for k in done[:max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[k]
+            self.progress.pop(k, None); self.cancelled.pop(k, None)
+
+    def submit(self, data, time_limit=None):
+        time_limit = self.time_limit if time_limit is None else min(float(time_limit), self.time_limit or float('inf'))
+        with self._lock:
+            self._start()
+            pending = sum(1 for job in self._jobs.values() if job.finished is None)
+            if pending >= self.max_pending: raise JobQueueFull("Fila de jobs cheia, tente novamente mais tarde.")
+            job_id = uuid.uuid4().hex
+            future = self._executor.submit(_run_job, job_id, data, time_limit, self.progress, self.cancelled)
+            job = Job(job_id, future)
+            self._jobs[job_id] = job
+            self._evict()
+        future.add_done_callback(lambda f, job=job: self._finish(job, f))
+        return job
+
+    def _finish(self, job, future):
+        if future.cancelled():
+            job.status = 'cancelled'
+        elif future.exception() is not None:
+            job.status, job.error = 'failed', str(future.exception())
+        else:
+            job.status, job.result = future.result()
+        job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock: job = self._jobs.get(job_id)
+        if job is not None and job.finished is None:
+            job.status = 'running' if job_id in self.progress else 'queued'
+        return job
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.finished is not None: return job
+        # Na fila: sai sem rodar; em execução: o monitor interrompe no próximo tick
+        if not job.future.cancel(): self.cancelled[job_id] = True
+        return job
+
+    def describe(self, job):
+        out = {'job_id': job.id, 'status': job.status,
+               'progress': dict(self.progress.get(job.id, {})), 'created': job.created, 'finished': job.finished}
+        out['progress'].pop('started', None)
+        if job.result is not None: out['result'] = job.result
+        if job.error is not None: out['error'] = job.error
+        return out
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_job_manager():
+    # Configurado por settings.SOLVER_JOBS
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            conf = getattr(settings, 'SOLVER_JOBS', {})
+            _manager = JobManager(conf.get('WORKERS', 2), conf.get('MAX_PENDING', 32),
+                                  conf.get('MAX_JOBS', 256), conf.get('TIME_LIMIT', 60))
+        return _manager
@@ -1,19 +1,48 @@
+import logging
+import time
 import numpy as np
-from itertools import combinations
-import io
-import base64
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 from fractions import Fraction
-import copy
-import math
-from PIL import Image as PILImage
+from .revised_simplex import RevisedSimplex
+from .interior_point import InteriorPoint, prefers_interior_point
+from .sparse import SparseMatrix
+from .branch_and_bound import BranchAndBound
+from .trace import IterationTrace, TRACE_LEVELS
+from .pivoting import TableauPivoting, PRICING_RULES, simplex_tolerances
+from .exact import ExactSimplex, exact_str
+from .sensitivity import SensitivityAnalysis
+from .presolve import Presolve
+from .metrics import phase
+
+logger = logging.getLogger(__name__)
+
+# Formatos do gráfico 2D; o renderizador (matplotlib/PIL) só é importado no primeiro gráfico
+GRAPH_FORMATS = ('gif', 'png', 'svg', 'none')
+# Acima deste tamanho (restrições x variáveis) o modo 'auto' usa o simplex revisado
+REVISED_SIMPLEX_MIN_SIZE = 2000
+SOLVE_METHODS = ('auto', 'graphical', 'simplex', 'two_phase', 'big_m', 'revised_simplex', 'interior_point',
+                 'exact', 'exact_hybrid', 'dual', 'branch_and_bound')
+# Métodos que tratam limites de variáveis nativamente (sem linhas extras)
+BOUNDED_METHODS = ('auto', 'revised_simplex', 'interior_point', 'dual', 'branch_and_bound')
+
+
+def fraction_str(value):
+    try:
+        if abs(value) < 1e-9: return "0"
+        # Atalho para inteiros (a maioria das células do tableau)
+        if abs(value - round(value)) < 1e-9: return str(int(round(value)))
+        frac = Fraction(value).limit_denominator(10000)
+        if frac.denominator == 1: return str(frac.numerator)
+        return f"{frac.numerator}/{frac.denominator}"
+    except: return str(round(value, 4))
+
 
 class LPSolver:
-    def __init__(self, objective_function, constraints, objective='max'):
+    def __init__(self, objective_function, constraints, objective='max', bounds=None):
         self.objective_function = np.array(objective_function, dtype=float)
-        self.constraints = constraints
+        self._constraints = constraints
+        self._matrix = None
+        # bounds: lista de (inferior, superior) por variável; None = sem limite
+        self.bounds = bounds
         self.objective = objective
         self.num_vars = len(objective_function)
         
@@ -23,66 +52,133 @@ class LPSolver:
             
         # Controle global para poda
         self.global_best_z = -np.inf
-
-    def solve(self, method='auto', integer_mode=False):
+        # Formato do gráfico 2D: 'gif' (animado), 'png' (quadro final), 'svg' ou 'none'
+        self.graph_format = 'gif'
+        # Histórico de iterações: 'none', 'summary' ou 'full'
+        self.trace = 'none'
+        # Regra de entrada e tolerâncias do simplex em tableau
+        self.pricing = 'dantzig'
+        self.tolerances = None
+        # SolveMonitor opcional (progresso, cancelamento e limite de tempo)
+        self.monitor = None
+        # (base, x) de partida para o simplex revisado; após resolver, guarda a base ótima
+        self.warm_start = None
+        self.last_engine = None
+        # Contadores acumulados das resoluções (pivôs, nós do B&B, tempo de gráfico)
+        self.counters = {'pivots': 0, 'nodes': 0, 'render_seconds': 0.0}
+        # RequestMetrics opcional: tempo por fase (build, pivots, formatting, rendering...)
+        self.metrics = None
+        # Presolve do qual este é o modelo reduzido: as soluções voltam ao original ao formatar
+        self.postsolve = None
+        # (restrições, vértices, ótimo, ponto inteiro) do último gráfico 2D, para redesenhar sem resolver
+        self.graph_args = None
+
+    # --- ENTRADA ESPARSA (CSR) ---
+    @classmethod
+    def from_sparse(cls, objective_function, matrix, senses, rhs, objective='max', bounds=None):
+        solver = cls(objective_function, None, objective, bounds)
+        solver._matrix = (matrix, list(senses), np.asarray(rhs, dtype=float))
+        return solver
+
+    def _phase(self, name):
+        return phase(self.metrics, name)
+
+    @property
+    def is_sparse(self):
+        return self._constraints is None
+
+    @property
+    def constraints(self):
+        # Métodos de tableau precisam das linhas densas: só então são montadas
+        if self._constraints is None:
+            A, senses, rhs = self._matrix
+            dense = A.todense()
+            self._constraints = [(list(dense[i]), s, float(r)) for i, (s, r) in enumerate(zip(senses, rhs))]
+        return self._constraints
+
+    def _problem_arrays(self):
+        if self._matrix is None:
+            cons = self._constraints
+            rows = [np.nonzero(np.asarray(c, dtype=float))[0] for c, _, _ in cons]
+            A = SparseMatrix.from_rows([(idx, np.asarray(c, dtype=float)[idx]) for idx, (c, _, _) in zip(rows, cons)], self.num_vars)
+            self._matrix = (A, [c[1] for c in cons], np.array([c[2] for c in cons], dtype=float))
+        return self._matrix
+
+    def _bound_arrays(self):
+        if self.bounds is None: return np.zeros(self.num_vars), np.full(self.num_vars, np.inf)
+        lb = np.array([-np.inf if lo is None else lo for lo, _ in self.bounds], dtype=float)
+        ub = np.array([np.inf if hi is None else hi for _, hi in self.bounds], dtype=float)
+        return lb, ub
+
+    def _with_bound_rows(self):
+        # Métodos de tableau só conhecem x >= 0: limites finitos viram restrições
+        lb, ub = self._bound_arrays()
+        rows = []
+        for j in range(self.num_vars):
+            e = [0.0] * self.num_vars; e[j] = 1.0
+            if lb[j] > 0: rows.append((e, '>=', float(lb[j])))
+            if np.isfinite(ub[j]): rows.append((e, '<=', float(ub[j])))
+        c = self.objective_function * (-1 if self.is_minimization else 1)
+        return LPSolver(c, list(self.constraints) + rows, self.objective)
+
+    def solve(self, method='auto', integer_mode=False, bnb_strategy='best_bound', graph_format='gif', trace='none',
+              max_nodes=None, sensitivity=False, parametric_rhs=None, presolve=False, node_details=True,
+              cuts=False, max_depth=10, heuristics=True, time_limit=None, mip_gap=None, pricing='dantzig',
+              tolerances=None, crossover=True, bnb_workers=1):
         result = None
-        
+        if graph_format not in GRAPH_FORMATS:
+            return "Erro", {"error": f"Formato de gráfico '{graph_format}' desconhecido. Use: {', '.join(GRAPH_FORMATS)}."}
+        if trace not in TRACE_LEVELS:
+            return "Erro", {"error": f"Nível de trace '{trace}' desconhecido. Use: {', '.join(TRACE_LEVELS)}."}
+        if pricing not in PRICING_RULES:
+            return "Erro", {"error": f"Regra de pivoteamento '{pricing}' desconhecida. Use: {', '.join(PRICING_RULES)}."}
+        try: simplex_tolerances(tolerances)
+        except (TypeError, ValueError, AttributeError) as e: return "Erro", {"error": str(e)}
+        self.graph_format = graph_format
+        self.trace = trace
+        self.pricing = pricing
+        self.tolerances = tolerances
+
+        # Intervalos de sensibilidade e o gráfico 2D só fazem sentido no modelo original
+        graphical = self.num_vars == 2 and method in ('auto', 'graphical')
+        if presolve and not graphical and not sensitivity and parametric_rhs is None:
+            return self._solve_presolved(method=method, integer_mode=integer_mode, bnb_strategy=bnb_strategy,
+                                         graph_format=graph_format, trace=trace, max_nodes=max_nodes,
+                                         node_details=node_details, cuts=cuts, max_depth=max_depth,
+                                         heuristics=heuristics, time_limit=time_limit, mip_gap=mip_gap,
+                                         pricing=pricing, tolerances=tolerances, crossover=crossover,
+                                         bnb_workers=bnb_workers)
+
+        if self.bounds is not None and method not in BOUNDED_METHODS:
+            if (self._bound_arrays()[0] < 0).any():
+                return "Método inválido", {"error": "Limites inferiores negativos exigem o simplex revisado."}
+            bounded = self._with_bound_rows(); bounded.monitor = self.monitor; bounded.counters = self.counters; bounded.metrics = self.metrics
+            bounded.postsolve = self.postsolve
+            result = bounded.solve(method=method, integer_mode=integer_mode, bnb_strategy=bnb_strategy,
+                                   graph_format=graph_format, trace=trace, max_nodes=max_nodes,
+                                   sensitivity=sensitivity, parametric_rhs=parametric_rhs, node_details=node_details,
+                                   cuts=cuts, max_depth=max_depth, heuristics=heuristics, time_limit=time_limit,
+                                   mip_gap=mip_gap, pricing=pricing, tolerances=tolerances, crossover=crossover,
+                                   bnb_workers=bnb_workers)
+            self.graph_args = bounded.graph_args
+            return result
+
         # --- 1. MODO BRANCH AND BOUND (MÉTODO PRINCIPAL) ---
         if method == 'branch_and_bound':
-            self.global_best_z = -np.inf if self.objective == 'max' else np.inf
-            
-            # 1. Constrói a Árvore
-            tree_data, best_int_sol = self._build_bnb_tree(self.constraints, "P0", 1)
-            
-            status = "Árvore Gerada"
-            solution = {
-                'tree_data': tree_data,
-                'integer_solution': best_int_sol,
-                'Z': best_int_sol['Z'] if best_int_sol else "Não encontrado"
-            }
-            
-            # 2. Gera o Gráfico com o Ponto Inteiro (Se for 2D)
-            if self.num_vars == 2:
-                try:
-                    # Recalcula região viável do problema original (Raiz)
-                    eqs = []; inters = []
-                    for c, s, r in self.constraints: eqs.append(np.array(list(c)+[r], float))
-                    eqs+= [np.array([1,0,0], float), np.array([0,1,0], float)]
-                    for e1, e2 in combinations(eqs, 2):
-                        try: A=np.array([e1[:2],e2[:2]]); b=np.array([e1[2],e2[2]]); inters.append(np.linalg.solve(A,b))
-                        except: continue
-                    fps = [p for p in inters if all(np.dot(c,p)<=(r+1e-5) if s=='<=' else (np.dot(c,p)>=(r-1e-5) if s=='>=' else abs(np.dot(c,p)-r)<1e-5) for c,s,r in self.constraints) and all(p>=-1e-5)]
-                    
-                    # Filtra duplicatas
-                    unique_fps = []
-                    for p in fps:
-                        if not any(np.allclose(p, x, atol=1e-4) for x in unique_fps): unique_fps.append(p)
-                    
-                    # Encontra ótimo relaxado (Raiz)
-                    best_relaxed = None; best_val = -np.inf
-                    for p in unique_fps:
-                        v = np.dot(self.objective_function, p)
-                        if v > best_val: best_val = v; best_relaxed = p
-                    
-                    # Prepara o ponto inteiro para plotagem
-                    int_point = None
-                    if best_int_sol:
-                         int_point = [float(Fraction(best_int_sol.get(f'x{i+1}', '0'))) for i in range(self.num_vars)]
-
-                    # Gera o gráfico
-                    solution['graph_base64'] = self._generate_graph_image(unique_fps, best_relaxed, int_point)
-                except Exception as e: 
-                    print(f"Erro no gráfico B&B: {e}")
-            
-            return status, solution
-
-        # --- 2. MODO DUAL ---
-        if method == 'dual':
-            return self._solve_as_dual_problem()
-
-        # --- 3. MÉTODOS PADRÃO ---
+            # 1. Constrói a Árvore (fila de nós com filhos reotimizados pelo simplex dual)
+            try: bnb = BranchAndBound(self, strategy=bnb_strategy, max_depth=max_depth, max_nodes=max_nodes, cuts=cuts,
+                                      heuristics=heuristics, time_limit=time_limit, mip_gap=mip_gap, workers=bnb_workers)
+            except ValueError as e: return "Método inválido", {"error": str(e)}
+            with self._phase('bnb'): tree_data, _ = bnb.run(details=node_details)
+            status, solution = self._bnb_result(bnb)
+            return status, {'tree_data': tree_data, **solution}
+
+        # --- 2. MÉTODOS PADRÃO ---
         if method == 'auto':
-            if self.num_vars == 2: result = self._solve_graphical()
+            if self.is_sparse or self.bounds is not None: result = self._solve_revised_simplex()
+            elif self.num_vars == 2: result = self._solve_graphical()
+            elif prefers_interior_point(len(self.constraints), self.num_vars): result = self._solve_interior_point(crossover)
+            elif len(self.constraints) * self.num_vars >= REVISED_SIMPLEX_MIN_SIZE: result = self._solve_revised_simplex()
             elif any(c[1] in ['>=', '='] for c in self.constraints): result = self._solve_two_phase()
             else: result = self._solve_simplex_standard()
         elif method == 'graphical':
@@ -93,9 +189,17 @@ class LPSolver:
             result = self._solve_simplex_standard()
         elif method == 'two_phase': result = self._solve_two_phase()
         elif method == 'big_m': result = self._solve_big_m()
+        elif method == 'revised_simplex': result = self._solve_revised_simplex()
+        elif method == 'dual': result = self._solve_dual_simplex()
+        elif method == 'interior_point': result = self._solve_interior_point(crossover)
+        elif method == 'exact': result = self._solve_exact()
+        elif method == 'exact_hybrid': result = self._solve_exact(hybrid=True)
         else: return "Erro", {"error": f"Método '{method}' desconhecido."}
         
-        if isinstance(result, tuple) and "error" in result[1]: return result
+        if isinstance(result, tuple) and "error" in result[1]:
+            # Tableau e base são internos: não vão para a resposta (nem para o cache) de um erro
+            result[1].pop('tableau', None); result[1].pop('basis', None)
+            return result
         status, solution = result
         
         # Pós-processamento
@@ -106,213 +210,189 @@ class LPSolver:
                 if abs(z_row[i]) < 1e-5 and i not in solution['basis']: has_multiple = True; break
             if has_multiple: solution['status_complement'] = "Soluções Múltiplas Identificadas"
 
+        if sensitivity or parametric_rhs is not None:
+            self._attach_sensitivity(solution, sensitivity, parametric_rhs)
+
         # Limpeza
         if 'tableau' in solution: del solution['tableau']
         if 'basis' in solution: del solution['basis']
 
         return status, solution
 
-    # --- ÁRVORE B&B RECURSIVA (ESTRATÉGIA: MOST FRACTIONAL) ---
-    def _build_bnb_tree(self, constraints, node_id, depth):
-        # 1. Resolve o nó
-        solver = LPSolver(
-            self.objective_function if self.objective == 'max' else -self.objective_function,
-            constraints,
-            self.objective
-        )
-        status, solution = solver._solve_big_m()
-
-        node = {
-            'id': node_id,
-            'solution': solution,
-            'children': [],
-            'status': 'processing', 
-            'branch_info': ''
+    # --- RESULTADO DO BRANCH AND BOUND (ÁRVORE COMPLETA OU STREAMING) ---
+    def _bnb_result(self, bnb):
+        best_int_sol = bnb.incumbent
+        self.global_best_z = bnb.incumbent_z
+        self.counters['nodes'] += bnb.nodes_solved
+        self.counters['pivots'] += bnb.lp_iterations
+
+        status = "Árvore Gerada" if bnb.stopped is None else f"Árvore Parcial ({bnb.stopped})"
+        solution = {
+            'integer_solution': best_int_sol,
+            'Z': best_int_sol['Z'] if best_int_sol else "Não encontrado"
         }
+        sign = bnb._sign()
+        solution['gap'] = self._gap_report(self._shift_z(sign * bnb.best_bound()),
+                                           None if best_int_sol is None else self._shift_z(sign * bnb.incumbent_z))
+        if bnb.heuristics is not None:
+            solution['heuristics'] = {**bnb.heuristics.stats, 'incumbent_source': bnb.incumbent_source}
+        if bnb.cut_stats is not None: solution['cuts'] = bnb.cut_stats
+
+        # 2. Gera o Gráfico com o Ponto Inteiro (Se for 2D)
+        if self.num_vars == 2:
+            try:
+                # Recalcula região viável do problema original (Raiz)
+                with self._phase('vertices'): vertices = self._feasible_vertices()
+                unique_fps = list(vertices)
+
+                # Encontra ótimo relaxado (Raiz)
+                best_relaxed = vertices[np.argmax(vertices @ self.objective_function)] if len(vertices) else None
+
+                # Prepara o ponto inteiro para plotagem
+                int_point = None if bnb.incumbent_x is None else [float(v) for v in bnb.incumbent_x]
+
+                # Gera o gráfico
+                solution['graph_base64'] = self._generate_graph_image(unique_fps, best_relaxed, int_point)
+                if solution['graph_base64']: solution['graph_format'] = self.graph_format
+            except Exception:
+                logger.exception("Erro no gráfico B&B")
+        return status, solution
 
-        # 2. Inviável?
-        if not solution or 'error' in solution or 'Z' not in solution:
-            node['status'] = 'infeasible'
-            return node, None
+    def _gap_report(self, bound, incumbent):
+        # Limite provado, incumbente e gap relativo (no sentido original do objetivo)
+        fmt = lambda v: None if v is None or not np.isfinite(v) else self._to_fraction_str(v)
+        gap = None
+        if incumbent is not None and np.isfinite(bound):
+            diff = abs(bound - incumbent)
+            gap = 0.0 if diff <= 1e-9 else round(diff / max(abs(incumbent), 1e-10), 6)
+        return {'best_bound': fmt(bound), 'incumbent': fmt(incumbent), 'relative_gap': gap}
+
+    def stream_branch_and_bound(self, bnb_strategy='best_bound', max_nodes=None, node_details=True, graph_format='none',
+                                cuts=False, max_depth=10, heuristics=True, time_limit=None, mip_gap=None, bnb_workers=1):
+        # Nós como registros planos, um por vez, e o resultado final por último.
+        # A estratégia é validada aqui; a árvore só anda quando o gerador é consumido
+        if graph_format not in GRAPH_FORMATS: raise ValueError(f"Formato de gráfico '{graph_format}' desconhecido.")
+        self.graph_format = graph_format
+        bnb = BranchAndBound(self, strategy=bnb_strategy, max_depth=max_depth, max_nodes=max_nodes, cuts=cuts,
+                             heuristics=heuristics, time_limit=time_limit, mip_gap=mip_gap, workers=bnb_workers)
+
+        def records():
+            for rec in bnb.iter_nodes(node_details): yield {'type': 'node', **rec}
+            status, solution = self._bnb_result(bnb)
+            yield {'type': 'result', 'status': status, 'solution': solution}
+        return records()
+
+    # --- PRESOLVE: RESOLVE O MODELO REDUZIDO E VOLTA PARA AS VARIÁVEIS ORIGINAIS ---
+    def _solve_presolved(self, **options):
+        pre = Presolve(self, integer=options['method'] == 'branch_and_bound')
+        with self._phase('presolve'): reduced = pre.run()
+        if pre.status == 'infeasible': return "Problema Inviável", {"error": "Inviável (detectado no pré-processamento)"}
+        if pre.status == 'unbounded': return "Ilimitada", {"error": "Ilimitada (detectado no pré-processamento)"}
+        exact = options['method'] in ('exact', 'exact_hybrid')
+        if reduced is None:
+            # Todas as variáveis foram fixadas pelo presolve
+            x, y, z = pre.postsolve_values([], [], exact)
+            solution = self._format_solution(x, z, y, exact)
+            solution['presolve'] = pre.summary()
+            return "Ótimo encontrado.", solution
+        # O modelo reduzido formata já nas variáveis originais, a partir dos valores brutos
+        reduced.monitor = self.monitor; reduced.counters = self.counters; reduced.metrics = self.metrics
+        reduced.postsolve = pre
+        status, solution = reduced.solve(**options)
+        self.graph_args = reduced.graph_args
+        if 'error' in solution: return status, solution
+        solution['presolve'] = pre.summary()
+        return status, solution
 
-        # Pega Z
-        try:
-            zs = solution['Z']
-            current_z = float(Fraction(zs)) if '/' in zs else float(zs)
-        except: current_z = -np.inf if self.objective == 'max' else np.inf
-
-        # 3. Poda por Limite (Bound)
-        prune = False
-        if self.objective == 'max':
-            if current_z <= self.global_best_z + 1e-6: prune = True
-        else:
-            if current_z >= self.global_best_z - 1e-6: prune = True
-            
-        if prune:
-            node['status'] = 'pruned'
-            return node, None
-
-        # 4. Escolhe Variável de Ramificação (Mais Fracionada)
-        all_integer = True
-        branch_idx = -1
-        branch_val = 0
-        max_fraction = -1 # Distância máxima para o inteiro mais próximo (perto de 0.5)
-        
-        for i in range(self.num_vars):
-            val_str = solution.get(f'x{i+1}', '0')
-            val = float(Fraction(val_str)) if '/' in val_str else float(val_str)
-            
-            dist = abs(val - round(val))
-            if dist > 1e-4:
-                all_integer = False
-                # Estratégia Otimizada: Escolhe a mais fracionada
-                if dist > max_fraction:
-                    max_fraction = dist
-                    branch_idx = i
-                    branch_val = val
-        
-        best_local_sol = None
+    def _format_solution(self, x, z, y=None, exact=False):
+        # x, Z e duais brutos viram strings; no modelo reduzido, passam antes pelo postsolve
+        fmt = exact_str if exact else self._to_fraction_str
+        if self.postsolve is not None: x, y, z = self.postsolve.postsolve_values(x, y, exact)
+        sol = {f'x{i+1}': fmt(v) for i, v in enumerate(x)}
+        sol['Z'] = fmt(z)
+        if y is not None: sol['dual_solution'] = {f'y{i+1}': fmt(v) for i, v in enumerate(y)}
+        return sol
 
-        if all_integer:
-            node['status'] = 'integer'
-            is_better = False
-            if self.objective == 'max':
-                if current_z > self.global_best_z: is_better = True
-            else:
-                if current_z < self.global_best_z: is_better = True
-
-            if is_better:
-                self.global_best_z = current_z
-                best_local_sol = solution
-        else:
-            node['status'] = 'branched'
-            fl = math.floor(branch_val)
-            cl = math.ceil(branch_val)
-            nc = [0.0] * self.num_vars
-            nc[branch_idx] = 1.0
-
-            if depth < 10: # Limite de profundidade
-                # Filho 1 (<=)
-                c1 = copy.deepcopy(constraints)
-                c1.append((nc, '<=', float(fl)))
-                child1, sol1 = self._build_bnb_tree(c1, f"{node_id}.1", depth+1)
-                child1['branch_info'] = f"x{branch_idx+1} <= {fl}"
-                node['children'].append(child1)
-
-                # Filho 2 (>=)
-                c2 = copy.deepcopy(constraints)
-                c2.append((nc, '>=', float(cl)))
-                child2, sol2 = self._build_bnb_tree(c2, f"{node_id}.2", depth+1)
-                child2['branch_info'] = f"x{branch_idx+1} >= {cl}"
-                node['children'].append(child2)
-
-                # Propaga melhor solução encontrada nos filhos
-                def get_z(s):
-                    if not s: return -np.inf if self.objective == 'max' else np.inf
-                    z = s['Z']
-                    return float(Fraction(z)) if '/' in z else float(z)
-                
-                z1 = get_z(sol1)
-                z2 = get_z(sol2)
-                
-                if self.objective == 'max':
-                    best_local_sol = sol1 if z1 > z2 else sol2
-                else:
-                    best_local_sol = sol1 if z1 < z2 else sol2
-
-        return node, best_local_sol
-
-    # --- OUTROS MÉTODOS (DUAL, GRAFICO, ETC) ---
-    def _solve_as_dual_problem(self):
-        try:
-            A = np.array([c[0] for c in self.constraints]); A_T = A.T.tolist()
-            c_p = self.objective_function if not self.is_minimization else -self.objective_function; new_rhs = c_p.tolist()
-            b_p = [c[2] for c in self.constraints]; new_obj = b_p; new_cons = []
-            for i, rc in enumerate(A_T): new_cons.append((rc, '>=', new_rhs[i]))
-            ds = LPSolver(new_obj, new_cons, objective='min')
-            st, sol = ds.solve(method='big_m')
-            if 'iterations' in sol: 
-                for s in sol['iterations']: s['phase'] = f"Dual (Big M) - {s['phase']}"
-            return f"Solução do Dual ({st})", sol
-        except Exception as e: return "Erro", {"error": str(e)}
+    def _shift_z(self, z):
+        # Z do modelo reduzido + constante das variáveis fixadas pelo presolve
+        return z if self.postsolve is None else z + self.postsolve.offset
 
+    # --- OUTROS MÉTODOS (GRAFICO, ETC) ---
     def _to_fraction_str(self, value):
+        return fraction_str(value)
+
+    def _generate_graph_image(self, feasible_points, best_point, int_point=None, constraints=None):
+        constraints = self.constraints if constraints is None else constraints
+        # Só números do Python (sem numpy), com o tipo original: os rótulos da
+        # legenda mostram os coeficientes como vieram. O cache guarda isso para redesenhar
+        plain = lambda v: v.item() if isinstance(v, np.generic) else v
+        self.graph_args = ([([plain(v) for v in a], s, plain(r)) for a, s, r in constraints],
+                           [[float(v) for v in p] for p in feasible_points],
+                           None if best_point is None else [float(v) for v in best_point], int_point)
+        # Sem gráfico pedido, o matplotlib nem é importado
+        if self.graph_format == 'none': return None
+        start = time.perf_counter()
         try:
-            if abs(value) < 1e-9: return "0"
-            frac = Fraction(value).limit_denominator(10000)
-            if frac.denominator == 1: return str(frac.numerator)
-            return f"{frac.numerator}/{frac.denominator}"
-        except: return str(round(value, 4))
-
-    def _generate_graph_image(self, feasible_points, best_point, int_point=None):
-        all_points = feasible_points + ([tuple(best_point)] if best_point is not None else [])
-        if not all_points: return None
-        max_x = max(p[0] for p in all_points) * 1.2 if all_points else 10
-        max_y = max(p[1] for p in all_points) * 1.2 if all_points else 10
-        limit = max(max_x, max_y, 10)
-        x_vals = np.linspace(0, limit, 200) 
-        c1_obj, c2_obj = self.objective_function
-        z_opt = np.dot(self.objective_function, best_point) if best_point is not None else 0
-        frames = []; num_frames = 12 
-        try:
-            plt.close('all')
-            for i in range(num_frames + 5): 
-                fig, ax = plt.subplots(figsize=(5, 5))
-                ax.set_xlim(-0.5, limit); ax.set_ylim(-0.5, limit); ax.set_xlabel("x1"); ax.set_ylabel("x2")
-                for coeffs, sign, rhs in self.constraints:
-                    c1, c2 = coeffs
-                    if c2 != 0:
-                        y_vals = (rhs - c1 * x_vals) / c2
-                        y_vals = np.clip(y_vals, -limit, limit*2)
-                        ax.plot(x_vals, y_vals, label=f'{c1}x1 + {c2}x2 {sign} {rhs}')
-                    elif c1 != 0: ax.axvline(x=rhs/c1, color='orange', linestyle='--')
-
-                if len(feasible_points) >= 3:
-                    pts = np.array(feasible_points); cent = pts.mean(axis=0)
-                    feasible_points.sort(key=lambda p: np.arctan2(p[1] - cent[1], p[0] - cent[0]))
-                    ax.add_patch(plt.Polygon(feasible_points, color='skyblue', alpha=0.4))
-
-                if len(feasible_points) > 0: 
-                    fp = np.array(feasible_points); ax.plot(fp[:, 0], fp[:, 1], 'ro', markersize=5)
-                if best_point is not None: ax.plot(best_point[0], best_point[1], 'go', markersize=8, zorder=5, label='Ótimo')
-                if int_point is not None: ax.plot(int_point[0], int_point[1], 'o', color='darkorange', markersize=8, zorder=6, label='Inteiro')
-
-                ax.grid(True, linestyle='--', alpha=0.5)
-                ax.legend(loc='best', fontsize='x-small', framealpha=0.6)
-
-                progress = min(i / num_frames, 1.0); z_curr = z_opt * progress
-                if c2_obj != 0:
-                    y_obj = (z_curr - c1_obj * x_vals) / c2_obj; y_obj = np.clip(y_obj, -limit, limit*2)
-                    ax.plot(x_vals, y_obj, 'k--', linewidth=1.5, label='Z')
-                elif c1_obj != 0: ax.axvline(x=z_curr/c1_obj, color='k', linestyle='--', linewidth=1.5)
-
-                buf = io.BytesIO(); plt.savefig(buf, format='png', bbox_inches='tight', dpi=80)
-                buf.seek(0); frames.append(PILImage.open(buf)); plt.close(fig)
-
-            buf_gif = io.BytesIO()
-            frames[0].save(buf_gif, format='GIF', save_all=True, append_images=frames[1:], duration=100)
-            buf_gif.seek(0); return base64.b64encode(buf_gif.read()).decode('utf-8')
-        except: return None
+            with self._phase('rendering'):
+                from .graph_renderer import GraphRenderer
+                renderer = GraphRenderer(self.objective_function, constraints, feasible_points, best_point, int_point)
+                return renderer.render(self.graph_format)
+        except Exception:
+            # Sem gráfico a resposta segue válida; a falha fica no log
+            logger.exception("Erro ao gerar o gráfico (%s)", self.graph_format)
+            return None
+        finally: self.counters['render_seconds'] += time.perf_counter() - start
+
+    def render_graph(self, graph_args, graph_format):
+        # Redesenha o gráfico de uma resolução anterior (graph_args) sem resolver de novo
+        self.graph_format = graph_format
+        constraints, feasible_points, best_point, int_point = graph_args
+        return self._generate_graph_image(feasible_points, best_point, int_point, constraints)
+
+    # --- VÉRTICES DA REGIÃO VIÁVEL (2D, VETORIZADO) ---
+    def _feasible_vertices(self, tol=1e-5, chunk=4096):
+        cons = self.constraints
+        A = np.array([c[0] for c in cons], dtype=float).reshape(-1, 2)
+        r = np.array([c[2] for c in cons], dtype=float)
+        senses = np.array([c[1] for c in cons])
+        le, ge, eq = senses == '<=', senses == '>=', senses == '='
+        # Retas das restrições + eixos x1 = 0 e x2 = 0
+        L = np.vstack([A, np.eye(2)]); R = np.concatenate([r, [0.0, 0.0]])
+
+        # Interseção de todos os pares pela regra de Cramer 2x2
+        i, j = np.triu_indices(len(L), k=1)
+        det = L[i, 0] * L[j, 1] - L[i, 1] * L[j, 0]
+        ok = np.abs(det) > 1e-12
+        i, j, det = i[ok], j[ok], det[ok]
+        P = np.column_stack([(R[i] * L[j, 1] - L[i, 1] * R[j]) / det,
+                             (L[i, 0] * R[j] - R[i] * L[j, 0]) / det])
+
+        # Viabilidade por blocos (um produto matricial por bloco)
+        keep = np.zeros(len(P), dtype=bool)
+        for s in range(0, len(P), chunk):
+            Q = P[s:s+chunk]; lhs = Q @ A.T
+            keep[s:s+chunk] = ((Q >= -tol).all(axis=1)
+                               & (lhs[:, le] <= r[le] + tol).all(axis=1)
+                               & (lhs[:, ge] >= r[ge] - tol).all(axis=1)
+                               & (np.abs(lhs[:, eq] - r[eq]) < tol).all(axis=1))
+        P = P[keep]
+
+        # Remove duplicatas arredondando para a grade de 1e-4
+        _, first = np.unique(np.round(P / 1e-4).astype(np.int64), axis=0, return_index=True)
+        return P[np.sort(first)]
 
     def _solve_graphical(self):
-        eqs=[]; 
-        for c,_,r in self.constraints: eqs.append(np.array(list(c)+[r], float))
-        eqs+=[np.array([1,0,0],float), np.array([0,1,0],float)]
-        inters=[]
-        for e1,e2 in combinations(eqs,2):
-            try: A=np.array([e1[:2],e2[:2]]); b=np.array([e1[2],e2[2]]); inters.append(np.linalg.solve(A,b))
-            except: continue
-        fps=[p for p in inters if all(p>=-1e-5) and all(np.dot(c,p)<=(r+1e-5) if s=='<=' else (np.dot(c,p)>=(r-1e-5) if s=='>=' else abs(np.dot(c,p)-r)<1e-5) for c,s,r in self.constraints)]
-        fps=[p for i,p in enumerate(fps) if not any(np.allclose(p,x,atol=1e-4) for x in fps[:i])]
-        if not fps: return "Inviável", {"error": "Região vazia"}
-        br=None; bv=-np.inf
-        for p in fps:
-            v=np.dot(self.objective_function,p); 
-            if v>bv: bv=v; br=p
+        with self._phase('vertices'): vertices = self._feasible_vertices()
+        if not len(vertices): return "Inviável", {"error": "Região vazia"}
+        values = vertices @ self.objective_function
+        br = vertices[np.argmax(values)]; bv = values.max()
+        fps = list(vertices)
         if self.objective=='min': bv*=-1
-        sol={f'x{i+1}':self._to_fraction_str(v) for i,v in enumerate(br)}; sol['Z']=self._to_fraction_str(bv)
-        try: sol['graph_base64']=self._generate_graph_image(fps,br)
-        except: pass
+        sol=self._format_solution(br, bv)
+        try:
+            sol['graph_base64']=self._generate_graph_image(fps,br)
+            if sol['graph_base64']: sol['graph_format']=self.graph_format
+        except Exception: logger.exception("Erro no gráfico")
         return "Ótimo", sol
 
     def _format_tableau_step(self, t, b, i, p):
@@ -320,18 +400,44 @@ class LPSolver:
         for j in range(len(t)): r.append({'label':"Z" if j==0 else f"Base {b[j-1]+1}", 'values':[self._to_fraction_str(v) for v in t[j]]})
         return {'iteration':i, 'phase':p, 'headers':h, 'rows':r, 'pivot_info':None}
     def _solve_simplex_standard(self):
-        t,b=self._build_tableau(); s,ft,fb,h=self._simplex_iteration(t,b,"Simplex"); sol=self._get_solution_from_tableau(ft,fb); sol['iterations']=h; 
+        t,b=self._build_tableau(); s,ft,fb,h=self._simplex_iteration(t,b,"Simplex"); sol=h.attach(self._get_solution_from_tableau(ft,fb))
         if s!="Ótimo encontrado.": sol['error']=s
         return s, sol
     def _solve_two_phase(self):
-        t,b=self._build_tableau(); s,t,b,h=self._simplex_iteration(t,b,"Simplex"); sol=self._get_solution_from_tableau(t,b); sol['iterations']=h; return s, sol
+        t,b=self._build_tableau()
+        ns=sum(1 for c in self.constraints if c[1]=='<='); nsur=sum(1 for c in self.constraints if c[1]=='>=')
+        ast=self.num_vars+ns+nsur; art=np.zeros(t.shape[1]-1, dtype=bool); art[ast:]=True
+        obj=t[0].copy()
+        # --- FASE 1: max -Σ artificiais ---
+        t[0]=0.0; t[0,:-1][art]=1.0
+        for i,v in enumerate(b):
+            if art[v]: t[0]-=t[i+1]
+        s1,t,b,h1=self._simplex_iteration(t,b,"Fase 1")
+        if s1=="Ciclo": sol=h1.attach({'error':"Limite de iterações atingido"}); return s1, sol
+        if t[0,-1] < -1e-7*max(1.0, np.abs(t[1:,-1]).max()): return "Problema Inviável", {"error": "Inviável (Fase 1 com artificiais positivas)"}
+        # Artificiais que ficaram na base em zero saem por um pivô em qualquer coluna não artificial
+        for i,v in enumerate(b):
+            if not art[v]: continue
+            cols=np.where(~art & (np.abs(t[i+1,:-1])>1e-9))[0]
+            if len(cols)==0: continue  # linha redundante: a artificial fica em zero
+            pc=cols[np.argmax(np.abs(t[i+1,cols]))]; pr=i+1
+            t[pr,:]/=t[pr,pc]
+            col=t[:,pc].copy(); col[pr]=0.0; t-=np.outer(col, t[pr,:]); b[i]=pc; self.counters['pivots']+=1
+        # --- FASE 2: objetivo original, artificiais fora da entrada ---
+        t[0]=obj
+        for i,v in enumerate(b): t[0]-=t[0,v]*t[i+1]
+        s,t,b,h2=self._simplex_iteration(t,b,"Fase 2",allowed=~art)
+        sol=self._get_solution_from_tableau(t,b)
+        if self.trace!='none': sol['iterations']=h1.steps()+h2.steps()
+        if s!="Ótimo encontrado.": sol['error']=s
+        return s, sol
     
     def _solve_big_m(self, m_value=1e6):
-        tableau, basis = self._build_tableau(bm=True, m=m_value)
-        status, final_tableau, final_basis, history = self._simplex_iteration(tableau, basis, "Big M")
+        # M entra como uma linha à parte (M -> infinito): m_value só aparece no trace
+        tableau, basis, *mrow = self._build_tableau(bm=True)
+        status, final_tableau, final_basis, history = self._simplex_iteration(tableau, basis, "Big M", mrow=mrow[0] if mrow else None, m_value=m_value)
 
-        solution = self._get_solution_from_tableau(final_tableau, final_basis)
-        solution['iterations'] = history
+        solution = history.attach(self._get_solution_from_tableau(final_tableau, final_basis))
 
         # --- VERIFICAÇÃO RIGOROSA DE INVIABILIDADE ---
         num_slack = sum(1 for c in self.constraints if c[1] == '<=')
@@ -355,22 +461,169 @@ class LPSolver:
         return status, solution
 
 
-    def _simplex_iteration(self, t, b, p):
-        h=[]; c=0; h.append(self._format_tableau_step(t,b,c,p))
-        while np.any(t[0,:-1]<-1e-9):
-            pc=np.argmin(t[0,:-1]); rs=[]
-            for i in range(1,len(t)): 
-                if t[i,pc]>1e-9: rs.append((i, t[i,-1]/t[i,pc]))
-            if not rs: return "Ilimitada",t,b,h
-            pr=min(rs, key=lambda x:x[1])[0]
-            h[-1]['pivot_info']={'row':pr,'col':pc}
+    # --- SIMPLEX REVISADO (BASE FATORADA EM LU, SEM TABLEAU DENSO) ---
+    def _solve_revised_simplex(self):
+        with self._phase('build'):
+            A, senses, b = self._problem_arrays()
+            lb, ub = self._bound_arrays()
+            engine = RevisedSimplex(A, b, -self.objective_function, senses, lb, ub, trace=self.trace != 'none', monitor=self.monitor)
+        with self._phase('pivots'):
+            engine.solve(*self.warm_start) if self.warm_start is not None else engine.solve()
+        with self._phase('formatting'): return self._engine_result(engine, "Simplex Revisado")
+
+    def _engine_result(self, engine, label):
+        status = engine.status
+        self.counters['pivots'] += engine.iterations
+        if status == 'optimal': self.warm_start = (engine.basis.copy(), engine.x.copy())
+        self.last_engine = engine
+        if status == 'infeasible': return "Problema Inviável", {"error": "Inviável"}
+        if status == 'unbounded': return "Ilimitada", {"error": "Ilimitada"}
+        if status == 'iteration_limit': return "Ciclo", {"error": "Limite de iterações atingido"}
+
+        # O motor minimiza -c; converte Z e os duais para o sentido original
+        sign = -1 if self.objective == 'min' else 1
+        sol = self._format_solution(engine.primal, -sign * engine.z, -sign * engine.y)
+        # Sem tableau no simplex revisado: o histórico registra só os pivôs
+        if engine.history is not None:
+            sol['iterations'] = [{'iteration': i, 'phase': f"{label} - {ph}", 'pivot_info': {'row': r + 1, 'col': int(q)} if r >= 0 else None}
+                                 for i, ph, q, r in engine.history]
+        return "Ótimo encontrado.", sol
+
+    # --- SIMPLEX DUAL (NO PRÓPRIO PRIMAL, SEM TRANSPOR O MODELO) ---
+    def _solve_dual_simplex(self):
+        with self._phase('build'):
+            A, senses, b = self._problem_arrays()
+            lb, ub = self._bound_arrays()
+            engine = RevisedSimplex(A, b, -self.objective_function, senses, lb, ub, trace=self.trace != 'none', monitor=self.monitor)
+        with self._phase('pivots'): engine.solve_dual()
+        with self._phase('formatting'): status, sol = self._engine_result(engine, "Simplex Dual")
+        if 'error' not in sol:
+            sol['dual_simplex'] = {'dual_pivots': engine.dual_iterations, 'primal_pivots': engine.iterations - engine.dual_iterations,
+                                   'artificial_bounds': engine.artificial_bounds}
+        return status, sol
+
+    # --- PONTOS INTERIORES (COM CROSSOVER OPCIONAL PARA UMA BASE) ---
+    def _solve_interior_point(self, crossover=True):
+        with self._phase('build'):
+            A, senses, b = self._problem_arrays()
+            lb, ub = self._bound_arrays()
+            ipm = InteriorPoint(A, b, -self.objective_function, senses, lb, ub, monitor=self.monitor)
+        with self._phase('pivots'): ipm_status = ipm.solve()
+        info = {'iterations': ipm.iterations, 'converged': ipm_status == 'optimal', 'crossover': crossover}
+        if ipm_status == 'optimal' and not crossover:
+            sign = -1 if self.objective == 'min' else 1
+            with self._phase('formatting'):
+                sol = self._format_solution(ipm.primal, -sign * ipm.z, -sign * ipm.duals)
+            sol['interior_point'] = info
+            return "Ótimo encontrado.", sol
+        # Crossover: o simplex revisado parte da base identificada. Sem
+        # convergência (inviável/ilimitado), o simplex a frio dá o status
+        with self._phase('build'):
+            engine = RevisedSimplex(A, b, -self.objective_function, senses, lb, ub, trace=self.trace != 'none', monitor=self.monitor)
+        with self._phase('pivots'):
+            if ipm_status == 'optimal': engine.solve(*ipm.crossover_basis())
+            else: engine.solve()
+        with self._phase('formatting'):
+            status, sol = self._engine_result(engine, "Crossover" if ipm_status == 'optimal' else "Simplex Revisado")
+        if 'error' not in sol:
+            info['crossover_pivots'] = engine.iterations
+            sol['interior_point'] = info
+        return status, sol
+
+    # --- SENSIBILIDADE (A PARTIR DA BASE ÓTIMA, SEM NOVAS RESOLUÇÕES) ---
+    def _engine_basis_from_tableau(self, b):
+        # Colunas do tableau: estruturais | folgas ('<=') | excessos ('>=') | artificiais ('>=', '=');
+        # no motor revisado cada linha tem uma única variável lógica
+        senses = [c[1] for c in self.constraints]
+        logical = [i for i, s in enumerate(senses) if s == '<='] + [i for i, s in enumerate(senses) if s == '>='] + \
+                  [i for i, s in enumerate(senses) if s in ('>=', '=')]
+        cols = [j if j < self.num_vars else self.num_vars + logical[j - self.num_vars] for j in b]
+        return cols if len(set(cols)) == len(cols) else None
+
+    def _basis_engine(self, tableau_basis=None):
+        if self.last_engine is not None and self.last_engine.status == 'optimal': return self.last_engine
+        A, senses, b = self._problem_arrays()
+        lb, ub = self._bound_arrays()
+        engine = RevisedSimplex(A, b, -self.objective_function, senses, lb, ub, monitor=self.monitor)
+        basis = self._engine_basis_from_tableau(tableau_basis) if tableau_basis is not None else None
+        return engine if engine.solve(basis=basis) == 'optimal' else None
+
+    def _attach_sensitivity(self, solution, sensitivity, parametric_rhs):
+        engine = self._basis_engine(solution.get('basis'))
+        if engine is None:
+            solution['sensitivity'] = {'error': "Base ótima indisponível"}
+            return
+        analysis = SensitivityAnalysis(engine, self.objective, self._to_fraction_str)
+        if sensitivity: solution['sensitivity'] = analysis.report()
+        # A varredura pivota o motor: fica por último
+        if parametric_rhs is not None:
+            solution['parametric_rhs'] = analysis.parametric_rhs(parametric_rhs['direction'], parametric_rhs.get('theta_max', 1))
+
+    # --- MODO EXATO (RACIONAIS, SEM limit_denominator) ---
+    def _solve_exact(self, hybrid=False):
+        with self._phase('build'): engine = ExactSimplex(self.constraints, self.objective_function, monitor=self.monitor)
+        certificate = {'exact': True, 'mode': 'hybrid' if hybrid else 'exact'}
+        status = None
+        if hybrid:
+            # Resolve em ponto flutuante e só verifica/repara a base final em aritmética exata
+            A, senses, b = self._problem_arrays()
+            float_engine = RevisedSimplex(A, b, -self.objective_function, senses, monitor=self.monitor)
+            with self._phase('pivots'):
+                if float_engine.solve() == 'optimal':
+                    status = engine.solve_from_basis(engine.float_basis_columns(float_engine.basis, self.num_vars))
+            if status is None:
+                engine = ExactSimplex(self.constraints, self.objective_function, monitor=self.monitor)
+                certificate['float_basis_optimal'] = False
+            else:
+                certificate['float_basis_optimal'] = status == 'optimal' and engine.repair_pivots == 0
+                certificate['repair_pivots'] = engine.repair_pivots
+        if status is None:
+            with self._phase('pivots'): status = engine.solve()
+
+        if status == 'infeasible': return "Problema Inviável", {"error": "Inviável"}
+        if status == 'unbounded': return "Ilimitada", {"error": "Ilimitada"}
+        if status == 'iteration_limit': return "Ciclo", {"error": "Limite de iterações atingido"}
+
+        sign = -1 if self.objective == 'min' else 1
+        with self._phase('formatting'):
+            sol = self._format_solution(engine.primal, sign * engine.objective_value, [sign * v for v in engine.duals], exact=True)
+        certificate['pivots'] = engine.iterations
+        self.counters['pivots'] += engine.iterations
+        sol['certificate'] = certificate
+        return "Ótimo encontrado.", sol
+
+    def _simplex_iteration(self, t, b, p, allowed=None, mrow=None, m_value=1e6):
+        with self._phase('pivots'): return self._pivot_loop(t, b, p, allowed, mrow, m_value)
+    def _pivot_loop(self, t, b, p, allowed, mrow, m_value):
+        # mrow: parte em M da linha 0 (Big M lexicográfico, sem M numérico no tableau)
+        piv=TableauPivoting(self.pricing, self.tolerances); tol=piv.tol['optimality']
+        shown=lambda: t if mrow is None else np.vstack([t[0]+m_value*mrow, t[1:]])
+        h=IterationTrace(self, self.trace, p); c=0; max_iter=max(1000, 50*sum(t.shape))
+        if h.level!='none': h.record(shown(),b,c)
+        while True:
+            d=t[0,:-1]
+            if mrow is not None:
+                # Primeiro zera a parte em M; só depois olha a parte constante
+                d=np.where(mrow[:-1]<-tol, mrow[:-1], 0.0) if (mrow[:-1]<-tol).any() else np.where(np.abs(mrow[:-1])<=tol, d, 0.0)
+            pc=piv.entering(t, d, allowed)
+            if pc is None: break
+            if self.monitor is not None: self.monitor.tick(iteration=c)
+            pr=piv.leaving(t, b, pc)
+            if pr is None: return "Ilimitada",t,b,h
+            h.pivot(c,pr,pc); piv.update(t,b,pr,pc)
             t[pr,:]/=t[pr,pc]
-            for i in range(len(t)): 
-                if i!=pr: t[i,:]-=t[i,pc]*t[pr,:]
-            b[pr-1]=pc; c+=1; h.append(self._format_tableau_step(t,b,c,p))
-            if c>100: return "Ciclo",t,b,h
+            col=t[:,pc].copy(); col[pr]=0.0
+            t-=np.outer(col, t[pr,:])
+            if mrow is not None: mrow-=mrow[pc]*t[pr,:]
+            # Harris pode deixar RHS levemente negativo: volta para zero
+            rhs=t[1:,-1]; rhs[(rhs<0)&(rhs>-piv.tol['feasibility'])]=0.0
+            b[pr-1]=pc; c+=1; self.counters['pivots']+=1
+            if h.level!='none': h.record(shown(),b,c)
+            if c>=max_iter: return "Ciclo",t,b,h
         return "Ótimo encontrado.",t,b,h
-    def _build_tableau(self, bm=False, m=1e6):
+    def _build_tableau(self, bm=False):
+        with self._phase('build'): return self._assemble_tableau(bm)
+    def _assemble_tableau(self, bm):
         ns=sum(1 for c in self.constraints if c[1]=='<='); nsur=sum(1 for c in self.constraints if c[1]=='>='); na=sum(1 for c in self.constraints if c[1] in ['>=','='])
         t=np.zeros((len(self.constraints)+1, self.num_vars+ns+nsur+na+1)); t[0,:self.num_vars]=-self.objective_function; b=[0]*len(self.constraints)
         si,sui,ai=0,0,0
@@ -380,21 +633,18 @@ class LPSolver:
             elif s=='>=': t[i+1,self.num_vars+ns+sui]=-1; t[i+1,self.num_vars+ns+nsur+ai]=1; b[i]=self.num_vars+ns+nsur+ai; sui+=1; ai+=1
             elif s=='=': t[i+1,self.num_vars+ns+nsur+ai]=1; b[i]=self.num_vars+ns+nsur+ai; ai+=1
         if bm and na>0:
-            ast=self.num_vars+ns+nsur; t[0,ast:ast+na]=m
-            for i in range(na): c=ast+i; r=np.where(t[1:,c]==1)[0][0]+1; t[0,:]-=m*t[r,:]
+            # Linha de M separada: cada artificial custa 1·M
+            mrow=np.zeros(t.shape[1]); ast=self.num_vars+ns+nsur; mrow[ast:ast+na]=1
+            for i in range(na): c=ast+i; r=np.where(t[1:,c]==1)[0][0]+1; mrow-=t[r,:]
+            return t,b,mrow
         return t,b
     def _get_solution_from_tableau(self, t, b):
-        s={f'x{i+1}':"0" for i in range(self.num_vars)}
-        for i,v in enumerate(b): 
-            if v<self.num_vars: s[f'x{v+1}']=self._to_fraction_str(t[i+1,-1])
-        z=t[0,-1]*(-1 if self.objective=='min' else 1); s['Z']=self._to_fraction_str(z)
-        ds={}; nc=len(self.constraints)
-        for i in range(nc): 
-            c=self.num_vars+i
-            if c<t.shape[1]-1: 
-                v=t[0,c]; 
-                if self.objective=='min': v*=-1
-                ds[f'y{i+1}']=self._to_fraction_str(v)
-        s['dual_solution']=ds; s['tableau']=t; s['basis']=b
-        
+        with self._phase('formatting'): return self._read_tableau(t, b)
+    def _read_tableau(self, t, b):
+        x=np.zeros(self.num_vars)
+        for i,v in enumerate(b):
+            if v<self.num_vars: x[v]=t[i+1,-1]
+        sign=-1 if self.objective=='min' else 1
+        y=[sign*t[0,self.num_vars+i] for i in range(len(self.constraints))]
+        s=self._format_solution(x, sign*t[0,-1], y); s['tableau']=t; s['basis']=b
         return s
\ No newline at end of file
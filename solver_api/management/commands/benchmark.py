@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from solver_api.benchmark import (ALL_METHODS, BASELINE_PATH, FAMILIES, PARALLEL_METHOD, PARALLEL_WORKERS, build_corpus,
+                                  compare, load_replay, load_report, run_benchmark, save_report)
+
+
+# --- BENCHMARK DOS MÉTODOS DO LPSolver ---
+# python manage.py benchmark                      -> roda e compara com a linha de base
+# python manage.py benchmark --save-baseline      -> regrava a linha de base
+# python manage.py benchmark --replay payloads.jsonl --methods auto revised_simplex
+class Command(BaseCommand):
+    help = "Roda o corpus de benchmark do solver e compara com a linha de base"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--families', nargs='+', choices=list(FAMILIES), help="Famílias do corpus gerado")
+        parser.add_argument('--methods', nargs='+', choices=list(ALL_METHODS) + [PARALLEL_METHOD], help="Métodos a medir")
+        parser.add_argument('--bnb-workers', type=int, default=PARALLEL_WORKERS,
+                            help=f"Processos do {PARALLEL_METHOD} (B&B paralelo)")
+        parser.add_argument('--replay', help="JSONL com payloads do /api/solve/ (no lugar do corpus gerado)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--graph-format', default='png')
+        parser.add_argument('--output', help="Grava o relatório JSON neste arquivo")
+        parser.add_argument('--baseline', default=BASELINE_PATH)
+        parser.add_argument('--save-baseline', action='store_true')
+        parser.add_argument('--timing', action='store_true',
+                            help="Compara também os tempos (razões sobre a resolução de referência)")
+        parser.add_argument('--threshold', action='append', default=[], metavar='MÉTRICA=FRAÇÃO',
+                            help="Ex.: --threshold solve_ratio=0.5")
+
+    def handle(self, *args, **opts):
+        try:
+            thresholds = {k: float(v) for k, v in (t.split('=', 1) for t in opts['threshold'])}
+            corpus = load_replay(opts['replay']) if opts['replay'] else build_corpus(opts['families'], opts['seed'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        if not corpus: raise CommandError("Nenhum problema no corpus")
+
+        def progress(row):
+            self.stdout.write(f"{row['instance']:<16} {row['method']:<16} {row['status'][:24]:<24} "
+                              f"{row['wall_ms']:>10.2f} ms  piv {row['pivots']:>6}  nós {row['nodes']:>5}  "
+                              f"{row['peak_kb']:>9.1f} KB  gráfico {row['render_ms']:.1f} ms")
+
+        if opts['bnb_workers'] < 1: raise CommandError("--bnb-workers deve ser >= 1")
+        report = run_benchmark(corpus, opts['methods'], opts['graph_format'], opts['repeat'], progress, opts['bnb_workers'])
+        st = report['startup']
+        self.stdout.write(f"referência: {report['reference_ms']:.2f} ms (tempos comparados como múltiplos dela)")
+        self.stdout.write(f"partida a frio: import {st['import_ms']:.0f} ms, RSS {st['rss_kb'] / 1024:.1f} MB"
+                          f"{' (matplotlib carregado!)' if st['plotting_loaded'] else ''}; "
+                          f"1º gráfico {st['first_graph_ms']:.0f} ms, RSS {st['graph_rss_kb'] / 1024:.1f} MB")
+        for instance, ratio in report['parallel_speedup'].items():
+            self.stdout.write(f"B&B paralelo ({opts['bnb_workers']} processos, {report['environment']['cpu_count']} núcleos) "
+                              f"em {instance}: {ratio:.2f}x o serial")
+        if opts['output']: save_report(report, opts['output'])
+        if opts['save_baseline']:
+            save_report(report, opts['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Linha de base gravada em {opts['baseline']}"))
+            return
+        try: baseline = load_report(opts['baseline'])
+        except OSError:
+            self.stdout.write(self.style.WARNING("Sem linha de base para comparar"))
+            return
+        regressions = compare(report, baseline, thresholds, opts['timing'])
+        for r in regressions:
+            self.stdout.write(self.style.ERROR(f"{r['case']}: {r['metric']} {r['baseline']} -> {r['current']}"))
+        if regressions: raise CommandError(f"{len(regressions)} regressão(ões) em relação à linha de base")
+        self.stdout.write(self.style.SUCCESS("Sem regressões"))
@@ -0,0 +1,118 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# --- TEMPOS POR FASE DE UMA REQUISIÇÃO ---
+# Fases aninhadas pausam a fase de fora: cada segundo conta em uma fase só,
+# então a soma das fases fecha com o total
+class RequestMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        # Contadores do solver (pivôs, nós), ligados pela view
+        self.counters = None
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack: self._charge(self._stack[-1], now)
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._charge(self._stack.pop(), end)
+            if self._stack: self._stack[-1][1] = end
+
+    def _charge(self, frame, now):
+        self.phases[frame[0]] = self.phases.get(frame[0], 0.0) + now - frame[1]
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def work(self):
+        return {} if self.counters is None else {k: self.counters[k] for k in ('pivots', 'nodes')}
+
+    def report(self):
+        return {'total_ms': round(self.elapsed() * 1000, 3),
+                'phases_ms': {k: round(v * 1000, 3) for k, v in self.phases.items()},
+                'counters': self.work()}
+
+
+def phase(metrics, name):
+    # Atalho para o código do solver: sem métricas, não mede nada
+    return nullcontext() if metrics is None else metrics.phase(name)
+
+
+# --- PERFIL (cProfile) DE UMA REQUISIÇÃO ---
+def profile_call(func, top=20):
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func)
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats('cumulative')
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:top]:
+        rows.append({'function': f'{filename}:{line}({name})', 'calls': nc,
+                     'tottime_ms': round(tt * 1000, 3), 'cumtime_ms': round(ct * 1000, 3)})
+    return result, rows
+
+
+# --- AGREGADO DO PROCESSO NO FORMATO TEXTO DO PROMETHEUS ---
+# Cada processo (worker) tem o seu; o scrape soma os workers
+class MetricsRegistry:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}   # (method, outcome) -> contagem
+        self._latency = {}    # method -> [contagens por bucket..., soma, total]
+        self._phases = {}     # (method, phase) -> segundos
+        self._counters = {}   # (method, contador) -> total
+
+    def observe(self, method, outcome, seconds, phases=None, counters=None):
+        with self._lock:
+            self._requests[(method, outcome)] = self._requests.get((method, outcome), 0) + 1
+            hist = self._latency.setdefault(method, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound: hist[i] += 1
+            hist[-2] += seconds; hist[-1] += 1
+            for name, value in (phases or {}).items():
+                self._phases[(method, name)] = self._phases.get((method, name), 0.0) + value
+            for name, value in (counters or {}).items():
+                self._counters[(method, name)] = self._counters.get((method, name), 0) + value
+
+    def render(self):
+        lines = ['# HELP solver_requests_total Requisições de /api/solve/ por método e resultado.',
+                 '# TYPE solver_requests_total counter']
+        with self._lock:
+            for (method, outcome), n in sorted(self._requests.items()):
+                lines.append(f'solver_requests_total{{method="{method}",outcome="{outcome}"}} {n}')
+            lines += ['# HELP solver_request_duration_seconds Latência de /api/solve/ por método.',
+                      '# TYPE solver_request_duration_seconds histogram']
+            for method, hist in sorted(self._latency.items()):
+                for bound, n in zip(self.buckets, hist):
+                    lines.append(f'solver_request_duration_seconds_bucket{{method="{method}",le="{bound}"}} {n}')
+                lines.append(f'solver_request_duration_seconds_bucket{{method="{method}",le="+Inf"}} {hist[-1]}')
+                lines.append(f'solver_request_duration_seconds_sum{{method="{method}"}} {hist[-2]:.6f}')
+                lines.append(f'solver_request_duration_seconds_count{{method="{method}"}} {hist[-1]}')
+            lines += ['# HELP solver_phase_seconds_total Tempo acumulado por fase da resolução.',
+                      '# TYPE solver_phase_seconds_total counter']
+            for (method, name), v in sorted(self._phases.items()):
+                lines.append(f'solver_phase_seconds_total{{method="{method}",phase="{name}"}} {v:.6f}')
+            lines += ['# HELP solver_work_total Pivôs e nós de Branch & Bound acumulados.',
+                      '# TYPE solver_work_total counter']
+            for (method, name), v in sorted(self._counters.items()):
+                lines.append(f'solver_work_total{{method="{method}",kind="{name}"}} {v}')
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry():
+    return _registry
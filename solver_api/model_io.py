@@ -0,0 +1,497 @@
+import gzip
+import io
+import itertools
+import os
+import re
+import zlib
+from array import array
+import numpy as np
+from .main_solver import LPSolver
+from .sparse import SparseMatrix
+
+MODEL_FORMATS = ('mps', 'lp')
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+# --- MODELO LIDO DE UM ARQUIVO ---
+# O LPSolver e o que o arquivo traz além dele: nomes, variáveis inteiras e a
+# constante do objetivo (que o LPSolver não conhece; Z sai sem ela)
+class ModelFile:
+    def __init__(self, solver, name, col_names, row_names, integers, offset):
+        self.solver = solver
+        self.name = name
+        self.col_names = col_names
+        self.row_names = row_names
+        self.integers = integers      # índices das colunas inteiras
+        self.offset = offset
+
+    @property
+    def all_integer(self):
+        return len(self.integers) > 0 and len(self.integers) == self.solver.num_vars
+
+    def info(self):
+        A = self.solver._problem_arrays()[0]
+        return {'name': self.name, 'rows': A.shape[0], 'columns': A.shape[1], 'nonzeros': A.nnz,
+                'integers': len(self.integers), 'objective_offset': self.offset, 'column_names': self.col_names}
+
+
+# --- MONTAGEM INCREMENTAL (TRIPLAS COO EM array, SEM LISTAS DE OBJETOS) ---
+class _ModelBuilder:
+    def __init__(self):
+        self.name = None
+        self.col_index, self.col_names = {}, []
+        self.row_index, self.row_names, self.senses = {}, [], []
+        self.rhs = array('d')
+        self.ri, self.ci, self.vals = array('q'), array('q'), array('d')
+        self.cost, self.lb, self.ub = array('d'), array('d'), array('d')
+        self.integers = set()
+        self.ranges = {}
+        self.offset = 0.0
+
+    def column(self, name):
+        j = self.col_index.get(name)
+        if j is None:
+            j = self.col_index[name] = len(self.col_names)
+            self.col_names.append(name)
+            self.cost.append(0.0); self.lb.append(0.0); self.ub.append(np.inf)
+        return j
+
+    def row(self, name, sense):
+        if name in self.row_index: raise ValueError(f"Restrição '{name}' repetida")
+        i = self.row_index[name] = len(self.row_names)
+        self.row_names.append(name); self.senses.append(sense); self.rhs.append(0.0)
+        return i
+
+    def add(self, i, j, value):
+        self.ri.append(i); self.ci.append(j); self.vals.append(value)
+
+    def build(self, objective):
+        m, n = len(self.row_names), len(self.col_names)
+        if n == 0: raise ValueError("Modelo sem variáveis")
+        ri = np.frombuffer(self.ri, dtype=np.int64) if len(self.ri) else np.zeros(0, np.int64)
+        ci = np.frombuffer(self.ci, dtype=np.int64) if len(self.ci) else np.zeros(0, np.int64)
+        vals = np.frombuffer(self.vals, dtype=float) if len(self.vals) else np.zeros(0)
+        senses, rhs, names = list(self.senses), np.array(self.rhs), list(self.row_names)
+        # Restrição com intervalo (RANGES): vira '>=' no limite de baixo e ganha
+        # uma cópia '<=' no de cima, no fim da matriz
+        ranged = [i for i, r in sorted(self.ranges.items()) if not (senses[i] == '=' and r == 0)]
+        if ranged:
+            extra = np.full(m, -1, dtype=np.int64)
+            extra[ranged] = m + np.arange(len(ranged))
+            hi = []
+            for i in ranged:
+                r, b = self.ranges[i], rhs[i]
+                lo, up = (b - abs(r), b) if senses[i] == '<=' else (b, b + abs(r)) if senses[i] == '>=' else \
+                    ((b, b + r) if r > 0 else (b + r, b))
+                senses[i], rhs[i] = '>=', lo
+                hi.append(up); names.append(f'{names[i]}_rng')
+            sel = np.where(extra[ri] >= 0)[0]
+            ri, ci, vals = np.concatenate([ri, extra[ri[sel]]]), np.concatenate([ci, ci[sel]]), np.concatenate([vals, vals[sel]])
+            senses += ['<='] * len(ranged); rhs = np.concatenate([rhs, hi])
+        A = SparseMatrix.from_coo(ri, ci, vals, (len(senses), n))
+        lb, ub = np.array(self.lb), np.array(self.ub)
+        bounds = None
+        if (lb != 0).any() or np.isfinite(ub).any():
+            bounds = [(None if lo == -np.inf else float(lo), None if up == np.inf else float(up)) for lo, up in zip(lb, ub)]
+        solver = LPSolver.from_sparse(np.array(self.cost), A, senses, rhs, objective, bounds)
+        return ModelFile(solver, self.name, self.col_names, names, sorted(self.integers), self.offset)
+
+
+def _number(tok, line_no):
+    try: return float(tok)
+    except ValueError: raise ValueError(f"Linha {line_no}: número inválido '{tok}'") from None
+
+
+# --- MPS (LIVRE E FIXO) ---
+# Seções NAME, OBJSENSE, OBJNAME, ROWS, COLUMNS (com MARKER INTORG/INTEND),
+# RHS, RANGES, BOUNDS e ENDATA. No formato livre os campos são separados por
+# espaços; no fixo (fixed=True) são lidos pelas colunas do padrão, então nomes
+# podem ter espaços. Só o primeiro conjunto de RHS/RANGES/BOUNDS é usado.
+MPS_SECTIONS = ('NAME', 'OBJSENSE', 'OBJNAME', 'ROWS', 'COLUMNS', 'RHS', 'RANGES', 'BOUNDS', 'ENDATA')
+_FIXED_FIELDS = ((1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61))
+_ROW_SENSES = {'L': '<=', 'G': '>=', 'E': '='}
+
+
+def _mps_fields(line, fixed):
+    # Linha de MARKER não segue as colunas fixas em todo gerador
+    if not fixed or "'MARKER'" in line: return line.split()
+    return [f for f in (line[a:b].strip() for a, b in _FIXED_FIELDS) if f]
+
+
+def parse_mps(lines, fixed=False):
+    mb = _ModelBuilder()
+    objective, obj_row, free_rows = 'min', None, set()
+    section, integer, sets = None, False, {}
+
+    def same_set(kind, name):
+        # Arquivos com vários conjuntos: vale o primeiro
+        return sets.setdefault(kind, name) == name
+
+    for k, raw in enumerate(lines, 1):
+        line = raw.rstrip('\r\n')
+        if not line.strip() or line.startswith('*'): continue
+        if not line[0].isspace():
+            words = line.split()
+            head = words[0].upper()
+            if head not in MPS_SECTIONS: raise ValueError(f"Linha {k}: seção '{words[0]}' não suportada")
+            section = head
+            if head == 'NAME': mb.name = line[4:].strip() or None
+            elif head == 'OBJSENSE' and len(words) > 1: objective = 'max' if words[1].upper().startswith('MAX') else 'min'
+            elif head == 'OBJNAME' and len(words) > 1: obj_row = words[1]
+            elif head == 'ENDATA': break
+            continue
+
+        f = _mps_fields(line, fixed)
+        if section == 'OBJSENSE':
+            objective = 'max' if f[0].upper().startswith('MAX') else 'min'
+        elif section == 'OBJNAME':
+            obj_row = f[0]
+        elif section == 'ROWS':
+            kind, name = f[0].upper(), f[1]
+            if kind == 'N':
+                if obj_row is None: obj_row = name
+                elif name != obj_row: free_rows.add(name)
+            elif kind in _ROW_SENSES: mb.row(name, _ROW_SENSES[kind])
+            else: raise ValueError(f"Linha {k}: tipo de linha '{f[0]}' inválido")
+        elif section == 'COLUMNS':
+            if len(f) >= 3 and f[1].strip("'").upper() == 'MARKER':
+                tag = f[2].strip("'").upper()
+                if tag not in ('INTORG', 'INTEND'): raise ValueError(f"Linha {k}: marcador '{f[2]}' inválido")
+                integer = tag == 'INTORG'
+                continue
+            j = mb.column(f[0])
+            if integer: mb.integers.add(j)
+            if len(f) not in (3, 5): raise ValueError(f"Linha {k}: esperado coluna, linha e valor")
+            for row, value in zip(f[1::2], f[2::2]):
+                v = _number(value, k)
+                if row == obj_row: mb.cost[j] += v
+                elif row in free_rows: continue
+                elif row in mb.row_index: mb.add(mb.row_index[row], j, v)
+                else: raise ValueError(f"Linha {k}: restrição '{row}' não declarada em ROWS")
+        elif section in ('RHS', 'RANGES'):
+            if len(f) % 2:
+                if not same_set(section, f[0]): continue
+                f = f[1:]
+            for row, value in zip(f[0::2], f[1::2]):
+                v = _number(value, k)
+                if row == obj_row:
+                    # RHS no objetivo é a constante com o sinal trocado
+                    if section == 'RHS': mb.offset = -v
+                elif row in free_rows: continue
+                elif row not in mb.row_index: raise ValueError(f"Linha {k}: restrição '{row}' não declarada em ROWS")
+                elif section == 'RHS': mb.rhs[mb.row_index[row]] = v
+                else: mb.ranges[mb.row_index[row]] = v
+        elif section == 'BOUNDS':
+            kind = f[0].upper()
+            valued = kind not in ('FR', 'MI', 'PL', 'BV') or (kind == 'BV' and len(f) == 4)
+            if len(f) == (4 if valued else 3):
+                if not same_set(section, f[1]): continue
+                f = [f[0]] + f[2:]
+            if len(f) != (3 if valued else 2): raise ValueError(f"Linha {k}: limite incompleto")
+            j = mb.column(f[1])
+            v = _number(f[2], k) if valued else None
+            if kind == 'UP':
+                # Convenção dos outros leitores: UP negativo com inferior 0 libera o inferior
+                if v < 0 and mb.lb[j] == 0: mb.lb[j] = -np.inf
+                mb.ub[j] = v
+            elif kind == 'LO': mb.lb[j] = v
+            elif kind == 'FX': mb.lb[j] = mb.ub[j] = v
+            elif kind == 'FR': mb.lb[j], mb.ub[j] = -np.inf, np.inf
+            elif kind == 'MI': mb.lb[j] = -np.inf
+            elif kind == 'PL': mb.ub[j] = np.inf
+            elif kind == 'BV': mb.lb[j], mb.ub[j] = 0.0, 1.0; mb.integers.add(j)
+            elif kind == 'LI': mb.lb[j] = v; mb.integers.add(j)
+            elif kind == 'UI': mb.ub[j] = v; mb.integers.add(j)
+            else: raise ValueError(f"Linha {k}: tipo de limite '{f[0]}' não suportado")
+        else:
+            raise ValueError(f"Linha {k}: dados fora de uma seção")
+    return mb.build(objective)
+
+
+# --- CPLEX LP ---
+# Objetivo (Maximize/Minimize), Subject To, Bounds, Generals, Binaries e End;
+# comentários com '\'. Restrições podem ocupar várias linhas: os tokens são
+# consumidos em fluxo e cada restrição fecha no número depois do sinal.
+_LP_TOKEN = re.compile(r'\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<op><=|>=|=<|=>|<|>|=)'
+                       r'|(?P<sign>[+-])|(?P<colon>:)|(?P<name>[^\s:<>=+\-]+))')
+_LP_SECTIONS = {
+    'maximize': 'max', 'maximum': 'max', 'max': 'max', 'minimize': 'min', 'minimum': 'min', 'min': 'min',
+    'subject to': 'st', 'such that': 'st', 'st': 'st', 's.t.': 'st', 'st.': 'st',
+    'bounds': 'bounds', 'bound': 'bounds', 'general': 'int', 'generals': 'int', 'gen': 'int',
+    'integer': 'int', 'integers': 'int', 'binary': 'bin', 'binaries': 'bin', 'bin': 'bin', 'end': 'end',
+}
+_LP_UNSUPPORTED = ('semi-continuous', 'semi', 'semis', 'sos')
+_LP_OPS = {'<=': '<=', '=<': '<=', '<': '<=', '>=': '>=', '=>': '>=', '>': '>=', '=': '='}
+_INFINITY = ('inf', 'infinity')
+
+
+def _lp_tokens(text, line_no):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _LP_TOKEN.match(text, pos)
+        if match is None or match.end() == pos: raise ValueError(f"Linha {line_no}: não entendi '{text[pos:].strip()}'")
+        pos = match.end()
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+    return tokens
+
+
+def _lp_section(text):
+    # Palavra-chave de seção no início da linha (o resto da linha é conteúdo)
+    low = text.lower()
+    for key in sorted(_LP_SECTIONS, key=len, reverse=True):
+        if low == key or (low.startswith(key) and low[len(key)].isspace()):
+            return _LP_SECTIONS[key], text[len(key):]
+    for key in _LP_UNSUPPORTED:
+        if low == key or low.startswith(key + ' ') or low.startswith(key + ':'):
+            raise ValueError(f"Seção '{key}' não suportada")
+    return None, text
+
+
+def _lp_linear(tokens, mb, line_no):
+    # Soma de termos [sinal] [coeficiente] variável; números soltos são constantes
+    terms, constant, sign, coef = [], 0.0, 1.0, None
+    for kind, tok in tokens:
+        if kind == 'sign': sign = -sign if tok == '-' else sign
+        elif kind == 'num':
+            if coef is not None: raise ValueError(f"Linha {line_no}: dois números seguidos")
+            coef = float(tok)
+        elif kind == 'name':
+            terms.append((mb.column(tok), sign * (1.0 if coef is None else coef)))
+            sign, coef = 1.0, None
+        else: raise ValueError(f"Linha {line_no}: '{tok}' inesperado")
+    if coef is not None: constant += sign * coef
+    return terms, constant
+
+
+def _lp_value(tokens, line_no):
+    # [sinal] número | [sinal] inf
+    sign = -1.0 if tokens and tokens[0] == ('sign', '-') else 1.0
+    if tokens and tokens[0][0] == 'sign': tokens = tokens[1:]
+    if len(tokens) != 1: raise ValueError(f"Linha {line_no}: valor inválido")
+    kind, tok = tokens[0]
+    if kind == 'name' and tok.lower() in _INFINITY: return sign * np.inf
+    if kind != 'num': raise ValueError(f"Linha {line_no}: valor inválido '{tok}'")
+    return sign * float(tok)
+
+
+def _lp_bound(tokens, mb, line_no):
+    ops = [k for k, (kind, _) in enumerate(tokens) if kind == 'op']
+    if not ops:
+        if len(tokens) == 2 and tokens[0][0] == tokens[1][0] == 'name' and tokens[1][1].lower() == 'free':
+            j = mb.column(tokens[0][1]); mb.lb[j], mb.ub[j] = -np.inf, np.inf
+            return
+        raise ValueError(f"Linha {line_no}: limite inválido")
+    parts = [tokens[:ops[0]]] + [tokens[a + 1:b] for a, b in zip(ops, ops[1:] + [len(tokens)])]
+    senses = [_LP_OPS[tokens[k][1]] for k in ops]
+    # A variável é a parte que é um nome (e não inf)
+    var = [k for k, p in enumerate(parts) if len(p) == 1 and p[0][0] == 'name' and p[0][1].lower() not in _INFINITY]
+    if len(var) != 1: raise ValueError(f"Linha {line_no}: limite inválido")
+    j = mb.column(parts[var[0]][0][1])
+    for k, sense in enumerate(senses):
+        if k + 1 == var[0]: v, s = _lp_value(parts[k], line_no), {'<=': '>=', '>=': '<=', '=': '='}[sense]
+        elif k == var[0]: v, s = _lp_value(parts[k + 1], line_no), sense
+        else: raise ValueError(f"Linha {line_no}: limite inválido")
+        if s == '<=': mb.ub[j] = v
+        elif s == '>=': mb.lb[j] = v
+        else: mb.lb[j] = mb.ub[j] = v
+
+
+def parse_lp(lines):
+    mb = _ModelBuilder()
+    objective, section, pending, obj_tokens, start = None, None, [], [], 0
+
+    def finish_constraint(tokens, line_no):
+        name = None
+        if len(tokens) >= 2 and tokens[1][0] == 'colon':
+            name, tokens = tokens[0][1], tokens[2:]
+        op = next(k for k, (kind, _) in enumerate(tokens) if kind == 'op')
+        terms, constant = _lp_linear(tokens[:op], mb, line_no)
+        i = mb.row(name or f'c{len(mb.row_names) + 1}', _LP_OPS[tokens[op][1]])
+        for j, v in terms: mb.add(i, j, v)
+        mb.rhs[i] = _lp_value(tokens[op + 1:], line_no) - constant
+
+    for k, raw in enumerate(lines, 1):
+        text = raw.split('\\', 1)[0].strip()
+        if not text: continue
+        kind, text = _lp_section(text)
+        if kind is not None:
+            if pending: raise ValueError(f"Linha {start}: restrição incompleta")
+            if kind in ('max', 'min'): objective = kind
+            section = kind
+            if kind == 'end': break
+            if not text.strip(): continue
+        if section is None: raise ValueError(f"Linha {k}: esperado Maximize ou Minimize")
+        tokens = _lp_tokens(text, k)
+        if section in ('max', 'min'):
+            obj_tokens += tokens
+        elif section == 'st':
+            for tok in tokens:
+                if not pending: start = k
+                pending.append(tok)
+                # Fecha no número (ou inf) que vem depois do sinal
+                if tok[0] in ('num', 'name') and any(kind == 'op' for kind, _ in pending[:-1]):
+                    finish_constraint(pending, start); pending = []
+        elif section == 'bounds':
+            _lp_bound(tokens, mb, k)
+        else:
+            for kind, tok in tokens:
+                if kind != 'name': raise ValueError(f"Linha {k}: esperado nome de variável")
+                j = mb.column(tok)
+                mb.integers.add(j)
+                if section == 'bin': mb.lb[j], mb.ub[j] = 0.0, 1.0
+    if objective is None: raise ValueError("Arquivo LP sem Maximize/Minimize")
+    if pending: raise ValueError(f"Linha {start}: restrição incompleta")
+    if len(obj_tokens) >= 2 and obj_tokens[1][0] == 'colon': obj_tokens = obj_tokens[2:]
+    terms, mb.offset = _lp_linear(obj_tokens, mb, 0)
+    for j, v in terms: mb.cost[j] += v
+    return mb.build(objective)
+
+
+# --- LEITURA EM FLUXO (CAMINHO, ARQUIVO OU UPLOAD; GZIP DETECTADO PELO CONTEÚDO) ---
+class _Prefixed(io.RawIOBase):
+    # Devolve os bytes já espiados e depois o resto do arquivo, sem seek
+    def __init__(self, head, fh):
+        self.head, self.fh = head, fh
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        if self.head:
+            n = min(len(buf), len(self.head))
+            buf[:n] = self.head[:n]; self.head = self.head[n:]
+            return n
+        data = self.fh.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+
+def open_model_stream(source):
+    # Linhas de texto de um caminho ou de um arquivo binário (upload do Django,
+    # corpo da requisição), descompactando gzip em fluxo
+    fh = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    head = fh.read(2)
+    stream = io.BufferedReader(_Prefixed(head, fh), 1 << 16)
+    if head == GZIP_MAGIC: stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+
+def _guess_format(lines, filename=None):
+    if filename:
+        base = filename.lower()
+        if base.endswith('.gz'): base = base[:-3]
+        ext = os.path.splitext(base)[1]
+        if ext in ('.mps', '.fmps', '.qps'): return 'mps', lines
+        if ext == '.lp': return 'lp', lines
+    # Pelo conteúdo: a primeira linha útil do MPS é uma seção em maiúsculas
+    it = iter(lines)
+    seen = []
+    for line in it:
+        seen.append(line)
+        text = line.strip()
+        if not text or text.startswith('*') or text.startswith('\\'): continue
+        fmt = 'mps' if text.split()[0].upper() in ('NAME', 'ROWS', 'OBJSENSE', 'OBJNAME') else 'lp'
+        return fmt, itertools.chain(seen, it)
+    raise ValueError("Arquivo de modelo vazio")
+
+
+def read_model(source, format=None, fixed=False, filename=None):
+    # format: 'mps', 'lp' ou None (pela extensão de filename/source ou pelo conteúdo)
+    if format is not None and format not in MODEL_FORMATS:
+        raise ValueError(f"Formato '{format}' desconhecido. Use: {', '.join(MODEL_FORMATS)}.")
+    if filename is None and isinstance(source, (str, os.PathLike)): filename = os.fspath(source)
+    text = open_model_stream(source)
+    try:
+        lines = text
+        if format is None: format, lines = _guess_format(text, filename)
+        return parse_mps(lines, fixed) if format == 'mps' else parse_lp(lines)
+    except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+        raise ValueError(f"gzip inválido: {e}") from None
+    finally:
+        if isinstance(source, (str, os.PathLike)): text.close()
+
+
+def read_mps(source, fixed=False):
+    return read_model(source, 'mps', fixed)
+
+
+def read_lp(source):
+    return read_model(source, 'lp')
+
+
+# --- EXPORTAÇÃO PARA MPS LIVRE ---
+# Mesmo modelo que o LPSolver resolve (limites inclusive), para comparar com
+# outros solvers; números com a menor representação exata do float
+def _mps_number(v):
+    s = repr(float(v))
+    return s[:-2] if s.endswith('.0') else s
+
+
+def _mps_name(name):
+    return re.sub(r'\s+', '_', str(name))
+
+
+def iter_mps(solver, name='MODEL', col_names=None, row_names=None, integers=(), offset=0.0):
+    A, senses, rhs = solver._problem_arrays()
+    lb, ub = solver._bound_arrays()
+    m, n = A.shape
+    c = solver.objective_function * (-1 if solver.is_minimization else 1)
+    cols = [_mps_name(s) for s in col_names] if col_names is not None else [f'x{j+1}' for j in range(n)]
+    rows = [_mps_name(s) for s in row_names[:m]] if row_names is not None else [f'c{i+1}' for i in range(m)]
+    integers = set(range(n)) if integers is True else set(integers)
+
+    yield f'NAME          {_mps_name(name)}\n'
+    if solver.objective == 'max': yield 'OBJSENSE\n    MAX\n'
+    yield 'ROWS\n N  obj\n'
+    kinds = {'<=': 'L', '>=': 'G', '=': 'E'}
+    for s, row in zip(senses, rows): yield f' {kinds[s]}  {row}\n'
+
+    yield 'COLUMNS\n'
+    order = np.lexsort((A.row_ids, A.indices))
+    col_of, row_of, val_of = A.indices[order], A.row_ids[order], A.data[order]
+    colptr = np.searchsorted(col_of, np.arange(n + 1))
+    marker = False
+    for j in range(n):
+        if (j in integers) != marker:
+            marker = not marker
+            yield f"    MARKER    'MARKER'    '{'INTORG' if marker else 'INTEND'}'\n"
+        entries = [('obj', c[j])] if c[j] != 0 else []
+        entries += [(rows[i], v) for i, v in zip(row_of[colptr[j]:colptr[j+1]].tolist(), val_of[colptr[j]:colptr[j+1]].tolist())]
+        # Coluna sem nenhum coeficiente ainda precisa aparecer
+        if not entries: entries = [('obj', 0.0)]
+        yield ''.join(f'    {cols[j]}  {row}  {_mps_number(v)}\n' for row, v in entries)
+    if marker: yield "    MARKER    'MARKER'    'INTEND'\n"
+
+    yield 'RHS\n'
+    if offset: yield f'    RHS  obj  {_mps_number(-offset)}\n'
+    for i in np.nonzero(rhs)[0].tolist(): yield f'    RHS  {rows[i]}  {_mps_number(rhs[i])}\n'
+
+    if solver.bounds is not None or integers:
+        yield 'BOUNDS\n'
+        for j in range(n):
+            lo, hi = lb[j], ub[j]
+            if lo == hi: yield f' FX BND  {cols[j]}  {_mps_number(lo)}\n'; continue
+            if lo == -np.inf and hi == np.inf: yield f' FR BND  {cols[j]}\n'; continue
+            if lo == -np.inf: yield f' MI BND  {cols[j]}\n'
+            # UP negativo sozinho liberaria o inferior (convenção do MPS)
+            elif lo != 0 or hi < 0: yield f' LO BND  {cols[j]}  {_mps_number(lo)}\n'
+            if hi != np.inf: yield f' UP BND  {cols[j]}  {_mps_number(hi)}\n'
+            elif j in integers: yield f' PL BND  {cols[j]}\n'
+    yield 'ENDATA\n'
+
+
+def write_mps(solver, dest, **kwargs):
+    # dest: caminho (.gz grava compactado) ou arquivo de texto aberto
+    if isinstance(dest, (str, os.PathLike)):
+        opener = gzip.open if os.fspath(dest).endswith('.gz') else open
+        with opener(dest, 'wt', encoding='utf-8') as fh:
+            fh.writelines(iter_mps(solver, **kwargs))
+    else:
+        dest.writelines(iter_mps(solver, **kwargs))
+
+
+def model_to_mps(model, dest):
+    # Reexporta um modelo lido (nomes, inteiras e constante preservados)
+    write_mps(model.solver, dest, name=model.name or 'MODEL', col_names=model.col_names,
+              row_names=model.row_names, integers=model.integers, offset=model.offset)
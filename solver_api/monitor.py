@@ -0,0 +1,37 @@
+import time
+
+
+class SolveInterrupted(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason  # 'cancelled' ou 'time_limit'
+
+
+# --- ACOMPANHAMENTO DE UMA RESOLUÇÃO EM ANDAMENTO ---
+# Os motores chamam tick() a cada pivô/nó; a checagem de cancelamento, de
+# tempo e o envio do progresso só acontecem a cada `interval` segundos.
+# Valores passados como função só são calculados nesse momento.
+class SolveMonitor:
+    def __init__(self, time_limit=None, is_cancelled=None, report=None, interval=0.25):
+        self.deadline = time.monotonic() + time_limit if time_limit else None
+        self.is_cancelled = is_cancelled
+        self.report = report
+        self.interval = interval
+        self.progress = {}
+        self._pending = {}
+        self._next_check = 0.0
+
+    def tick(self, **fields):
+        self._pending.update(fields)
+        now = time.monotonic()
+        if now < self._next_check: return
+        self._next_check = now + self.interval
+        self.flush()
+        if self.is_cancelled is not None and self.is_cancelled(): raise SolveInterrupted('cancelled')
+        if self.deadline is not None and now > self.deadline: raise SolveInterrupted('time_limit')
+
+    def flush(self):
+        for k, v in self._pending.items():
+            self.progress[k] = v() if callable(v) else v
+        self._pending = {}
+        if self.report is not None: self.report(dict(self.progress))
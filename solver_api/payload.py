@@ -0,0 +1,71 @@
+from .main_solver import LPSolver
+from .sparse import SparseMatrix
+
+
+# --- LEITURA DO JSON DE ENTRADA (SEM DEPENDER DO DJANGO) ---
+# Usado pelas views e pelos processos de trabalho dos jobs assíncronos
+def build_solver(data):
+    objective = data['objective']
+    obj_func = data['objective_function']
+    constraints_data = data['constraints']
+    n = len(obj_func)
+
+    # Limites por variável: [[inferior, superior], ...], null = sem limite
+    bounds = data.get('bounds')
+    if bounds is not None:
+        if len(bounds) != n: raise ValueError("'bounds' deve ter um par [inferior, superior] por variável")
+        bounds = [(None if lo is None else float(lo), None if hi is None else float(hi)) for lo, hi in bounds]
+
+    # Formato COO: {"matrix": {"row": [...], "col": [...], "data": [...]}} + sinal/rhs por restrição
+    if 'matrix' in data:
+        coo = data['matrix']
+        A = SparseMatrix.from_coo(coo['row'], coo['col'], coo['data'], (len(constraints_data), n))
+        return LPSolver.from_sparse(obj_func, A, [c['sign'] for c in constraints_data], [c['rhs'] for c in constraints_data], objective, bounds)
+
+    # Formato por linha: {"indices": [...], "values": [...]} no lugar de "coefficients"
+    if any('coefficients' not in c for c in constraints_data):
+        rows = []
+        for c in constraints_data:
+            if 'coefficients' in c:
+                dense = [float(v) for v in c['coefficients']]
+                rows.append(([j for j, v in enumerate(dense) if v != 0], [v for v in dense if v != 0]))
+            else:
+                rows.append((c['indices'], c['values']))
+        A = SparseMatrix.from_rows(rows, n)
+        return LPSolver.from_sparse(obj_func, A, [c['sign'] for c in constraints_data], [c['rhs'] for c in constraints_data], objective, bounds)
+
+    constraints = [
+        (c['coefficients'], c['sign'], c['rhs'])
+        for c in constraints_data
+    ]
+
+    return LPSolver(
+        objective_function=obj_func,
+        constraints=constraints,
+        objective=objective,
+        bounds=bounds
+    )
+
+
+def solve_options(data, bnb_workers=1):
+    # bnb_workers: padrão global (settings.SOLVER_BNB) quando o JSON não traz o seu
+    return {
+        'method': data.get('method', 'auto'),
+        'integer_mode': data.get('integer_mode', False),
+        'bnb_strategy': data.get('bnb_strategy', 'best_bound'),
+        'trace': data.get('trace', 'none'),
+        'max_nodes': data.get('max_nodes'),
+        'sensitivity': data.get('sensitivity', False),
+        'parametric_rhs': data.get('parametric_rhs'),
+        'presolve': data.get('presolve', False),
+        'node_details': data.get('node_details', True),
+        'cuts': data.get('cuts', False),
+        'max_depth': data.get('max_depth', 10),
+        'heuristics': data.get('heuristics', True),
+        'time_limit': data.get('time_limit'),
+        'mip_gap': data.get('mip_gap'),
+        'pricing': data.get('pricing', 'dantzig'),
+        'tolerances': data.get('tolerances'),
+        'crossover': data.get('crossover', True),
+        'bnb_workers': data.get('bnb_workers', bnb_workers),
+    }
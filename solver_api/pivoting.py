@@ -0,0 +1,84 @@
+import numpy as np
+
+PRICING_RULES = ('dantzig', 'steepest_edge', 'devex', 'bland')
+DEFAULT_TOLERANCES = {'optimality': 1e-9, 'pivot': 1e-9, 'feasibility': 1e-7}
+
+
+def simplex_tolerances(tolerances=None):
+    tol = dict(DEFAULT_TOLERANCES)
+    for k, v in (tolerances or {}).items():
+        if k not in tol: raise ValueError(f"Tolerância '{k}' desconhecida. Use: {', '.join(DEFAULT_TOLERANCES)}.")
+        if not float(v) > 0: raise ValueError(f"Tolerância '{k}' deve ser positiva")
+        tol[k] = float(v)
+    return tol
+
+
+# --- REGRAS DE PIVOTEAMENTO DO SIMPLEX EM TABLEAU ---
+# Entrada (linha 0 = custos reduzidos, entra quem for negativo):
+#   dantzig       -> custo reduzido mais negativo
+#   steepest_edge -> d_j² / (1 + ||coluna j||²), exato no tableau denso
+#   devex         -> d_j² / w_j com pesos de referência aproximados
+#   bland         -> menor índice (não cicla)
+# Saída: teste da razão de Harris em duas passagens (folga de viabilidade
+# na 1ª, maior pivô entre os empatados na 2ª). Depois de `stall_limit` pivôs
+# degenerados seguidos a regra cai para Bland (com teste da razão clássico e
+# desempate pelo menor índice) até o próximo pivô que ande.
+class TableauPivoting:
+    def __init__(self, rule='dantzig', tolerances=None, stall_limit=50):
+        if rule not in PRICING_RULES:
+            raise ValueError(f"Regra de pivoteamento '{rule}' desconhecida. Use: {', '.join(PRICING_RULES)}.")
+        self.rule = rule
+        self.tol = simplex_tolerances(tolerances)
+        self.stall_limit = stall_limit
+        self.weights = None
+        self.stalled = 0
+        self.stats = {'pivots': 0, 'degenerate': 0, 'bland_switches': 0}
+
+    @property
+    def active_rule(self):
+        return 'bland' if self.rule == 'bland' or self.stalled >= self.stall_limit else self.rule
+
+    def entering(self, t, d, allowed=None):
+        neg = d < -self.tol['optimality']
+        if allowed is not None: neg &= allowed
+        if not neg.any(): return None
+        rule = self.active_rule
+        if rule == 'bland': return int(np.argmax(neg))
+        if rule == 'dantzig': return int(np.argmin(np.where(neg, d, 0.0)))
+        if rule == 'steepest_edge':
+            w = 1.0 + (t[1:, :-1] ** 2).sum(axis=0)
+        else:
+            if self.weights is None or len(self.weights) != len(d): self.weights = np.ones(len(d))
+            w = self.weights
+        return int(np.argmax(np.where(neg, d * d / w, -1.0)))
+
+    def leaving(self, t, b, pc):
+        col, rhs = t[1:, pc], np.maximum(t[1:, -1], 0.0)
+        ok = col > self.tol['pivot']
+        if not ok.any(): return None
+        rows = np.where(ok)[0]
+        ratios = rhs[rows] / col[rows]
+        if self.active_rule == 'bland':
+            ties = rows[ratios <= ratios.min() + self.tol['pivot']]
+            return int(ties[np.argmin([b[i] for i in ties])]) + 1
+        theta_max = ((rhs[rows] + self.tol['feasibility']) / col[rows]).min()
+        cand = rows[ratios <= theta_max]
+        return int(cand[np.argmax(col[cand])]) + 1
+
+    def update(self, t, b, pr, pc):
+        # Chamado antes do pivô (linha pr ainda sem normalizar)
+        alpha_q = t[pr, pc]
+        degenerate = max(t[pr, -1], 0.0) / alpha_q <= self.tol['feasibility']
+        self.stats['pivots'] += 1
+        if degenerate:
+            self.stats['degenerate'] += 1
+            self.stalled += 1
+            if self.stalled == self.stall_limit and self.rule != 'bland': self.stats['bland_switches'] += 1
+        else:
+            self.stalled = 0
+        if self.rule == 'devex' and self.weights is not None:
+            w = self.weights
+            wq = w[pc]
+            ratio = t[pr, :-1] / alpha_q
+            w[:] = np.maximum(w, ratio * ratio * wq)
+            w[b[pr-1]] = max(wq / (alpha_q * alpha_q), 1.0)
@@ -0,0 +1,237 @@
+import math
+from collections import defaultdict
+import numpy as np
+from .exact import to_exact
+from .sparse import SparseMatrix
+
+FLIP = {'<=': '>=', '>=': '<=', '=': '='}
+
+
+# --- PRÉ-PROCESSAMENTO (PRESOLVE) COM REGISTRO PARA O PÓS-PROCESSAMENTO ---
+# Reduções, repetidas até não haver mudança:
+#   linhas vazias, linhas singleton (viram limites), variáveis fixas,
+#   linhas redundantes pela atividade mínima/máxima, linhas duplicadas
+#   (múltiplas uma da outra) e colunas vazias.
+# Depois, escala linhas e colunas por potências de 2 (exata em ponto
+# flutuante). O postsolve devolve x e y nas variáveis/linhas originais.
+class Presolve:
+    def __init__(self, solver, integer=False, scale=True, max_passes=10, tol=1e-9):
+        self.solver = solver
+        self.integer = integer
+        self.scale = scale
+        self.max_passes = max_passes
+        self.tol = tol
+        self.sign = -1 if solver.objective == 'min' else 1
+        A, senses, rhs = solver._problem_arrays()
+        self.m, self.n = A.shape
+        self.A = A
+        self.rows = [dict(zip(A.indices[A.indptr[i]:A.indptr[i+1]].tolist(), A.data[A.indptr[i]:A.indptr[i+1]].tolist()))
+                     for i in range(self.m)]
+        self.cols = defaultdict(set)
+        for i, row in enumerate(self.rows):
+            for j in row: self.cols[j].add(i)
+        self.senses = list(senses)
+        self.rhs = [float(v) for v in rhs]
+        self.c = self.sign * solver.objective_function  # custos no sentido original
+        lb, ub = solver._bound_arrays()
+        self.lb, self.ub = lb.copy(), ub.copy()
+        self.lb_row = {}; self.ub_row = {}  # linha singleton que definiu cada limite
+        self.row_alive = [True] * self.m
+        self.col_alive = [True] * self.n
+        self.fixed = {}                      # j -> valor
+        self.log = []                        # ordem de aplicação das reduções de linha
+        self.offset = 0.0
+        self.status = None
+        self.stats = {'empty_rows': 0, 'singleton_rows': 0, 'redundant_rows': 0, 'duplicate_rows': 0,
+                      'fixed_cols': 0, 'empty_cols': 0}
+
+    # --- REDUÇÕES ---
+    def _drop_row(self, i, kind):
+        self.row_alive[i] = False
+        for j in self.rows[i]: self.cols[j].discard(i)
+        self.stats[kind] += 1
+
+    def _fix_col(self, j, value, kind='fixed_cols'):
+        # Substitui x_j = value em todas as linhas e no objetivo
+        self.col_alive[j] = False
+        self.fixed[j] = value
+        self.offset += self.c[j] * value
+        for i in list(self.cols[j]):
+            self.rhs[i] -= self.rows[i].pop(j) * value
+        self.cols[j].clear()
+        self.stats[kind] += 1
+
+    def _tighten(self, j, lo, hi, i):
+        if self.integer:
+            if np.isfinite(lo): lo = math.ceil(lo - 1e-6)
+            if np.isfinite(hi): hi = math.floor(hi + 1e-6)
+        changed = False
+        if lo > self.lb[j] + self.tol: self.lb[j] = lo; self.lb_row[j] = i; changed = True
+        if hi < self.ub[j] - self.tol: self.ub[j] = hi; self.ub_row[j] = i; changed = True
+        return changed
+
+    def _activity(self, row):
+        lo = hi = 0.0
+        for j, a in row.items():
+            lo += a * (self.lb[j] if a > 0 else self.ub[j])
+            hi += a * (self.ub[j] if a > 0 else self.lb[j])
+        return lo, hi
+
+    def _row_pass(self):
+        changed = False
+        for i in range(self.m):
+            if not self.row_alive[i]: continue
+            row, sense, b = self.rows[i], self.senses[i], self.rhs[i]
+            ftol = self.tol * max(1.0, abs(b))
+            if not row:
+                if (sense == '<=' and b < -ftol) or (sense == '>=' and b > ftol) or (sense == '=' and abs(b) > ftol):
+                    self.status = 'infeasible'; return False
+                self._drop_row(i, 'empty_rows'); changed = True
+                continue
+            if len(row) == 1:
+                (j, a), = row.items()
+                v = b / a
+                s = sense if a > 0 else FLIP[sense]
+                lo = v if s in ('>=', '=') else -np.inf
+                hi = v if s in ('<=', '=') else np.inf
+                self._tighten(j, lo, hi, i)
+                self.log.append(('singleton', i, j, a))
+                self._drop_row(i, 'singleton_rows'); changed = True
+                if self.lb[j] > self.ub[j] + self.tol * max(1.0, abs(v)): self.status = 'infeasible'; return False
+                continue
+            lo, hi = self._activity(row)
+            if (sense in ('<=', '=') and lo > b + ftol) or (sense in ('>=', '=') and hi < b - ftol):
+                self.status = 'infeasible'; return False
+            if (sense == '<=' and hi <= b + ftol) or (sense == '>=' and lo >= b - ftol) or \
+               (sense == '=' and hi - lo <= ftol):
+                self._drop_row(i, 'redundant_rows'); changed = True
+        return changed
+
+    def _col_pass(self):
+        changed = False
+        for j in range(self.n):
+            if not self.col_alive[j]: continue
+            if self.ub[j] - self.lb[j] <= self.tol:
+                self._fix_col(j, self.lb[j]); changed = True
+            elif not self.cols[j]:
+                # Coluna vazia: vai para o limite favorável, se ele for finito
+                gain = self.sign * self.c[j]
+                if gain > 0: best = self.ub[j]
+                elif gain < 0: best = self.lb[j]
+                else: best = self.lb[j] if np.isfinite(self.lb[j]) else self.ub[j] if np.isfinite(self.ub[j]) else 0.0
+                if np.isfinite(best):
+                    self._fix_col(j, best, 'empty_cols'); changed = True
+        return changed
+
+    def _duplicate_pass(self):
+        # Linhas múltiplas uma da outra: normaliza pelo primeiro coeficiente e
+        # guarda só a mais apertada de cada sentido (ou a igualdade)
+        groups = defaultdict(list)
+        for i in range(self.m):
+            if not self.row_alive[i] or len(self.rows[i]) < 2: continue
+            row = self.rows[i]
+            j0 = min(row); a0 = row[j0]
+            key = tuple((j, round(row[j] / a0, 12)) for j in sorted(row))
+            groups[key].append((i, FLIP[self.senses[i]] if a0 < 0 else self.senses[i], self.rhs[i] / a0))
+        changed = False
+        for members in groups.values():
+            if len(members) < 2: continue
+            eq = [m for m in members if m[1] == '=']
+            le = min((m for m in members if m[1] == '<='), key=lambda m: m[2], default=None)
+            ge = max((m for m in members if m[1] == '>='), key=lambda m: m[2], default=None)
+            lo = ge[2] if ge else -np.inf; hi = le[2] if le else np.inf
+            if eq:
+                v = eq[0][2]
+                if any(abs(m[2] - v) > self.tol * max(1.0, abs(v)) for m in eq) or v < lo - self.tol or v > hi + self.tol:
+                    self.status = 'infeasible'; return False
+                keep = {eq[0][0]}
+            else:
+                if lo > hi + self.tol * max(1.0, abs(hi)): self.status = 'infeasible'; return False
+                keep = {m[0] for m in (le, ge) if m is not None}
+            for i, _, _ in members:
+                if i not in keep: self._drop_row(i, 'duplicate_rows'); changed = True
+        return changed
+
+    # --- ESCALA POR POTÊNCIAS DE 2 (MÉDIA GEOMÉTRICA) ---
+    def _scale_factors(self, rows, cols, col_scaling):
+        R = np.ones(len(rows)); C = np.ones(len(cols))
+        if not self.scale: return R, C
+        col_index = {j: k for k, j in enumerate(cols)}
+        for _ in range(3):
+            for r, i in enumerate(rows):
+                vals = [abs(a) * C[col_index[j]] for j, a in self.rows[i].items()]
+                if vals: R[r] = 2.0 ** -round(math.log2(math.sqrt(max(vals) * min(vals))))
+            if not col_scaling: break
+            col_vals = defaultdict(list)
+            for r, i in enumerate(rows):
+                for j, a in self.rows[i].items(): col_vals[col_index[j]].append(abs(a) * R[r])
+            for k, vals in col_vals.items():
+                C[k] = 2.0 ** -round(math.log2(math.sqrt(max(vals) * min(vals))))
+        return R, C
+
+    # --- EXECUÇÃO ---
+    def run(self):
+        for _ in range(self.max_passes):
+            changed = self._col_pass()
+            if self.status is None: changed |= self._row_pass()
+            if self.status is None: changed |= self._duplicate_pass()
+            if self.status is not None or not changed: break
+        if self.status is not None: return None
+
+        self.row_map = [i for i in range(self.m) if self.row_alive[i]]
+        self.col_map = [j for j in range(self.n) if self.col_alive[j]]
+        if not self.row_map and any(self.sign * self.c[j] != 0 for j in self.col_map):
+            # Nenhuma restrição sobrou: sobra só uma coluna vazia com limite favorável infinito
+            self.status = 'unbounded'; return None
+        if not self.col_map: return None
+
+        # Escalar colunas muda as variáveis: fica de fora com inteiros e no caso 2D (gráfico)
+        col_scaling = not self.integer and len(self.col_map) != 2
+        self.R, self.C = self._scale_factors(self.row_map, self.col_map, col_scaling)
+        # Fixações e singletons podem deixar b < 0: a linha entra multiplicada
+        # por -1 (sentido invertido), pois os métodos de tableau partem de b >= 0
+        for r, i in enumerate(self.row_map):
+            if self.rhs[i] < 0: self.R[r] = -self.R[r]
+        col_index = {j: k for k, j in enumerate(self.col_map)}
+        coo_r, coo_c, coo_v = [], [], []
+        for r, i in enumerate(self.row_map):
+            for j, a in self.rows[i].items():
+                coo_r.append(r); coo_c.append(col_index[j]); coo_v.append(a * self.R[r] * self.C[col_index[j]])
+        A = SparseMatrix.from_coo(coo_r, coo_c, coo_v, (len(self.row_map), len(self.col_map)))
+        senses = [FLIP[self.senses[i]] if self.R[r] < 0 else self.senses[i] for r, i in enumerate(self.row_map)]
+        rhs = [self.rhs[i] * self.R[r] for r, i in enumerate(self.row_map)]
+        c = [self.c[j] * self.C[k] for k, j in enumerate(self.col_map)]
+        bounds = None
+        lb = [self.lb[j] / self.C[k] for k, j in enumerate(self.col_map)]
+        ub = [self.ub[j] / self.C[k] for k, j in enumerate(self.col_map)]
+        if any(v != 0 for v in lb) or any(np.isfinite(v) for v in ub):
+            bounds = [(None if not np.isfinite(lo) else lo, None if not np.isfinite(hi) else hi) for lo, hi in zip(lb, ub)]
+        cls = type(self.solver)
+        if self.solver.is_sparse:
+            return cls.from_sparse(c, A, senses, rhs, self.solver.objective, bounds)
+        dense = A.todense()
+        return cls(c, [(dense[r].tolist(), senses[r], rhs[r]) for r in range(len(senses))], self.solver.objective, bounds)
+
+    def summary(self):
+        return {'rows': [self.m, len(self.row_map)], 'cols': [self.n, len(self.col_map)], **self.stats}
+
+    # --- PÓS-PROCESSAMENTO ---
+    def postsolve_values(self, x_red, y_red=None, exact=False):
+        # Valores brutos do modelo reduzido (float, ou Fraction no modo exato)
+        # voltam às variáveis e linhas originais; sem y_red, só o primal
+        num = to_exact if exact else float
+        x = [num(0)] * self.n
+        for j, v in self.fixed.items(): x[j] = num(v)
+        for k, j in enumerate(self.col_map): x[j] = num(x_red[k]) * num(self.C[k])
+        z = sum((num(self.c[j]) * v for j, v in enumerate(x)), num(0))
+        if y_red is None: return x, None, z
+        y = [num(0)] * self.m
+        for r, i in enumerate(self.row_map): y[i] = num(y_red[r]) * num(self.R[r])
+        # Linhas singleton, da última para a primeira: o dual vem do custo
+        # reduzido d_j = c_j - Σ a_ij·y_i quando o limite criado por ela é o ativo
+        for _, i, j, a in reversed(self.log):
+            col = self.A.column(j)
+            d = num(self.c[j]) - sum((num(col[k]) * y[k] for k in np.flatnonzero(col)), num(0))
+            side = self.ub_row if self.sign * d > 0 else self.lb_row
+            if side.get(j) == i: y[i] = d / num(a)
+        return x, y, z
@@ -0,0 +1,376 @@
+import numpy as np
+from .sparse import SparseMatrix
+
+
+# --- FATORAÇÃO LU DA BASE (FORMA PRODUTO + REFATORAÇÃO PERIÓDICA) ---
+class LUFactor:
+    def __init__(self, B, refactor_every=50):
+        self.refactor_every = refactor_every
+        self.factor(B)
+
+    def factor(self, B):
+        # P·B = L·U com pivoteamento parcial (L com diagonal unitária)
+        m = B.shape[0]
+        U = np.array(B, dtype=float, copy=True)
+        L = np.eye(m)
+        perm = np.arange(m)
+        for k in range(m - 1):
+            p = k + int(np.argmax(np.abs(U[k:, k])))
+            if abs(U[p, k]) < 1e-12: raise np.linalg.LinAlgError("Base singular")
+            if p != k:
+                U[[k, p], :] = U[[p, k], :]
+                L[[k, p], :k] = L[[p, k], :k]
+                perm[[k, p]] = perm[[p, k]]
+            f = U[k+1:, k] / U[k, k]
+            L[k+1:, k] = f
+            U[k+1:, k:] -= np.outer(f, U[k, k:])
+        if m and abs(U[-1, -1]) < 1e-12: raise np.linalg.LinAlgError("Base singular")
+        self.L, self.U, self.perm = L, U, perm
+        self.etas = []
+
+    @property
+    def needs_refactor(self):
+        return len(self.etas) >= self.refactor_every
+
+    def ftran(self, a):
+        # Resolve B·x = a
+        x = np.array(a, dtype=float)[self.perm]
+        L, U = self.L, self.U
+        m = len(x)
+        for k in range(m):
+            if x[k] != 0.0: x[k+1:] -= L[k+1:, k] * x[k]
+        for k in range(m - 1, -1, -1):
+            if x[k] != 0.0:
+                x[k] /= U[k, k]
+                x[:k] -= U[:k, k] * x[k]
+        for r, d in self.etas:
+            xr = x[r] / d[r]
+            if xr != 0.0: x -= d * xr
+            x[r] = xr
+        return x
+
+    def btran(self, c):
+        # Resolve yᵀ·B = cᵀ
+        z = np.array(c, dtype=float)
+        for r, d in reversed(self.etas):
+            z[r] = (z[r] - (z @ d - z[r] * d[r])) / d[r]
+        L, U = self.L, self.U
+        m = len(z)
+        w = z
+        for k in range(m):
+            w[k] /= U[k, k]
+            if w[k] != 0.0: w[k+1:] -= U[k, k+1:] * w[k]
+        for k in range(m - 1, -1, -1):
+            if w[k] != 0.0: w[:k] -= L[k, :k] * w[k]
+        y = np.empty(m)
+        y[self.perm] = w
+        return y
+
+    def update(self, r, d):
+        # Nova base = base antiga com a coluna r trocada; d = B⁻¹·a_entrante
+        self.etas.append((r, np.array(d, dtype=float)))
+
+
+# --- SIMPLEX REVISADO (VARIÁVEIS LÓGICAS IMPLÍCITAS, DUAS FASES) ---
+class RevisedSimplex:
+    # Forma computacional: A·x + I·s = b, lb <= x <= ub, com limites nas
+    # variáveis lógicas s ('<=' -> s >= 0, '>=' -> s <= 0, '=' -> s = 0).
+    # Minimiza cᵀx. A é guardada esparsa; o bloco identidade das lógicas
+    # nunca é montado.
+    def __init__(self, A, b, c, senses, lb=None, ub=None, tol=1e-9, max_iter=None, refactor_every=50, trace=False, monitor=None):
+        self.A = A if isinstance(A, SparseMatrix) else SparseMatrix.from_dense(A)
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.m, self.n = self.A.shape
+        self.tol = tol
+        self.feas_tol = 1e-7
+        self.max_iter = max_iter if max_iter is not None else 50 * (self.m + self.n) + 100
+        self.refactor_every = refactor_every
+
+        n, m = self.n, self.m
+        self.lb = np.concatenate([np.zeros(n) if lb is None else np.asarray(lb, dtype=float), np.zeros(m)])
+        self.ub = np.concatenate([np.full(n, np.inf) if ub is None else np.asarray(ub, dtype=float), np.zeros(m)])
+        for i, s in enumerate(senses):
+            if s == '<=': self.ub[n+i] = np.inf
+            elif s == '>=': self.lb[n+i] = -np.inf
+        self.cost = np.concatenate([self.c, np.zeros(m)])
+        self.iterations = 0
+        # Com trace=True guarda (iteração, fase, entrante, linha que sai) por pivô
+        self.history = [] if trace else None
+        self.monitor = monitor
+        # Corte do B&B (forma de minimização): no simplex dual o objetivo só
+        # cresce, então passar do corte já poda o nó sem terminar o LP
+        self.cutoff = None
+
+    # Coluna j da matriz [A | I], gerada sob demanda
+    def _column(self, j):
+        if j < self.n: return self.A.column(j)
+        e = np.zeros(self.m); e[j - self.n] = 1.0
+        return e
+
+    def _basis_matrix(self):
+        B = np.zeros((self.m, self.m))
+        for i, j in enumerate(self.basis):
+            if j < self.n: B[:, i] = self.A.column(j)
+            else: B[j - self.n, i] = 1.0
+        return B
+
+    def _refactor(self):
+        self.lu = LUFactor(self._basis_matrix(), self.refactor_every)
+        self._recompute_basic_values()
+
+    def _recompute_basic_values(self):
+        # x_B = B⁻¹·(b - N·x_N)
+        xn = self.x[:self.n].copy(); xn[self.basis[self.basis < self.n]] = 0.0
+        rhs = self.b - self.A.dot(xn)
+        sl = self.x[self.n:].copy(); sl[self.basis[self.basis >= self.n] - self.n] = 0.0
+        rhs -= sl
+        self.x[self.basis] = self.lu.ftran(rhs)
+
+    def _initial_point(self):
+        n, m = self.n, self.m
+        # Não básicas no limite inferior (ou superior, ou 0 se livres)
+        lo, hi = self.lb[:n], self.ub[:n]
+        self.x = np.zeros(n + m)
+        self.x[:n] = np.where(np.isfinite(lo), lo, np.where(np.isfinite(hi), hi, 0.0))
+        self.basis = np.arange(n, n + m)
+        self.is_basic = np.zeros(n + m, dtype=bool); self.is_basic[self.basis] = True
+        self.lu = LUFactor(np.eye(m), self.refactor_every)
+        self.x[n:] = self.b - self.A.dot(self.x[:n])
+
+    def _reduced_costs(self, cost_B, cost):
+        y = self.lu.btran(cost_B)
+        d = np.empty(self.n + self.m)
+        d[:self.n] = cost[:self.n] - self.A.tdot(y)
+        d[self.n:] = cost[self.n:] - y
+        return y, d
+
+    def _choose_entering(self, d):
+        # Dantzig: maior violação de otimalidade respeitando a direção permitida
+        x, lb, ub, tol = self.x, self.lb, self.ub, self.tol
+        can_up = (d < -tol) & (x < ub - tol)
+        can_down = (d > tol) & (x > lb + tol)
+        score = np.where(can_up | can_down, np.abs(d), 0.0)
+        score[self.is_basic] = 0.0
+        q = int(np.argmax(score))
+        if score[q] <= 0.0: return -1, 0
+        return q, (1 if can_up[q] else -1)
+
+    def _ratio_test(self, q, direction, alpha, phase1):
+        # Passo máximo antes que uma básica viável atinja um limite; na fase 1,
+        # básicas inviáveis param no primeiro limite que as torna viáveis
+        tol, ftol = self.tol, self.feas_tol
+        xb = self.x[self.basis]; lbb = self.lb[self.basis]; ubb = self.ub[self.basis]
+        delta = -direction * alpha  # variação de x_B por unidade de passo
+        theta = np.full(self.m, np.inf); target = np.zeros(self.m)
+
+        dec = delta < -tol
+        below = xb < lbb - ftol; above = xb > ubb + ftol
+        m1 = dec & ~below & ~above & np.isfinite(lbb)
+        theta[m1] = (xb[m1] - lbb[m1]) / -delta[m1]; target[m1] = lbb[m1]
+        if phase1:
+            m2 = dec & above
+            theta[m2] = (xb[m2] - ubb[m2]) / -delta[m2]; target[m2] = ubb[m2]
+
+        inc = delta > tol
+        m3 = inc & ~below & ~above & np.isfinite(ubb)
+        theta[m3] = (ubb[m3] - xb[m3]) / delta[m3]; target[m3] = ubb[m3]
+        if phase1:
+            m4 = inc & below
+            theta[m4] = (lbb[m4] - xb[m4]) / delta[m4]; target[m4] = lbb[m4]
+
+        theta = np.maximum(theta, 0.0)
+        r = -1; step = np.inf
+        if np.isfinite(theta).any():
+            step = theta.min()
+            # Empate: prefere o maior pivô em módulo (mais estável)
+            ties = np.where(theta <= step + tol)[0]
+            r = int(ties[np.argmax(np.abs(alpha[ties]))])
+        flip = self.ub[q] - self.lb[q]
+        if flip < step: return -1, flip, 0.0
+        return r, step, (target[r] if r >= 0 else 0.0)
+
+    def _pivot(self, q, direction, alpha, r, step, target):
+        self.x[q] += direction * step
+        self.x[self.basis] -= direction * step * alpha
+        if r < 0: return
+        leaving = self.basis[r]
+        self.x[leaving] = target
+        self.basis[r] = q
+        self.is_basic[leaving] = False; self.is_basic[q] = True
+        self.lu.update(r, alpha)
+        if self.lu.needs_refactor: self._refactor()
+
+    def _infeasibility(self):
+        xb = self.x[self.basis]; lbb = self.lb[self.basis]; ubb = self.ub[self.basis]
+        return np.maximum(lbb - xb, 0.0).sum() + np.maximum(xb - ubb, 0.0).sum()
+
+    def _run_phase(self, phase1):
+        while True:
+            if self.iterations >= self.max_iter: return 'iteration_limit'
+            if self.monitor is not None: self.monitor.tick(iteration=self.iterations)
+            if phase1:
+                xb = self.x[self.basis]
+                cost_B = np.where(xb < self.lb[self.basis] - self.feas_tol, -1.0,
+                         np.where(xb > self.ub[self.basis] + self.feas_tol, 1.0, 0.0))
+                if not cost_B.any(): return 'optimal'
+                cost = np.zeros(self.n + self.m)
+            else:
+                cost = self.cost; cost_B = cost[self.basis]
+            _, d = self._reduced_costs(cost_B, cost)
+            q, direction = self._choose_entering(d)
+            if q < 0: return 'infeasible' if phase1 else 'optimal'
+            alpha = self.lu.ftran(self._column(q))
+            r, step, target = self._ratio_test(q, direction, alpha, phase1)
+            if not np.isfinite(step): return 'unbounded'
+            self._pivot(q, direction, alpha, r, step, target)
+            self.iterations += 1
+            if self.history is not None: self.history.append((self.iterations, 'Fase 1' if phase1 else 'Fase 2', q, r))
+
+    # --- SIMPLEX DUAL (REOTIMIZAÇÃO A PARTIR DE UMA BASE DUAL-VIÁVEL) ---
+    def _is_dual_feasible(self, d):
+        tol = self.tol * 1e3
+        x, lb, ub = self.x, self.lb, self.ub
+        nb = ~self.is_basic
+        at_lb = nb & np.isclose(x, lb) & (ub > lb)
+        at_ub = nb & np.isclose(x, ub) & (ub > lb)
+        free = nb & ~at_lb & ~at_ub & (ub > lb)
+        return not ((at_lb & (d < -tol)).any() or (at_ub & (d > tol)).any() or (free & (np.abs(d) > tol)).any())
+
+    def _run_dual(self):
+        ftol = self.feas_tol
+        while True:
+            if self.iterations >= self.max_iter: return 'iteration_limit'
+            if self.monitor is not None: self.monitor.tick(iteration=self.iterations)
+            xb = self.x[self.basis]; lbb = self.lb[self.basis]; ubb = self.ub[self.basis]
+            viol = np.maximum(lbb - xb, 0.0) + np.maximum(xb - ubb, 0.0)
+            r = int(np.argmax(viol))
+            if viol[r] <= ftol: return 'optimal'
+            if self.cutoff is not None and self.cost[:self.n] @ self.x[:self.n] > self.cutoff + 1e-9 * max(1.0, abs(self.cutoff)):
+                return 'cutoff'
+            if not self._dual_pivot(r, xb[r] < lbb[r]): return 'infeasible'
+            self.iterations += 1
+            if self.history is not None: self.history.append((self.iterations, 'Dual', int(self.basis[r]), r))
+
+    def _dual_pivot(self, r, to_lower):
+        # Tira da base a variável da linha r, levando-a ao limite inferior
+        # (to_lower) ou superior; False se nenhuma não básica pode entrar
+        tol = self.tol
+        target = self.lb[self.basis[r]] if to_lower else self.ub[self.basis[r]]
+        _, d = self._reduced_costs(self.cost[self.basis], self.cost)
+        e = np.zeros(self.m); e[r] = 1.0
+        rho = self.lu.btran(e)
+        alpha_r = np.concatenate([self.A.tdot(rho), rho])
+
+        # Elegíveis: variáveis não básicas cujo movimento leva x_B[r] ao limite violado
+        x, lb, ub = self.x, self.lb, self.ub
+        movable = ~self.is_basic & (ub > lb)
+        can_up = movable & (x < ub - tol); can_down = movable & (x > lb + tol)
+        sgn = 1.0 if to_lower else -1.0
+        elig = (can_up & (sgn * alpha_r < -tol)) | (can_down & (sgn * alpha_r > tol))
+        if not elig.any(): return False
+        ratios = np.full(self.n + self.m, np.inf)
+        ratios[elig] = np.abs(d[elig]) / np.abs(alpha_r[elig])
+        best = ratios.min()
+        ties = np.where(ratios <= best + tol)[0]
+        q = int(ties[np.argmax(np.abs(alpha_r[ties]))])
+
+        alpha = self.lu.ftran(self._column(q))
+        step = (self.x[self.basis[r]] - target) / alpha[r]
+        self.x[q] += step
+        self.x[self.basis] -= step * alpha
+        leaving = self.basis[r]
+        self.x[leaving] = target
+        self.basis[r] = q
+        self.is_basic[leaving] = False; self.is_basic[q] = True
+        self.lu.update(r, alpha)
+        if self.lu.needs_refactor: self._refactor()
+        return True
+
+    def _load_basis(self, basis, x):
+        # Base inicial fornecida (ex.: base ótima do nó pai). As não básicas vão
+        # para o limite mais próximo do valor anterior.
+        n, m = self.n, self.m
+        self.basis = np.array(basis, dtype=np.int64)
+        self.is_basic = np.zeros(n + m, dtype=bool); self.is_basic[self.basis] = True
+        prev = np.zeros(n + m)
+        if x is not None: prev[:len(x)] = x[:n + m]
+        lo, hi = self.lb, self.ub
+        self.x = np.where(np.isfinite(lo) & np.isfinite(hi),
+                          np.where(np.abs(prev - lo) <= np.abs(prev - hi), lo, hi),
+                          np.where(np.isfinite(lo), lo, np.where(np.isfinite(hi), hi, 0.0)))
+        self._refactor()
+
+    def solve(self, basis=None, x=None):
+        status = None
+        if (self.lb[:self.n] > self.ub[:self.n] + self.feas_tol).any():
+            # Limites contraditórios: nada a pivotar
+            basis, status = None, 'infeasible'
+            self._initial_point()
+        if basis is not None:
+            try:
+                self._load_basis(basis, x)
+                if self._infeasibility() <= self.feas_tol:
+                    status = self._run_phase(phase1=False)
+                else:
+                    _, d = self._reduced_costs(self.cost[self.basis], self.cost)
+                    if self._is_dual_feasible(d): status = self._run_dual()
+                    else: status = self._run_primal_from_current()
+            except np.linalg.LinAlgError:
+                status = None
+        if status is None:
+            self._initial_point()
+            status = self._run_primal_from_current()
+        return self._finish(status)
+
+    def _finish(self, status):
+        self.status = status
+        self._refactor()
+        self.y = self.lu.btran(self.cost[self.basis])
+        self.z = float(self.cost[:self.n] @ self.x[:self.n])
+        return status
+
+    # --- SIMPLEX DUAL A FRIO (BASE DAS LÓGICAS + LIMITES ARTIFICIAIS) ---
+    # Com a base das lógicas, y = 0 e d = c: cada estrutural vai para o limite
+    # que o sinal de d pede. Sem esse limite, ganha um provisório (caixa) e a
+    # base fica dual-viável sem colunas artificiais nem Big M. O dual resolve
+    # o problema na caixa; os limites provisórios saem e o primal (fase 2)
+    # termina se alguma variável parou neles (ou prova que é ilimitado).
+    def solve_dual(self, box=None):
+        n = self.n
+        self.artificial_bounds = 0
+        self.dual_iterations = 0
+        if (self.lb[:n] > self.ub[:n] + self.feas_tol).any():
+            self._initial_point()
+            return self._finish('infeasible')
+        if box is None: box = 1e3 * max(1.0, np.abs(self.b).max(initial=0.0))
+        lb, ub = self.lb.copy(), self.ub.copy()
+        c = self.cost[:n]
+        low = (c < -self.tol) & ~np.isfinite(ub[:n])
+        high = (c > self.tol) & ~np.isfinite(lb[:n])
+        self.ub[:n][low] = np.where(np.isfinite(lb[:n][low]), lb[:n][low], 0.0) + box
+        self.lb[:n][high] = np.where(np.isfinite(ub[:n][high]), ub[:n][high], 0.0) - box
+        self.artificial_bounds = int(low.sum() + high.sum())
+        self._initial_point()
+        self.x[:n] = np.where(c < -self.tol, self.ub[:n], self.x[:n])
+        self.x[:n] = np.where(c > self.tol, self.lb[:n], self.x[:n])
+        self.x[n:] = self.b - self.A.dot(self.x[:n])
+        status = self._run_dual()
+        self.dual_iterations = self.iterations
+        self.lb, self.ub = lb, ub
+        if status == 'infeasible' and self.artificial_bounds:
+            # A caixa pode ter cortado todos os pontos viáveis: decide pelo primal
+            status = self._run_primal_from_current()
+        elif status == 'optimal':
+            status = self._run_phase(phase1=False)
+        return self._finish(status)
+
+    def _run_primal_from_current(self):
+        status = self._run_phase(phase1=True)
+        if status == 'optimal' and self._infeasibility() > self.feas_tol: status = 'infeasible'
+        if status == 'optimal': status = self._run_phase(phase1=False)
+        return status
+
+    @property
+    def primal(self):
+        return self.x[:self.n].copy()
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+# --- ANÁLISE DE SENSIBILIDADE A PARTIR DA BASE ÓTIMA ---
+# Trabalha sobre um RevisedSimplex já resolvido (forma do motor: minimiza
+# c'ᵀx com c' = -sign·c). Tudo sai de B⁻¹ (ftran/btran), sem novas resoluções;
+# a varredura paramétrica do RHS anda de base em base com pivôs do simplex dual.
+class SensitivityAnalysis:
+    def __init__(self, engine, objective='max', fmt=str):
+        self.engine = engine
+        self.sign = -1 if objective == 'min' else 1
+        self.fmt = fmt
+        self.tol = 1e-9
+
+    def _num(self, v):
+        # Infinito -> None (sem limite)
+        return None if not np.isfinite(v) else self.fmt(v)
+
+    def _unit(self, i):
+        u = np.zeros(self.engine.m); u[i] = 1.0
+        return u
+
+    def _reduced_costs(self):
+        e = self.engine
+        return e._reduced_costs(e.cost[e.basis], e.cost)[1]
+
+    def _nonbasic_sets(self):
+        e = self.engine
+        nb = ~e.is_basic & (e.ub > e.lb)
+        at_lb = nb & np.isclose(e.x, e.lb)
+        at_ub = nb & ~at_lb & np.isclose(e.x, e.ub)
+        return at_lb, at_ub, nb & ~at_lb & ~at_ub
+
+    # --- CUSTOS: INTERVALO EM QUE A BASE ATUAL SEGUE ÓTIMA ---
+    def cost_ranges(self):
+        e, tol = self.engine, self.tol
+        d = self._reduced_costs()
+        at_lb, at_ub, free = self._nonbasic_sets()
+        row_of = {int(j): r for r, j in enumerate(e.basis)}
+        out = {}
+        for j in range(e.n):
+            if j in row_of:
+                # Básica: c'_j + δ muda d_k em -δ·α_rk para cada não básica k
+                rho = e.lu.btran(self._unit(row_of[j]))
+                alpha = np.concatenate([e.A.tdot(rho), rho])
+                up = (at_lb & (alpha > tol)) | (at_ub & (alpha < -tol)) | (free & (np.abs(alpha) > tol))
+                down = (at_lb & (alpha < -tol)) | (at_ub & (alpha > tol)) | (free & (np.abs(alpha) > tol))
+                ratio = np.abs(d) / np.maximum(np.abs(alpha), tol)
+                inc = ratio[up].min() if up.any() else np.inf
+                dec = ratio[down].min() if down.any() else np.inf
+            elif at_lb[j]: inc, dec = np.inf, max(d[j], 0.0)
+            elif at_ub[j]: inc, dec = max(-d[j], 0.0), np.inf
+            elif free[j]: inc, dec = 0.0, 0.0
+            else: inc, dec = np.inf, np.inf  # variável fixa
+            # Volta para o sentido original (c = -sign·c')
+            if self.sign == 1: inc, dec = dec, inc
+            out[f'x{j+1}'] = {
+                'value': self._num(-self.sign * e.c[j]),
+                'reduced_cost': self._num(0.0 if j in row_of else -self.sign * d[j]),
+                'allowable_increase': self._num(inc),
+                'allowable_decrease': self._num(dec),
+            }
+        return out
+
+    # --- RHS: INTERVALO EM QUE A BASE ATUAL SEGUE VIÁVEL ---
+    def _step_limits(self, w):
+        # Maior passo em +w e em -w antes que uma básica saia dos limites
+        e, tol = self.engine, self.tol
+        xb = e.x[e.basis]; lbb = e.lb[e.basis]; ubb = e.ub[e.basis]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pos, neg = w > tol, w < -tol
+            up = np.concatenate([((ubb - xb) / w)[pos], ((lbb - xb) / w)[neg]])
+            down = np.concatenate([((xb - lbb) / w)[pos], ((xb - ubb) / w)[neg]])
+        up = np.maximum(up[np.isfinite(up)], 0.0); down = np.maximum(down[np.isfinite(down)], 0.0)
+        return (up.min() if len(up) else np.inf), (down.min() if len(down) else np.inf)
+
+    def _duals(self):
+        e = self.engine
+        return e.lu.btran(e.cost[e.basis])
+
+    def rhs_ranges(self):
+        e = self.engine
+        y = self._duals()
+        out = {}
+        for i in range(e.m):
+            inc, dec = self._step_limits(e.lu.ftran(self._unit(i)))
+            out[f'r{i+1}'] = {
+                'rhs': self._num(e.b[i]),
+                'shadow_price': self._num(-self.sign * y[i]),
+                'allowable_increase': self._num(inc),
+                'allowable_decrease': self._num(dec),
+            }
+        return out
+
+    def report(self):
+        return {'objective_ranges': self.cost_ranges(), 'rhs_ranges': self.rhs_ranges()}
+
+    # --- RHS PARAMÉTRICO: b(θ) = b + θ·Δb, 0 <= θ <= theta_max ---
+    def _z(self):
+        e = self.engine
+        return -self.sign * float(e.cost[:e.n] @ e.x[:e.n])
+
+    def parametric_rhs(self, direction, theta_max):
+        e = self.engine
+        direction = np.asarray(direction, dtype=float)
+        if direction.shape != (e.m,): raise ValueError("'direction' deve ter um valor por restrição")
+        theta_max = float(theta_max)
+        if theta_max < 0: raise ValueError("'theta_max' deve ser não negativo")
+        b0 = e.b.copy()
+        theta, segments, status = 0.0, [], 'optimal'
+        for _ in range(e.max_iter):
+            w = e.lu.ftran(direction)  # dx_B/dθ
+            step, _ = self._step_limits(w)
+            end = min(theta + step, theta_max)
+            y = self._duals()
+            z_from = self._z()
+            e.x[e.basis] += (end - theta) * w
+            e.b = b0 + end * direction
+            # Pivôs degenerados (passo nulo) não geram segmento
+            if end - theta > self.tol or end >= theta_max: segments.append({
+                'theta_from': self.fmt(theta), 'theta_to': self.fmt(end),
+                'Z_from': self.fmt(z_from), 'Z_to': self.fmt(self._z()),
+                'slope': self.fmt(-self.sign * float(y @ direction)),
+                # Os duais valem em todo o segmento; a solução é a de theta_to
+                'solution': {f'x{j+1}': self.fmt(v) for j, v in enumerate(e.x[:e.n])},
+                'dual_solution': {f'y{i+1}': self.fmt(-self.sign * v) for i, v in enumerate(y)},
+            })
+            theta = end
+            if theta >= theta_max: break
+            # Breakpoint: a básica que atingiu o limite sai por um pivô dual
+            xb = e.x[e.basis]
+            hit = np.where(w < 0, xb - e.lb[e.basis], e.ub[e.basis] - xb) / np.maximum(np.abs(w), self.tol)
+            hit[np.abs(w) <= self.tol] = np.inf
+            r = int(np.argmin(hit))
+            if not e._dual_pivot(r, w[r] < 0):
+                status = 'infeasible'  # para θ além daqui o problema é inviável
+                break
+            e.iterations += 1
+        else:
+            status = 'iteration_limit'
+        e.b = b0
+        return {'direction': [self.fmt(v) for v in direction], 'theta_max': self.fmt(theta_max),
+                'status': status, 'segments': segments}
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# --- MATRIZ ESPARSA (CSR COM VISÃO CSC SOB DEMANDA) ---
+class SparseMatrix:
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=float)
+        self.shape = (int(shape[0]), int(shape[1]))
+        # Índice da linha de cada não-nulo (usado nos produtos vetorizados)
+        self.row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        self._csc = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        rows = np.asarray(rows, dtype=np.int64); cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        m, n = shape
+        if len(rows) != len(cols) or len(rows) != len(values):
+            raise ValueError("Triplas COO com tamanhos diferentes")
+        if len(rows) and (rows.min() < 0 or rows.max() >= m or cols.min() < 0 or cols.max() >= n):
+            raise ValueError("Índice fora da matriz")
+        # Ordena por (linha, coluna) e soma entradas repetidas
+        order = np.lexsort((cols, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        if len(rows):
+            key = rows * n + cols
+            first = np.concatenate([[True], key[1:] != key[:-1]])
+            values = np.add.reduceat(values, np.where(first)[0])
+            rows, cols = rows[first], cols[first]
+        keep = values != 0.0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+        indptr = np.zeros(m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=m), out=indptr[1:])
+        return cls(indptr, cols, values, shape)
+
+    @classmethod
+    def from_rows(cls, rows, n):
+        # rows: lista de (índices, valores) por restrição
+        r = [np.full(len(idx), i) for i, (idx, _) in enumerate(rows)]
+        c = [np.asarray(idx, dtype=np.int64) for idx, _ in rows]
+        v = [np.asarray(val, dtype=float) for _, val in rows]
+        cat = lambda parts, dt: np.concatenate(parts).astype(dt) if parts else np.zeros(0, dt)
+        return cls.from_coo(cat(r, np.int64), cat(c, np.int64), cat(v, float), (len(rows), n))
+
+    @classmethod
+    def from_dense(cls, A):
+        A = np.atleast_2d(np.asarray(A, dtype=float))
+        rows, cols = np.nonzero(A)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    def vstack_rows(self, rows):
+        # Nova matriz com linhas extras (índices, valores) anexadas ao fim;
+        # os arrays originais não são alterados
+        if not rows: return self
+        idx = [np.asarray(i, dtype=np.int64) for i, _ in rows]
+        val = [np.asarray(v, dtype=float) for _, v in rows]
+        lens = np.array([len(i) for i in idx], dtype=np.int64)
+        indptr = np.concatenate([self.indptr, self.indptr[-1] + np.cumsum(lens)])
+        return SparseMatrix(indptr, np.concatenate([self.indices] + idx), np.concatenate([self.data] + val),
+                            (self.shape[0] + len(rows), self.shape[1]))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def _build_csc(self):
+        order = np.lexsort((self.row_ids, self.indices))
+        colptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=colptr[1:])
+        self._csc = (colptr, self.row_ids[order], self.data[order])
+
+    def dot(self, x):
+        # A·x
+        return np.bincount(self.row_ids, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    def tdot(self, y):
+        # Aᵀ·y
+        return np.bincount(self.indices, weights=self.data * y[self.row_ids], minlength=self.shape[1])
+
+    def column(self, j):
+        if self._csc is None: self._build_csc()
+        colptr, rows, vals = self._csc
+        col = np.zeros(self.shape[0])
+        col[rows[colptr[j]:colptr[j+1]]] = vals[colptr[j]:colptr[j+1]]
+        return col
+
+    def row(self, i):
+        a, b = self.indptr[i], self.indptr[i+1]
+        return self.indices[a:b], self.data[a:b]
+
+    def todense(self):
+        A = np.zeros(self.shape)
+        A[self.row_ids, self.indices] = self.data
+        return A
@@ -1,2 +1,774 @@
+import base64
+import gzip
+import io
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from fractions import Fraction
+from unittest import mock
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from PIL import Image as PILImage
+from . import branch_and_bound
+from .batch import _solve_chunk, expand_batch
+from .batched import BatchedSimplex, fraction_strs
+from .benchmark import applicable, build_corpus, compare
+from .cache import cached_solve, get_result_cache, problem_key
+from .exact import ExactSimplex
+from .graph_renderer import GraphRenderer
+from .jobs import JobManager, _run_job
+from .main_solver import LPSolver, fraction_str
+from .metrics import get_metrics_registry
+from .model_io import model_to_mps, read_model, write_mps
+from .payload import build_solver
+from .pivoting import PRICING_RULES
 
+
+# --- MODELOS COM ÓTIMO CONHECIDO ---
+# (custos, restrições, sentido, Z ótimo); o inteiro vem de enumeração
+WYNDOR = ([3, 5], [([1, 0], '<=', 4), ([0, 2], '<=', 12), ([3, 2], '<=', 18)], 'max', '36')
+DIET = ([2, 3, 4], [([1, 1, 1], '>=', 2), ([1, 2, 0], '<=', 5), ([0, 1, 3], '=', 3)], 'min', '6')
+INTEGER_MODELS = [
+    ([5, 8], [([1, 1], '<=', 6), ([5, 9], '<=', 45)], 'max', '40'),
+    ([12, 7, 9, 11, 6], [([4, 3, 5, 6, 2], '<=', 12), ([2, 4, 1, 3, 5], '<=', 10)], 'max', '36'),
+]
+
+
+def _payload(model, **extra):
+    # Modelo como JSON do /api/solve/ (coeficientes densos)
+    c, constraints, objective = model[:3]
+    return {'objective_function': c, 'objective': objective, 'graph_format': 'none', **extra,
+            'constraints': [{'coefficients': a, 'sign': s, 'rhs': r} for a, s, r in constraints]}
+
+
+# --- HISTÓRICO DE ITERAÇÕES ---
+class TraceTests(TestCase):
+    def test_levels(self):
+        for method in ('simplex', 'two_phase', 'big_m', 'revised_simplex', 'dual'):
+            self.assertNotIn('iterations', LPSolver(*WYNDOR[:3]).solve(method=method, graph_format='none')[1], method)
+            summary = LPSolver(*WYNDOR[:3]).solve(method=method, graph_format='none', trace='summary')[1]['iterations']
+            self.assertTrue(summary and all('rows' not in step for step in summary), method)
+        # 'full' traz os mesmos passos, agora com o tableau de cada um
+        summary = LPSolver(*WYNDOR[:3]).solve(method='simplex', graph_format='none', trace='summary')[1]['iterations']
+        full = LPSolver(*WYNDOR[:3]).solve(method='simplex', graph_format='none', trace='full')[1]['iterations']
+        self.assertEqual([step['pivot_info'] for step in full], [step['pivot_info'] for step in summary])
+        self.assertEqual(full[-1]['rows'][0]['values'][-1], '36')
+
+    def test_unknown_level(self):
+        status, sol = LPSolver(*WYNDOR[:3]).solve(graph_format='none', trace='tudo')
+        self.assertEqual(status, 'Erro')
+        self.assertIn('tudo', sol['error'])
+
+
+# --- REGRAS DE PIVOTEAMENTO ---
+class PricingTests(TestCase):
+    # Exemplo de Beale: cicla com Dantzig e sem anticiclagem
+    BEALE = ([0.75, -20, 0.5, -6], [([0.25, -8, -1, 9], '<=', 0), ([0.5, -12, -0.5, 3], '<=', 0), ([0, 0, 1, 0], '<=', 1)])
+
+    def test_rules_escape_cycling(self):
+        for pricing in PRICING_RULES:
+            for method in ('simplex', 'two_phase', 'big_m'):
+                status, sol = LPSolver(*self.BEALE).solve(method=method, graph_format='none', pricing=pricing)
+                self.assertEqual((status, sol['Z']), ('Ótimo encontrado.', '5/4'), (pricing, method))
+
+    def test_unbounded_keeps_tableau_internal(self):
+        for method in ('two_phase', 'big_m', 'simplex'):
+            status, sol = LPSolver([1, 1], [([1, -1], '<=', 1), ([-1, 1], '<=', 2)]).solve(method=method, graph_format='none')
+            self.assertEqual(status, 'Ilimitada', method)
+            self.assertFalse({'tableau', 'basis'} & set(sol), method)
+
+    def test_unknown_rule(self):
+        status, sol = LPSolver(*self.BEALE).solve(method='simplex', graph_format='none', pricing='maior')
+        self.assertEqual(status, 'Erro')
+        self.assertIn('maior', sol['error'])
+
+
+# --- SIMPLEX REVISADO ---
+class RevisedSimplexTests(TestCase):
+    def test_matches_tableau_on_random_lps(self):
+        rng = np.random.default_rng(11)
+        for _ in range(30):
+            m, n = rng.integers(2, 7), rng.integers(2, 7)
+            A, b, c = rng.integers(-2, 9, (m, n)), rng.integers(1, 30, m), rng.integers(-4, 10, n)
+            constraints = [(list(A[i]), sign, int(b[i])) for i, sign in enumerate(rng.choice(['<=', '>='], m, p=[.7, .3]))]
+            status, revised = LPSolver(list(c), constraints).solve(method='revised_simplex', graph_format='none')
+            _, tableau = LPSolver(list(c), constraints).solve(method='two_phase', graph_format='none')
+            self.assertEqual('error' in revised, 'error' in tableau)
+            if 'error' not in revised: self.assertEqual(revised['Z'], tableau['Z'])
+
+    def test_warm_start_reuses_the_basis(self):
+        first = LPSolver(*WYNDOR[:3])
+        first.solve(method='revised_simplex', graph_format='none')
+        # Mudou c: a base ótima anterior continua ótima, sem nenhum pivô
+        second = LPSolver([3, 6], *WYNDOR[1:3])
+        second.warm_start = first.warm_start
+        _, sol = second.solve(method='revised_simplex', graph_format='none')
+        self.assertEqual((sol['Z'], second.counters['pivots']), ('42', 0))
+
+
+# --- VARIÁVEIS LIMITADAS ---
+class BoundsTests(TestCase):
+    def test_bounds_match_explicit_rows(self):
+        # Wyndor com x1 <= 4 e 2x2 <= 12 como limites das variáveis
+        bounds = [[0, 4], [0, 6]]
+        for method in ('revised_simplex', 'dual', 'interior_point', 'two_phase', 'branch_and_bound'):
+            _, sol = LPSolver([3, 5], [([3, 2], '<=', 18)], bounds=bounds).solve(method=method, graph_format='none')
+            self.assertEqual(sol['Z'], '36', method)
+
+    def test_negative_and_free_bounds(self):
+        for method in ('revised_simplex', 'dual'):
+            _, sol = LPSolver([1, -1], [([1, 1], '<=', 9)], 'min', bounds=[[-3, None], [None, 2]]).solve(
+                method=method, graph_format='none')
+            self.assertEqual((sol['x1'], sol['x2'], sol['Z']), ('-3', '2', '-5'), method)
+        status, _ = LPSolver([1, -1], [([1, 1], '<=', 9)], 'min', bounds=[[-3, None], [0, 2]]).solve(
+            method='two_phase', graph_format='none')
+        self.assertEqual(status, 'Método inválido')
+
+    def test_branch_and_bound_respects_bounds(self):
+        _, sol = LPSolver([5, 8], [([5, 9], '<=', 45)], bounds=[[0, 6], [0, 2]]).solve(method='branch_and_bound',
+                                                                                      graph_format='none', max_depth=30)
+        grid = [(x1, x2) for x1 in range(7) for x2 in range(3) if 5 * x1 + 9 * x2 <= 45]
+        self.assertEqual(Fraction(sol['Z']), max(5 * x1 + 8 * x2 for x1, x2 in grid))
+        self.assertLessEqual(int(sol['integer_solution']['x2']), 2)
+
+
+# --- PONTOS INTERIORES ---
+class InteriorPointTests(TestCase):
+    def test_known_optima_with_and_without_crossover(self):
+        for c, constraints, objective, z in (WYNDOR, DIET):
+            for crossover in (True, False):
+                status, sol = LPSolver(c, constraints, objective).solve(method='interior_point', graph_format='none',
+                                                                        crossover=crossover)
+                self.assertEqual((status, sol['Z']), ('Ótimo encontrado.', z), crossover)
+                self.assertTrue(sol['interior_point']['converged'])
+                self.assertEqual(sol['interior_point']['crossover'], crossover)
+
+    def test_infeasible(self):
+        status, _ = LPSolver([1, 1], [([1, 1], '<=', 1), ([1, 1], '>=', 3)]).solve(method='interior_point', graph_format='none')
+        self.assertEqual(status, 'Problema Inviável')
+
+
+# --- ENTRADA ESPARSA ---
+class SparseInputTests(TestCase):
+    def _forms(self, c, constraints, objective):
+        dense = _payload((c, constraints, objective))
+        rows = {**dense, 'constraints': [{'indices': [j for j, v in enumerate(a) if v], 'values': [v for v in a if v],
+                                           'sign': s, 'rhs': r} for a, s, r in constraints]}
+        coo = [(i, j, v) for i, (a, _, _) in enumerate(constraints) for j, v in enumerate(a) if v]
+        matrix = {**dense, 'matrix': dict(zip(('row', 'col', 'data'), map(list, zip(*coo)))),
+                  'constraints': [{'sign': s, 'rhs': r} for _, s, r in constraints]}
+        return dense, rows, matrix
+
+    def test_all_forms_agree(self):
+        for c, constraints, objective, z in (WYNDOR, DIET):
+            forms = [build_solver(p) for p in self._forms(c, constraints, objective)]
+            self.assertEqual(len({problem_key(solver, method='auto') for solver in forms}), 1)
+            for solver in forms:
+                for method in ('auto', 'revised_simplex', 'two_phase'):
+                    self.assertEqual(solver.solve(method=method, graph_format='none')[1]['Z'], z, method)
+
+    def test_sparse_endpoint(self):
+        _, rows, _ = self._forms(*DIET[:3])
+        response = self.client.post('/api/solve/', {**rows, 'cache': False}, content_type='application/json')
+        self.assertEqual(response.json()['solution']['Z'], DIET[3])
+
+
+# --- SIMPLEX EXATO ---
+class ExactSimplexTests(TestCase):
+    def test_negative_pivot_keeps_signs(self):
+        # Tirar a artificial da base pivota em -7: sem normalizar o sinal de d,
+        # o resultado "certificado" violava a primeira restrição
+        engine = ExactSimplex([([-3, 1], '>=', 10), ([4, 1], '<=', 10), ([1, 1], '<=', 30)], [5, -2])
+        self.assertEqual(engine.solve(), 'optimal')
+        self.assertEqual(engine.primal, [0, 10])
+        self.assertEqual(engine.objective_value, -20)
+        self.assertGreater(engine.d, 0)
+
+    def test_matches_revised_simplex(self):
+        constraints = [([-3, 1], '>=', 10), ([4, 1], '<=', 10), ([1, 1], '<=', 30)]
+        for objective in ('max', 'min'):
+            exact = LPSolver([5, -2], constraints, objective).solve(method='exact', graph_format='none')[1]
+            revised = LPSolver([5, -2], constraints, objective).solve(method='revised_simplex', graph_format='none')[1]
+            self.assertEqual(exact['Z'], revised['Z'])
+
+    def test_known_optima(self):
+        for c, constraints, objective, z in (WYNDOR, DIET):
+            for method in ('exact', 'exact_hybrid'):
+                _, sol = LPSolver(c, constraints, objective).solve(method=method, graph_format='none')
+                self.assertEqual(sol['Z'], z, method)
+                self.assertTrue(sol['certificate']['exact'])
+
+
+# --- SENSIBILIDADE ---
+class SensitivityTests(TestCase):
+    def test_wyndor_ranges(self):
+        # Intervalos do livro: c1 em [0, 15/2], c2 >= 2; b1 >= 2, b2 em [6, 18], b3 em [12, 24]
+        for method in ('two_phase', 'revised_simplex'):
+            _, sol = LPSolver(*WYNDOR[:3]).solve(method=method, graph_format='none', sensitivity=True)
+            obj, rhs = sol['sensitivity']['objective_ranges'], sol['sensitivity']['rhs_ranges']
+            self.assertEqual([(obj[v]['allowable_decrease'], obj[v]['allowable_increase']) for v in ('x1', 'x2')],
+                             [('3', '9/2'), ('3', None)], method)
+            self.assertEqual([(r['shadow_price'], r['allowable_decrease'], r['allowable_increase']) for r in rhs.values()],
+                             [('0', '2', None), ('3/2', '6', '6'), ('1', '6', '6')], method)
+
+    def test_parametric_rhs_segments(self):
+        _, sol = LPSolver(*WYNDOR[:3]).solve(method='two_phase', graph_format='none',
+                                              parametric_rhs={'direction': [0, 1, 0], 'theta_max': 10})
+        segments = sol['parametric_rhs']['segments']
+        self.assertEqual([(s['theta_from'], s['theta_to'], s['Z_to'], s['slope']) for s in segments],
+                         [('0', '6', '45', '3/2'), ('6', '10', '45', '0')])
+
+
+# --- SIMPLEX DUAL ---
+class DualSimplexTests(TestCase):
+    def test_known_duals(self):
+        for (c, constraints, objective, z), y in ((WYNDOR, ['0', '3/2', '1']), (DIET, ['2', '0', '2/3'])):
+            status, sol = LPSolver(c, constraints, objective).solve(method='dual', graph_format='none')
+            self.assertEqual((status, sol['Z']), ('Ótimo encontrado.', z))
+            self.assertEqual(list(sol['dual_solution'].values()), y)
+
+    def test_infeasible_and_unbounded(self):
+        status, _ = LPSolver([1, 1], [([1, 1], '<=', 1), ([1, 1], '>=', 3)]).solve(method='dual', graph_format='none')
+        self.assertEqual(status, 'Problema Inviável')
+        status, _ = LPSolver([1, 1], [([1, -1], '<=', 1)]).solve(method='dual', graph_format='none')
+        self.assertEqual(status, 'Ilimitada')
+
+    def test_strong_duality_on_random_lps(self):
+        rng = np.random.default_rng(3)
+        for _ in range(30):
+            m, n = rng.integers(2, 6, size=2)
+            A, b, c = rng.integers(-3, 8, (m, n)), rng.integers(1, 20, m), rng.integers(-5, 9, n)
+            constraints = [(list(A[i]), sign, int(b[i])) for i, sign in enumerate(rng.choice(['<=', '>=', '='], m, p=[.6, .3, .1]))]
+            objective = str(rng.choice(['max', 'min']))
+            status, sol = LPSolver(list(c), constraints, objective).solve(method='dual', graph_format='none')
+            _, ref = LPSolver(list(c), constraints, objective).solve(method='revised_simplex', graph_format='none')
+            self.assertEqual(sol.get('Z'), ref.get('Z'))
+            if 'error' in sol: continue
+            # Z = b·y com os duais devolvidos
+            by = sum(Fraction(y) * int(r) for y, (_, _, r) in zip(sol['dual_solution'].values(), constraints))
+            self.assertEqual(by, Fraction(sol['Z']))
+
+
+# --- PRESOLVE ---
+class PresolveTests(TestCase):
+    # x1 = 3 fixada deixa 5x2 - 2x3 = -3 (b < 0) no modelo reduzido
+    CONSTRAINTS = [([0, -2, 0], '<=', 7), ([5, 5, -2], '=', 12), ([1, 0, 0], '=', 3), ([1, 1, 1], '<=', 30)]
+
+    def test_negative_rhs_after_fixing(self):
+        for method in ('two_phase', 'big_m', 'revised_simplex', 'exact'):
+            _, sol = LPSolver([2, 4, 0], self.CONSTRAINTS, 'min').solve(method=method, presolve=True, graph_format='none')
+            self.assertEqual(sol['Z'], '6', method)
+            self.assertEqual((sol['x1'], sol['x2'], sol['x3']), ('3', '0', '3/2'), method)
+            self.assertEqual(sol['dual_solution']['y3'], '2', method)
+
+    def test_exact_keeps_full_precision(self):
+        # Valores sem fração curta não passam mais por limit_denominator no postsolve
+        constraints = [([3, 7], '<=', 10.123457), ([1, 3], '<=', 4.0001), ([1, 1], '<=', 100)]
+        plain = LPSolver([1, 1], constraints, 'max').solve(method='exact', graph_format='none')[1]
+        reduced = LPSolver([1, 1], constraints, 'max').solve(method='exact', presolve=True, graph_format='none')[1]
+        self.assertEqual(reduced['Z'], plain['Z'])
+
+    def test_round_trip_on_random_lps(self):
+        # Linhas singleton, fixações e colunas vazias para o presolve ter o que tirar
+        rng = np.random.default_rng(13)
+        for _ in range(40):
+            m, n = rng.integers(2, 6), rng.integers(2, 6)
+            A = rng.integers(-2, 7, (m, n)) * (rng.random((m, n)) < 0.6)
+            signs = rng.choice(['<=', '>=', '='], m, p=[.6, .25, .15])
+            constraints = [(list(A[i]), sign, int(rng.integers(1, 25))) for i, sign in enumerate(signs)]
+            constraints.append(([int(j == 0) for j in range(n)], '=', int(rng.integers(0, 4))))
+            c, objective = list(rng.integers(-3, 9, n)), str(rng.choice(['max', 'min']))
+            _, plain = LPSolver(c, constraints, objective).solve(method='revised_simplex', graph_format='none')
+            _, reduced = LPSolver(c, constraints, objective).solve(method='revised_simplex', graph_format='none',
+                                                                  presolve=True)
+            self.assertEqual('error' in reduced, 'error' in plain)
+            if 'error' in plain: continue
+            self.assertEqual(reduced['Z'], plain['Z'])
+            # x devolvido nas variáveis originais e viável no modelo original
+            x = np.array([float(Fraction(reduced[f'x{j+1}'])) for j in range(n)])
+            for a, sign, r in constraints:
+                lhs = np.dot(a, x)
+                self.assertTrue(lhs <= r + 1e-6 if sign == '<=' else lhs >= r - 1e-6 if sign == '>=' else abs(lhs - r) < 1e-6)
+
+    def test_known_optima(self):
+        for c, constraints, objective, z in (WYNDOR, DIET):
+            for method in ('two_phase', 'revised_simplex', 'dual', 'exact'):
+                _, sol = LPSolver(c, constraints, objective).solve(method=method, presolve=True, graph_format='none')
+                self.assertEqual(sol['Z'], z, method)
+
+
+# --- BRANCH AND BOUND ---
+class BranchAndBoundTests(TestCase):
+    # Relaxação fracionária na raiz: sem heurísticas, o primeiro nó não dá incumbente
+    KNAPSACK = ([10, 13, 18, 31, 7, 15], [([11, 15, 20, 35, 10, 33], '<=', 47), ([1] * 6, '<=', 3)], 'max')
+
+    def test_serial_and_parallel_reach_known_optima(self):
+        for c, constraints, objective, z in INTEGER_MODELS:
+            for workers in (1, 2):
+                status, sol = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none',
+                                                                        max_depth=30, bnb_workers=workers)
+                self.assertEqual(status, 'Árvore Gerada')
+                self.assertEqual(sol['Z'], z, workers)
+                self.assertEqual(sol['gap']['relative_gap'], 0.0)
+
+    def test_strategies_match_brute_force(self):
+        rng = np.random.default_rng(7)
+        for _ in range(12):
+            m, n = rng.integers(1, 4), rng.integers(2, 4)
+            A, b, c = rng.integers(1, 7, (m, n)), rng.integers(4, 16, m), rng.integers(1, 9, n)
+            constraints = [(list(A[i]), '<=', int(b[i])) for i in range(m)]
+            grid = np.array(list(itertools.product(range(int(b.max()) + 1), repeat=n)))
+            best = (grid @ c)[(grid @ A.T <= b).all(axis=1)].max()
+            for strategy in branch_and_bound.BNB_STRATEGIES:
+                _, sol = LPSolver(list(c), constraints).solve(method='branch_and_bound', graph_format='none',
+                                                              bnb_strategy=strategy, max_depth=30)
+                self.assertEqual(Fraction(sol['Z']), best, strategy)
+
+    def test_heuristics_find_incumbent_at_root(self):
+        c, constraints, objective = self.KNAPSACK
+        status, sol = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none', max_nodes=1)
+        self.assertEqual(status, 'Árvore Parcial (limite de nós)')
+        x = [int(sol['integer_solution'][f'x{j+1}']) for j in range(6)]
+        self.assertTrue(all(np.dot(a, x) <= r for a, _, r in constraints))
+        self.assertLessEqual(Fraction(sol['Z']), Fraction(sol['gap']['best_bound']))
+        _, bare = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none', max_nodes=1,
+                                                            heuristics=False)
+        self.assertIsNone(bare['integer_solution'])
+
+    def test_mip_gap_stops_early(self):
+        c, constraints, objective = self.KNAPSACK
+        status, sol = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none', mip_gap=0.2)
+        self.assertEqual(status, 'Árvore Parcial (gap atingido)')
+        self.assertLessEqual(sol['gap']['relative_gap'], 0.2)
+        _, full = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none', max_depth=30)
+        self.assertEqual(full['Z'], '41')
+
+    def test_cuts_tighten_the_root_and_keep_the_optimum(self):
+        status, sol = LPSolver(*self.KNAPSACK).solve(method='branch_and_bound', graph_format='none', cuts=True,
+                                                      max_depth=30)
+        self.assertEqual((status, sol['Z']), ('Árvore Gerada', '41'))
+        self.assertGreater(sol['cuts']['generated'], 0)
+        self.assertLess(Fraction(sol['cuts']['bound_after']), Fraction(sol['cuts']['bound_before']))
+        rng = np.random.default_rng(9)
+        for _ in range(8):
+            A, b, c = rng.integers(1, 9, (2, 3)), rng.integers(5, 20, 2), rng.integers(1, 9, 3)
+            constraints = [(list(A[i]), '<=', int(b[i])) for i in range(2)]
+            grid = np.array(list(itertools.product(range(int(b.max()) + 1), repeat=3)))
+            best = (grid @ c)[(grid @ A.T <= b).all(axis=1)].max()
+            _, sol = LPSolver(list(c), constraints).solve(method='branch_and_bound', graph_format='none', cuts=True,
+                                                          max_depth=30)
+            self.assertEqual(Fraction(sol['Z']), best)
+
+    def test_parallel_pool_is_reused(self):
+        # Sem o começo serial, toda a árvore passa pelo pool de processos
+        with mock.patch.object(branch_and_bound, 'PARALLEL_MIN_NODES', 0):
+            for c, constraints, objective, z in INTEGER_MODELS:
+                _, sol = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none',
+                                                                   max_depth=30, bnb_workers=2)
+                self.assertEqual(sol['Z'], z)
+                pool = branch_and_bound._node_pools[2][1]
+            _, sol = LPSolver(*INTEGER_MODELS[0][:3]).solve(method='branch_and_bound', graph_format='none', bnb_workers=2)
+        self.assertIs(branch_and_bound._node_pools[2][1], pool)
+
+    def test_closing_the_stream_leaves_no_pending_nodes(self):
+        with mock.patch.object(branch_and_bound, 'PARALLEL_MIN_NODES', 0):
+            solver = LPSolver(*INTEGER_MODELS[1][:3])
+            records = solver.stream_branch_and_bound(max_depth=30, bnb_workers=2)
+            next(records); next(records)
+            records.close()
+        self.assertFalse(branch_and_bound._node_pools[2][1]._pending_work_items)
+
+    def test_presolve_keeps_the_integer_optimum(self):
+        for c, constraints, objective, z in INTEGER_MODELS:
+            _, sol = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none',
+                                                               max_depth=30, presolve=True)
+            self.assertEqual(sol['Z'], z)
+
+    def test_invalid_workers(self):
+        status, sol = LPSolver(*INTEGER_MODELS[0][:3]).solve(method='branch_and_bound', graph_format='none', bnb_workers=0)
+        self.assertEqual(status, 'Método inválido')
+        self.assertIn('bnb_workers', sol['error'])
+
+
+# --- ARQUIVOS MPS E LP ---
+class ModelFileTests(TestCase):
+    LP = b"""\\ Objetivo com constante
+Minimize
+ obj: 2 x + 3 y + 1
+Subject To
+ c1: x + y >= 4
+ c2: x + 3 y >= 6
+Bounds
+ x <= 10
+General
+ y
+End
+"""
+
+    # Colunas alinhadas ao formato fixo: o mesmo texto vale nos dois modos
+    RANGED = b"""NAME          RANGED
+OBJSENSE
+    MAX
+ROWS
+ N  obj
+ L  lim
+ G  low
+COLUMNS
+    x         obj       3              lim       1
+    x         low       1
+    y         obj       2              lim       1
+    y         low       -1
+RHS
+    rhs       lim       10             low       2
+RANGES
+    rng       lim       4
+BOUNDS
+ UP bnd       x         7
+ MI bnd       y
+ UP bnd       y         5
+ENDATA
+"""
+
+    def _round_trip(self, model):
+        out = io.StringIO()
+        model_to_mps(model, out)
+        return read_model(io.BytesIO(out.getvalue().encode()), 'mps')
+
+    def test_lp_round_trip_through_mps(self):
+        model = read_model(io.BytesIO(self.LP))
+        self.assertEqual(model.col_names, ['x', 'y'])
+        again = self._round_trip(model)
+        self.assertEqual((again.col_names, again.row_names, again.offset), (model.col_names, model.row_names, 1.0))
+        self.assertEqual(again.integers, model.integers)
+        for m in (model, again):
+            _, sol = m.solver.solve(method='revised_simplex', graph_format='none')
+            self.assertEqual((sol['x1'], sol['x2'], sol['Z']), ('3', '1', '9'))
+
+    def test_mps_round_trip_keeps_the_integer_optimum(self):
+        c, constraints, objective, z = INTEGER_MODELS[1]
+        out = io.StringIO()
+        write_mps(LPSolver(c, constraints, objective), out, integers=range(len(c)))
+        model = self._round_trip(read_model(io.BytesIO(out.getvalue().encode()), 'mps'))
+        self.assertTrue(model.all_integer)
+        _, sol = model.solver.solve(method='branch_and_bound', graph_format='none', max_depth=30)
+        self.assertEqual(sol['Z'], z)
+
+    def test_ranges_and_bounds_in_both_formats(self):
+        for fixed in (False, True):
+            model = read_model(io.BytesIO(self.RANGED), 'mps', fixed)
+            self.assertEqual(model.info()['rows'], 3)  # RANGES: 6 <= x + y <= 10
+            self.assertEqual(model.solver.bounds, [(0.0, 7.0), (None, 5.0)])
+            _, sol = model.solver.solve(method='revised_simplex', graph_format='none')
+            self.assertEqual((sol['x1'], sol['x2'], sol['Z']), ('7', '3', '27'))
+
+    def test_parse_errors_point_to_the_line(self):
+        with self.assertRaisesMessage(ValueError, "Linha 5: número inválido 'abc'"):
+            read_model(io.BytesIO(b'NAME X\nROWS\n N obj\nCOLUMNS\n x obj abc\nENDATA\n'), 'mps')
+        with self.assertRaisesMessage(ValueError, 'Maximize/Minimize'):
+            read_model(io.BytesIO(b'Subject To\n c1: x >= 1\nEnd\n'), 'lp')
+
+    def test_endpoints(self):
+        upload = SimpleUploadedFile('ranged.mps', self.RANGED)
+        response = self.client.post('/api/solve/file/?method=revised_simplex', {'file': upload})
+        self.assertEqual(response.json()['solution']['Z'], '27')
+        # Corpo cru compactado: o gzip é detectado pelo conteúdo
+        response = self.client.post('/api/solve/file/?filename=model.lp', gzip.compress(self.LP),
+                                    content_type='application/octet-stream')
+        self.assertEqual(response.json()['solution']['Z'], '9')
+        exported = self.client.post('/api/export/mps/', _payload(INTEGER_MODELS[0], method='branch_and_bound'),
+                                    content_type='application/json')
+        model = read_model(io.BytesIO(b''.join(exported.streaming_content)), 'mps')
+        self.assertTrue(model.all_integer)
+        _, sol = model.solver.solve(method='branch_and_bound', graph_format='none', max_depth=30)
+        self.assertEqual(sol['Z'], INTEGER_MODELS[0][3])
+
+
+# --- CACHE DE RESULTADOS ---
+class CacheTests(TestCase):
+    CONSTRAINTS = [([2, 3, 1], '<=', 12.5), ([1, 1, 0], '>=', 1), ([0, 0, 1], '<=', 2)]
+
+    def setUp(self):
+        self.cache = get_result_cache()
+        self.cache.backend.clear()
+
+    def _solve(self, **options):
+        solver = LPSolver([3, 2, 1], self.CONSTRAINTS, 'max')
+        return cached_solve(solver, graph_format='none', method='branch_and_bound', **options)
+
+    def test_partial_tree_is_not_cached(self):
+        status, _ = self._solve(max_nodes=1)
+        self.assertTrue(status.startswith('Árvore Parcial'))
+        hits = self.cache.counters['result']['hits']
+        self._solve(max_nodes=1)
+        self.assertEqual(self.cache.counters['result']['hits'], hits)
+
+    def test_complete_tree_is_cached(self):
+        status, first = self._solve()
+        self.assertEqual(status, 'Árvore Gerada')
+        hits = self.cache.counters['result']['hits']
+        self.assertEqual(self._solve()[1]['Z'], first['Z'])
+        self.assertEqual(self.cache.counters['result']['hits'], hits + 1)
+
+    def test_graph_rendered_from_cached_points(self):
+        for method in ('graphical', 'branch_and_bound'):
+            c, constraints, objective, z = INTEGER_MODELS[0]
+            solve = lambda fmt: cached_solve(LPSolver(c, constraints, objective), graph_format=fmt, method=method)
+            self.assertNotIn('graph_base64', solve('none')[1])
+            with mock.patch.object(LPSolver, 'solve', side_effect=AssertionError('resolveu de novo')):
+                _, sol = solve('png')
+            fresh = LPSolver(c, constraints, objective).solve(method=method, graph_format='png')[1]
+            self.assertEqual(sol['graph_base64'], fresh['graph_base64'])
+            self.assertEqual(sol['graph_format'], 'png')
+            self.assertEqual(self.cache.counters['graph']['misses'], 1 if method == 'graphical' else 2)
+            self.assertEqual(solve('png')[1]['graph_base64'], sol['graph_base64'])
+
+
+# --- GRÁFICO ---
+class VertexTests(TestCase):
+    def test_wyndor_vertices(self):
+        vertices = LPSolver(*WYNDOR[:3])._feasible_vertices()
+        self.assertEqual(sorted(map(tuple, np.round(vertices, 9) + 0.0)), [(0, 0), (0, 6), (2, 6), (4, 0), (4, 3)])
+
+    def test_matches_pairwise_loop(self):
+        rng = np.random.default_rng(5)
+        for _ in range(20):
+            constraints = [(list(rng.integers(-3, 6, 2)), str(rng.choice(['<=', '>='], p=[.8, .2])), int(rng.integers(1, 20)))
+                           for _ in range(rng.integers(2, 7))]
+            lines = [(a, r) for a, _, r in constraints] + [([1, 0], 0), ([0, 1], 0)]
+            expected = set()
+            for (a1, r1), (a2, r2) in itertools.combinations(lines, 2):
+                if abs(np.linalg.det([a1, a2])) < 1e-12: continue
+                p = np.linalg.solve([a1, a2], [r1, r2])
+                if (p >= -1e-5).all() and all(np.dot(a, p) <= r + 1e-5 if s == '<=' else np.dot(a, p) >= r - 1e-5
+                                              for a, s, r in constraints):
+                    expected.add(tuple(np.round(p, 6) + 0.0))
+            found = {tuple(p) for p in np.round(LPSolver([1, 1], constraints)._feasible_vertices(), 6) + 0.0}
+            self.assertEqual(found, expected)
+
+
+class GraphRendererTests(TestCase):
+    def test_formats(self):
+        for fmt, magic in (('gif', b'GIF89a'), ('png', b'\x89PNG'), ('svg', b'<?xml')):
+            _, sol = LPSolver(*WYNDOR[:3]).solve(method='graphical', graph_format=fmt)
+            self.assertEqual(sol['graph_format'], fmt)
+            self.assertTrue(base64.b64decode(sol['graph_base64']).startswith(magic), fmt)
+
+    def test_gif_frames(self):
+        # Quadros de 0 até Z ótimo + o último segurado por hold_frames
+        _, sol = LPSolver(*WYNDOR[:3]).solve(method='graphical', graph_format='gif')
+        gif = PILImage.open(io.BytesIO(base64.b64decode(sol['graph_base64'])))
+        renderer = GraphRenderer([3, 5], WYNDOR[1], [], None)
+        self.assertEqual(gif.n_frames, renderer.num_frames + 1)
+        gif.seek(gif.n_frames - 1)
+        self.assertEqual(gif.info['duration'], renderer.frame_ms * renderer.hold_frames)
+
+
+class LazyImportTests(TestCase):
+    def test_text_only_solves_skip_matplotlib(self):
+        # Processo novo: o import do matplotlib só acontece no primeiro gráfico de verdade
+        code = ("import django, sys; django.setup(); from solver_api.main_solver import LPSolver; "
+                "s = LPSolver([3, 5], [([1, 0], '<=', 4), ([0, 2], '<=', 12), ([3, 2], '<=', 18)]); "
+                "[s.solve(method=m, graph_format='none') for m in ('graphical', 'branch_and_bound')]; "
+                "print('matplotlib' in sys.modules)")
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                             env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings'}).stdout
+        self.assertEqual(out.strip(), 'False')
+
+
+class GraphFailureTests(TestCase):
+    def test_render_failure_is_logged(self):
+        constraints = [([1, 0], '<=', 4), ([0, 2], '<=', 12), ([3, 2], '<=', 18)]
+        with mock.patch('solver_api.graph_renderer.GraphRenderer.render', side_effect=RuntimeError('falha')), \
+                self.assertLogs('solver_api.main_solver', 'ERROR') as logs:
+            status, sol = LPSolver([3, 5], constraints).solve(method='graphical', graph_format='png')
+        self.assertEqual(sol['Z'], '36')
+        self.assertIsNone(sol['graph_base64'])
+        self.assertIn('falha', logs.output[0])
+
+
+# --- BENCHMARK ---
+class BenchmarkTests(TestCase):
+    def test_corpus_skips_inapplicable_methods(self):
+        for case in build_corpus(['mixed', 'dense_le']):
+            self.assertFalse(applicable(case['payload'], 'graphical'))
+        mixed = build_corpus(['mixed'])[0]['payload']
+        self.assertFalse(applicable(mixed, 'simplex'))
+        self.assertTrue(applicable(mixed, 'two_phase'))
+
+    def test_times_only_compared_on_request(self):
+        row = {'instance': 'a', 'method': 'auto', 'status': 'ok', 'Z': '1', 'pivots': 3, 'nodes': 0, 'peak_kb': 10.0,
+               'solve_ratio': 1.0, 'render_ratio': 0.0}
+        slower = {**row, 'solve_ratio': 5.0}
+        baseline, report = {'results': [row]}, {'results': [slower]}
+        self.assertEqual(compare(report, baseline), [])
+        self.assertEqual([r['metric'] for r in compare(report, baseline, timing=True)], ['solve_ratio'])
+        more_pivots = {'results': [{**row, 'pivots': 9}]}
+        self.assertEqual([r['metric'] for r in compare(more_pivots, baseline)], ['pivots'])
+
+
+# --- JOBS ASSÍNCRONOS ---
+class JobWorkerTests(TestCase):
+    def test_job_runs_branch_and_bound_serially(self):
+        c, constraints, objective, z = INTEGER_MODELS[0]
+        data = {'objective_function': c, 'objective': objective, 'method': 'branch_and_bound', 'bnb_workers': 4,
+                'graph_format': 'none', 'constraints': [{'coefficients': a, 'sign': s, 'rhs': r} for a, s, r in constraints]}
+        progress, cancelled = {}, {}
+        with mock.patch.object(branch_and_bound, 'PARALLEL_MIN_NODES', 0), \
+                mock.patch.object(branch_and_bound, '_get_node_pool', side_effect=AssertionError('pool aninhado')):
+            status, result = _run_job('j1', data, 30, progress, cancelled)
+        self.assertEqual(status, 'done')
+        self.assertEqual(result['solution']['Z'], z)
+        self.assertTrue(progress['j1']['started'])
+
+    def test_endpoint_lifecycle(self):
+        manager = JobManager(workers=1, max_pending=1)
+        with mock.patch('solver_api.views.get_job_manager', return_value=manager):
+            response = self.client.post('/api/jobs/', _payload(WYNDOR, method='two_phase'), content_type='application/json')
+            self.assertEqual(response.status_code, 202)
+            self.addCleanup(manager._manager.shutdown); self.addCleanup(manager._executor.shutdown)
+            url = f"/api/jobs/{response.json()['job_id']}/"
+            deadline = time.monotonic() + 60
+            while (job := self.client.get(url).json())['status'] in ('queued', 'running') and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(job['status'], 'done')
+            self.assertEqual(job['result']['solution']['Z'], WYNDOR[3])
+            self.assertEqual(self.client.get('/api/jobs/nada/').status_code, 404)
+            self.assertEqual(self.client.post('/api/jobs/', {'objective': 'max'}, content_type='application/json').status_code, 400)
+            manager.max_pending = 0
+            self.assertEqual(self.client.post('/api/jobs/', _payload(WYNDOR), content_type='application/json').status_code, 503)
+
+    def test_cancelled_job(self):
+        data = {'objective_function': WYNDOR[0], 'objective': 'max', 'graph_format': 'none', 'method': 'two_phase',
+                'constraints': [{'coefficients': a, 'sign': s, 'rhs': r} for a, s, r in WYNDOR[1]]}
+        status, result = _run_job('j2', data, 30, {}, {'j2': True})
+        self.assertEqual((status, result), ('cancelled', None))
+
+
+# --- LOTES ---
+class BatchTests(TestCase):
+    def test_solver_failure_only_marks_its_problem(self):
+        real = LPSolver.solve
+        def solve(solver, **kw):
+            if solver.num_vars == 3: raise ZeroDivisionError('pivô nulo')
+            return real(solver, **kw)
+        problems = [_payload(WYNDOR), _payload(DIET), {'objective': 'max'}, _payload(WYNDOR)]
+        with mock.patch.object(LPSolver, 'solve', solve):
+            results = _solve_chunk(range(4), problems, {'method': 'two_phase'}, 'none', False)
+        self.assertEqual([r['status'] for r in results][1:3], ['Erro', 'Erro'])
+        self.assertIn('pivô nulo', results[1]['solution']['error'])
+        self.assertTrue(results[2]['solution']['error'].startswith('JSON inválido'))
+        self.assertEqual([results[0]['solution']['Z'], results[3]['solution']['Z']], ['36', '36'])
+
+    def test_vectorized_matches_lpsolver(self):
+        rows = [([3, 5], [4, 12, 18]), ([2, 1], [4, 12, 18]), ([1, 1], [6, 10, 15])]
+        A = np.array([[a for a, _, _ in WYNDOR[1]]] * len(rows), dtype=float)
+        solved = BatchedSimplex(A, np.array([b for _, b in rows], dtype=float), np.array([c for c, _ in rows], dtype=float),
+                                ('<=',) * 3, 'max').solve()
+        for (c, b), (status, sol) in zip(rows, solved):
+            constraints = [(a, s, r) for (a, s, _), r in zip(WYNDOR[1], b)]
+            _, ref = LPSolver(c, constraints, 'max').solve(method='simplex', graph_format='none')
+            self.assertEqual({k: sol[k] for k in ('x1', 'x2', 'Z')}, {k: ref[k] for k in ('x1', 'x2', 'Z')})
+
+    def test_fraction_strs_matches_fraction_str(self):
+        values = [0, 1, -3, 2.5, 1 / 3, -2 / 7, 0.1 + 0.2, 1e-12, 123456.789, 5 / 9999]
+        self.assertEqual(fraction_strs(values), [fraction_str(v) for v in values])
+
+    def test_vectorized_variants_match_per_problem_solves(self):
+        # b apertado até ficar inviável (x1 >= 5 contra x1 <= 4)
+        base = _payload(WYNDOR)
+        base['constraints'].append({'coefficients': [1, 0], 'sign': '>=', 'rhs': 0})
+        variants = [{'rhs': [4, 12, 18, v]} for v in (0, 2, 4, 5)] + [{'objective_delta': [1, -4]}]
+        data = {'base': base, 'variants': variants, 'vectorized': True, 'method': 'two_phase'}
+        # Tudo sai do BatchedSimplex: o caminho por problema não pode ser chamado
+        with mock.patch('solver_api.batch._solve_chunk', side_effect=AssertionError('fora do lote vetorizado')):
+            results = self.client.post('/api/batch/', data, content_type='application/json').json()['results']
+        problems, _ = expand_batch(data)
+        for problem, result in zip(problems, results):
+            status, sol = build_solver(problem).solve(method='two_phase', graph_format='none')
+            self.assertEqual(result['status'], status)
+            self.assertEqual(result['solution'].get('Z'), sol.get('Z'))
+        self.assertEqual(results[3]['status'], 'Problema Inviável')
+        bad = self.client.post('/api/batch/', {**data, 'integer_mode': True}, content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+
+    def test_endpoint_keeps_order_and_rejects_bad_payload(self):
+        data = {'problems': [_payload(WYNDOR), {'objective': 'max'}, _payload(DIET)], 'method': 'two_phase'}
+        response = self.client.post('/api/batch/', data, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['index'] for r in results], [0, 1, 2])
+        self.assertEqual([r['status'] == 'Erro' for r in results], [False, True, False])
+        self.assertEqual(results[2]['solution']['Z'], DIET[3])
+        bad = self.client.post('/api/batch/', {'base': _payload(WYNDOR)}, content_type='application/json')
+        self.assertEqual(bad.status_code, 400)
+
+
+# --- MÉTRICAS E PERFIL ---
+class MetricsTests(TestCase):
+    def _solve(self, query='', **extra):
+        data = _payload(DIET, method='revised_simplex', cache=False, **extra)
+        return self.client.post(f'/api/solve/{query}', data, content_type='application/json').json()
+
+    def test_phases_add_up_and_reach_metrics(self):
+        report = self._solve('?metrics=1')['metrics']
+        self.assertIn('parse', report['phases_ms'])
+        self.assertGreater(report['counters']['pivots'], 0)
+        self.assertLessEqual(sum(report['phases_ms'].values()), report['total_ms'] + 1e-3)
+        text = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('solver_requests_total{method="revised_simplex",outcome="ok"}', text)
+        self.assertIn('solver_request_duration_seconds_count{method="revised_simplex"}', text)
+
+    def test_invalid_request_is_counted(self):
+        registry = get_metrics_registry()
+        before = registry._requests.get(('unknown', 'invalid'), 0)
+        self.client.post('/api/solve/', {'objective': 'max'}, content_type='application/json')
+        self.assertEqual(registry._requests[('unknown', 'invalid')], before + 1)
+
+    def test_profile(self):
+        profile = self._solve(profile=True, profile_top=5)['profile']
+        self.assertEqual(len(profile), 5)
+        self.assertTrue(all({'function', 'calls', 'cumtime_ms'} <= set(row) for row in profile))
+
+
+# --- STREAMING DO BRANCH & BOUND ---
+class StreamTests(TestCase):
+    def _post(self, **extra):
+        data = _payload(INTEGER_MODELS[0], method='branch_and_bound', stream=True, **extra)
+        return self.client.post('/api/solve/', data, content_type='application/json')
+
+    def test_stream_is_metered(self):
+        registry = get_metrics_registry()
+        before = registry._requests.get(('branch_and_bound', 'ok'), 0)
+        response = self._post(metrics=True)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(records[-1]['type'], 'result')
+        self.assertEqual(records[-1]['solution']['Z'], INTEGER_MODELS[0][3])
+        self.assertEqual(records[-1]['metrics']['counters']['nodes'], len(records) - 1)
+        self.assertEqual(registry._requests[('branch_and_bound', 'ok')], before + 1)
+        self.assertIn('method="branch_and_bound",outcome="ok"', self.client.get('/api/metrics/').content.decode())
+
+    def test_records_are_flat_and_ordered(self):
+        c, constraints, objective, z = INTEGER_MODELS[0]
+        records = list(LPSolver(c, constraints, objective).stream_branch_and_bound(max_depth=30))
+        *nodes, result = records
+        self.assertEqual((result['type'], result['solution']['Z']), ('result', z))
+        seen = set()
+        for node in nodes:
+            # Pai sempre antes do filho, nada aninhado
+            self.assertEqual(node['type'], 'node')
+            self.assertTrue(node['parent'] is None or node['parent'] in seen)
+            self.assertNotIn('children', node)
+            seen.add(node['id'])
+        _, tree = LPSolver(c, constraints, objective).solve(method='branch_and_bound', graph_format='none', max_depth=30)
+        self.assertEqual(tree['Z'], z)
+        bare = LPSolver(c, constraints, objective).stream_branch_and_bound(max_depth=30, node_details=False)
+        self.assertFalse(any('solution' in r for r in bare if r['type'] == 'node'))
+
+    def test_stream_rejects_presolve(self):
+        response = self._post(presolve=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('presolve', response.json()['error'])
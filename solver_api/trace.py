@@ -0,0 +1,43 @@
+TRACE_LEVELS = ('none', 'summary', 'full')
+
+
+# --- HISTÓRICO DE ITERAÇÕES SOB DEMANDA ---
+# 'none'    -> nada é guardado por pivô
+# 'summary' -> só o pivô e o valor de Z de cada iteração
+# 'full'    -> cópias numéricas do tableau; a conversão para frações (cara)
+#              só acontece quando steps() é chamado
+class IterationTrace:
+    def __init__(self, solver, level, phase):
+        self.solver = solver
+        self.level = level
+        self.phase = phase
+        self._snapshots = []
+        self._pivots = {}
+
+    def record(self, t, b, i):
+        if self.level == 'none': return
+        if self.level == 'summary':
+            self._snapshots.append((i, self.solver._to_fraction_str(t[0, -1])))
+        else:
+            self._snapshots.append((i, t.copy(), list(b)))
+
+    def pivot(self, i, row, col):
+        if self.level != 'none': self._pivots[i] = {'row': int(row), 'col': int(col)}
+
+    def steps(self):
+        with self.solver._phase('formatting'): return self._steps()
+
+    def _steps(self):
+        if self.level == 'summary':
+            return [{'iteration': i, 'phase': self.phase, 'Z': z, 'pivot_info': self._pivots.get(i)}
+                    for i, z in self._snapshots]
+        out = []
+        for i, t, b in self._snapshots:
+            step = self.solver._format_tableau_step(t, b, i, self.phase)
+            step['pivot_info'] = self._pivots.get(i)
+            out.append(step)
+        return out
+
+    def attach(self, solution):
+        if self.level != 'none': solution['iterations'] = self.steps()
+        return solution
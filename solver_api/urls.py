@@ -1,8 +1,21 @@
 # solver_api/urls.py
 from django.urls import path
-from .views import solve_problem
+from .views import (solve_problem, cache_stats, create_job, job_detail, solve_batch, solver_metrics, solve_model_file,
+                    export_mps)
 
 urlpatterns = [
     # Quando alguém acessar '.../api/solve/', a função solve_problem será chamada.
     path('solve/', solve_problem, name='solve_problem'),
+    # Modelo em arquivo MPS/LP (upload, gzip aceito) e exportação para MPS
+    path('solve/file/', solve_model_file, name='solve_model_file'),
+    path('export/mps/', export_mps, name='export_mps'),
+    # Contadores de acerto/falha do cache de resultados
+    path('cache/stats/', cache_stats, name='cache_stats'),
+    # Resolução assíncrona: POST cria o job, GET consulta, DELETE cancela
+    path('jobs/', create_job, name='create_job'),
+    path('jobs/<str:job_id>/', job_detail, name='job_detail'),
+    # Lote de problemas resolvidos em paralelo
+    path('batch/', solve_batch, name='solve_batch'),
+    # Métricas do processo (texto do Prometheus): latência por método e tempo por fase
+    path('metrics/', solver_metrics, name='solver_metrics'),
 ]
\ No newline at end of file
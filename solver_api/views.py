@@ -1,41 +1,244 @@
+import json
+import zlib
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from .main_solver import LPSolver 
+from .payload import build_solver, solve_options
+from .main_solver import SOLVE_METHODS
+from .cache import cached_solve, get_result_cache
+from .metrics import RequestMetrics, get_metrics_registry, profile_call
+from .jobs import get_job_manager, JobQueueFull
+from .batch import prepare_batch, run_batch
+from .model_io import read_model, iter_mps
+
+
+def _flag(request, name):
+    # Liga por query string (?profile=1) ou pelo JSON ("profile": true)
+    value = request.query_params.get(name)
+    if value is not None: return value.lower() in ('1', 'true', 'yes')
+    return isinstance(request.data, dict) and bool(request.data.get(name, False))
+
+
+def _metered_response(payload, http_status, metrics, method, report=False):
+    # A serialização é medida e o bloco 'metrics' (pequeno) é emendado no
+    # corpo já pronto, para que o tempo reportado seja o do corpo inteiro
+    with metrics.phase('serialization'): body = JSONRenderer().render(payload)
+    outcome = 'ok' if http_status == status.HTTP_200_OK and 'error' not in payload.get('solution', {}) else 'error'
+    if http_status >= 500: outcome = 'internal_error'
+    elif http_status >= 400 and 'status' not in payload: outcome = 'invalid'
+    get_metrics_registry().observe(method, outcome, metrics.elapsed(), metrics.phases, metrics.work())
+    if report:
+        extra = JSONRenderer().render(metrics.report())
+        body = body[:-1] + b',"metrics":' + extra + b'}'
+    return HttpResponse(body, status=http_status, content_type='application/json')
+
+
+def _metered_stream(records, metrics, method, report=False):
+    # No streaming a requisição só termina no último registro: é aí que ela
+    # entra no /metrics, e o bloco 'metrics' vai junto do resultado
+    outcome = 'internal_error'
+    try:
+        for record in records:
+            if record['type'] == 'result':
+                outcome = 'error' if 'error' in record['solution'] else 'ok'
+                if report: record = {**record, 'metrics': metrics.report()}
+            with metrics.phase('serialization'): line = json.dumps(record) + '\n'
+            yield line
+    finally:
+        get_metrics_registry().observe(method, outcome, metrics.elapsed(), metrics.phases, metrics.work())
+
 
 @api_view(['POST'])
 def solve_problem(request):
+    metrics = RequestMetrics()
+    method, report = 'unknown', False
     try:
-        data = request.data
-        objective = data['objective']
-        obj_func = data['objective_function']
-        constraints_data = data['constraints']
+        with metrics.phase('parse'):
+            data = request.data
+            solver = build_solver(data)
+            graph_format = data.get('graph_format', 'gif')
+            options = solve_options(data, getattr(settings, 'SOLVER_BNB', {}).get('WORKERS', 1))
+        if options['method'] in SOLVE_METHODS: method = options['method']
+        report = _flag(request, 'metrics')
+        solver.metrics = metrics
+        metrics.counters = solver.counters
+
+        # Branch & Bound em streaming: um nó por linha NDJSON, resultado na última
+        if data.get('stream', False) and options['method'] == 'branch_and_bound':
+            # O presolve renumera as variáveis (os nós não casariam com o modelo
+            # enviado) e o perfil precisa da resolução inteira: recusados aqui
+            if options['presolve'] or _flag(request, 'profile'):
+                raise ValueError("'stream' não pode ser combinado com 'presolve' ou 'profile'")
+            records = solver.stream_branch_and_bound(options['bnb_strategy'], options['max_nodes'], options['node_details'],
+                                                     graph_format, options['cuts'], options['max_depth'],
+                                                     options['heuristics'], options['time_limit'], options['mip_gap'],
+                                                     options['bnb_workers'])
+            return StreamingHttpResponse(_metered_stream(records, metrics, method, report),
+                                         content_type='application/x-ndjson')
+        profile = None
+        if _flag(request, 'profile') and getattr(settings, 'SOLVER_METRICS', {}).get('PROFILE', True):
+            # Perfil sempre de uma resolução de verdade: não passa pelo cache
+            top = min(int(request.query_params.get('profile_top', data.get('profile_top', 20))), 200)
+            (status_msg, solution), profile = profile_call(lambda: solver.solve(graph_format=graph_format, **options), top)
+        elif data.get('cache', True):
+            status_msg, solution = cached_solve(solver, graph_format=graph_format, **options)
+        else:
+            status_msg, solution = solver.solve(graph_format=graph_format, **options)
+
+        if solution:
+            response_data = {'status': status_msg, 'solution': solution}
+            if profile is not None: response_data['profile'] = profile
+            return _metered_response(response_data, status.HTTP_200_OK, metrics, method, report)
+        else:
+            response_data = {'status': status_msg, 'error': 'Não foi possível encontrar uma solução ótima.'}
+            return _metered_response(response_data, status.HTTP_400_BAD_REQUEST, metrics, method, report)
 
-        constraints = [
-            (c['coefficients'], c['sign'], c['rhs']) 
-            for c in constraints_data
-        ]
+    except (KeyError, TypeError, ValueError) as e:
+        return _metered_response({'error': f'JSON inválido: {e}'}, status.HTTP_400_BAD_REQUEST, metrics, method)
+    except Exception as e:
+        return _metered_response({'error': f'Ocorreu um erro interno: {e}'}, status.HTTP_500_INTERNAL_SERVER_ERROR, metrics, method)
 
-        solver = LPSolver(
-            objective_function=obj_func,
-            constraints=constraints,
-            objective=objective
-        )
 
-        method_from_frontend = data.get('method', 'auto')
-        integer_mode = data.get('integer_mode', False)
+def _file_params(request):
+    # Opções do upload: query string ou campos do multipart; 'options' é um
+    # JSON com as mesmas chaves do /api/solve/
+    params = dict(request.query_params.items())
+    if request.content_type.startswith('multipart/'):
+        params.update((k, v) for k, v in request.POST.items())
+    opts = json.loads(params.get('options') or '{}')
+    if not isinstance(opts, dict): raise ValueError("'options' deve ser um objeto JSON")
+    for key in ('method', 'graph_format'):
+        if key in params: opts[key] = params[key]
+    return params, opts
 
 
-        status_msg, solution = solver.solve(method=method_from_frontend, integer_mode=integer_mode)
+def _param_flag(params, name):
+    return str(params.get(name, '')).lower() in ('1', 'true', 'yes')
 
-        if solution:
-            response_data = {'status': status_msg, 'solution': solution}
-            return Response(response_data, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+def solve_model_file(request):
+    # Modelo em MPS (livre ou fixo, com ?fixed=1) ou CPLEX LP, no campo 'file'
+    # de um multipart ou como corpo cru; gzip é detectado pelo conteúdo. O
+    # arquivo é lido em fluxo e a matriz montada esparsa, sem passar pelo JSON
+    metrics = RequestMetrics()
+    method = 'unknown'
+    try:
+        with metrics.phase('parse'):
+            params, opts = _file_params(request)
+            if request.content_type.startswith('multipart/'):
+                upload = request.FILES.get('file')
+                if upload is None: raise ValueError("Envie o modelo no campo 'file'")
+                source, filename = upload, upload.name
+            else:
+                source, filename = request.stream, params.get('filename')
+            model = read_model(source, params.get('model_format') or None, _param_flag(params, 'fixed'), filename)
+            solver = model.solver
+            warnings = []
+            # O B&B trata todas as variáveis como inteiras
+            if model.all_integer: opts.setdefault('method', 'branch_and_bound')
+            elif model.integers: warnings.append(f"{len(model.integers)} variáveis inteiras num modelo misto: "
+                                                 "a integralidade só é respeitada quando todas são inteiras")
+            graph_format = opts.get('graph_format', 'none')
+            options = solve_options(opts, getattr(settings, 'SOLVER_BNB', {}).get('WORKERS', 1))
+        if options['method'] in SOLVE_METHODS: method = options['method']
+        solver.metrics = metrics
+        metrics.counters = solver.counters
+        if opts.get('cache', True):
+            status_msg, solution = cached_solve(solver, graph_format=graph_format, **options)
         else:
+            status_msg, solution = solver.solve(graph_format=graph_format, **options)
+        report = _param_flag(params, 'metrics')
+        if not solution:
             response_data = {'status': status_msg, 'error': 'Não foi possível encontrar uma solução ótima.'}
-            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+            return _metered_response(response_data, status.HTTP_400_BAD_REQUEST, metrics, method, report)
+        response_data = {'status': status_msg, 'solution': solution, 'model': model.info()}
+        if warnings: response_data['warnings'] = warnings
+        return _metered_response(response_data, status.HTTP_200_OK, metrics, method, report)
+    except (KeyError, TypeError, ValueError) as e:
+        return _metered_response({'error': f'Modelo inválido: {e}'}, status.HTTP_400_BAD_REQUEST, metrics, method)
+    except Exception as e:
+        return _metered_response({'error': f'Ocorreu um erro interno: {e}'}, status.HTTP_500_INTERNAL_SERVER_ERROR, metrics, method)
+
 
-    except (KeyError, TypeError) as e:
+def _gzip_chunks(chunks):
+    # Compacta em fluxo (wbits=31: cabeçalho gzip)
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = z.compress(chunk.encode('utf-8'))
+        if out: yield out
+    yield z.flush()
+
+
+@api_view(['POST'])
+def export_mps(request):
+    # Mesmo JSON do /api/solve/ -> MPS livre, para comparar com outros solvers;
+    # com 'branch_and_bound' todas as variáveis saem inteiras. ?gzip=1 compacta
+    try:
+        data = request.data
+        solver = build_solver(data)
+        integer = data.get('method') == 'branch_and_bound' or bool(data.get('integer_mode', False))
+        name = str(data.get('name', 'MODEL'))
+    except (KeyError, TypeError, ValueError) as e:
         return Response({'error': f'JSON inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
-    except Exception as e:
-        return Response({'error': f'Ocorreu um erro interno: {e}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+    chunks = iter_mps(solver, name=name, integers=integer)
+    if _flag(request, 'gzip'):
+        response = StreamingHttpResponse(_gzip_chunks(chunks), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="{name}.mps.gz"'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{name}.mps"'
+    return response
+
+
+@api_view(['GET'])
+def solver_metrics(request):
+    # Agregado do processo no formato texto do Prometheus
+    return HttpResponse(get_metrics_registry().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+def cache_stats(request):
+    return Response(get_result_cache().stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def create_job(request):
+    # Igual ao /api/solve/, mas responde na hora com o id do job;
+    # aceita também 'time_limit' (segundos) e 'max_nodes'
+    try:
+        data = request.data
+        build_solver(data)  # valida a entrada antes de enfileirar
+        job = get_job_manager().submit(dict(data), data.get('time_limit'))
+        return Response({'job_id': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+    except JobQueueFull as e:
+        return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    except (KeyError, TypeError, ValueError) as e:
+        return Response({'error': f'JSON inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'DELETE'])
+def job_detail(request, job_id):
+    manager = get_job_manager()
+    job = manager.cancel(job_id) if request.method == 'DELETE' else manager.get(job_id)
+    if job is None:
+        return Response({'error': 'Job não encontrado.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(manager.describe(job), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def solve_batch(request):
+    # Vários problemas (ou variantes de b/c de um problema base) resolvidos em
+    # paralelo; com 'stream': true, cada resultado sai em uma linha NDJSON
+    # assim que fica pronto
+    try:
+        problems, options, graph_format, warm, vectorized = prepare_batch(request.data)
+    except (KeyError, TypeError, ValueError) as e:
+        return Response({'error': f'JSON inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    results = run_batch(problems, options, graph_format, warm, vectorized)
+    if request.data.get('stream', False):
+        return StreamingHttpResponse((json.dumps(r) + '\n' for r in results), content_type='application/x-ndjson')
+    return Response({'results': sorted(results, key=lambda r: r['index'])}, status=status.HTTP_200_OK)